@@ -1,9 +1,16 @@
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
-from statsmodels.stats.outliers_influence import variance_inflation_factor
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from collinearity import condition_number, vif_table
+from features import feature_store
+from ic_engine import forward_targets, ic_decay, ic_table
+from overnight_alpha import stream_dataguide_excel
+from quantile_engine import quantile_analysis
 
 # ==============================================================================
 # 0. 설정 및 한글 폰트
@@ -13,40 +20,38 @@ DATA_PATH = Path(r"C:\Users\10845\OneDrive - 이지스자산운용\문서\mkf200
 plt.rcParams['font.family'] = 'Malgun Gothic'
 plt.rcParams['axes.unicode_minus'] = False
 
+# 주요 컬럼 매핑 (MKF2000 / DataGuide 표준 코드 기준)
+# 엑셀 헤더에 있는 코드들을 사람이 읽기 쉬운 이름으로 바꿉니다.
+COL_MAP = {
+    'I31000010F': 'open',
+    'I31000040F': 'close',
+    'I310000600': 'turnover',  # 거래대금
+
+    # --- 수급 데이터 (Net Buy Amount) ---
+    'I310023132': 'Net_Foreign',      # 외국인계
+    'I310020032': 'Net_Inst',         # 기관계
+    'I310020732': 'Net_Individual',   # 개인
+    'I310020632': 'Net_Pension',      # 연기금
+    'I310020132': 'Net_FinInvest',    # 금융투자
+    'I310020332': 'Net_Insure',       # 보험
+    'I310020432': 'Net_InvTrust',     # 투신
+    'I310020532': 'Net_Bank',         # 은행
+    'I310021132': 'Net_RegForeign',   # 등록외국인
+    'I310020932': 'Net_PrivFund',     # 사모펀드
+    'I310024132': 'Net_Nation',       # 국가/지자체
+}
+# turnover 가 없을 때 대체 계산에 쓰는 거래량 코드까지 함께 로드
+LOAD_CODES = list(COL_MAP) + ['I31000050F']
+
 # ==============================================================================
 # 1. 데이터 로드 및 전처리 함수 (헤더 자동 탐색 포함)
 # ==============================================================================
-def load_and_preprocess(path):
+def load_and_preprocess(path, use_cache=True):
     print("엑셀 데이터를 로딩 중입니다... (시간이 조금 걸립니다)")
-    
-    # 1. 'Item' 행 찾기 로직 (이전 수정사항 반영)
-    raw = pd.read_excel(path, header=None)
-    item_row_idx = None
-    for i, row in raw.iterrows():
-        # 행을 문자열로 변환해 'I3...' 코드가 있는지 검사
-        row_str = row.astype(str).values
-        if any('I3100' in s for s in row_str):
-            item_row_idx = i
-            break
-            
-    if item_row_idx is None:
-        raise ValueError("유효한 Item 코드가 있는 헤더를 찾을 수 없습니다.")
-
-    # 2. 데이터 파싱
-    # Item 행을 컬럼명으로 지정
-    raw.columns = raw.iloc[item_row_idx]
-    # 데이터는 Item 행 + 2 (Frequency 행 건너뜀) 부터 시작한다고 가정
-    df = raw.iloc[item_row_idx + 2:].copy()
-    
-    # 첫 번째 컬럼을 날짜로 지정
-    df = df.rename(columns={df.columns[0]: 'date'})
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-    df = df.dropna(subset=['date']).set_index('date').sort_index()
-
-    # 숫자형 변환 (Object -> Float)
-    df = df.apply(pd.to_numeric, errors='coerce')
-
-    return df
+    # read-only 스트리밍으로 Item 행을 찾고, COL_MAP 코드 컬럼만 float로 읽음
+    # (두 번째 실행부터는 database/.cache 의 컬럼 캐시에서 바로 읽음)
+    return stream_dataguide_excel(path, columns=LOAD_CODES, drop_weekends=False,
+                                  rename=False, use_cache=use_cache)
 
 # ==============================================================================
 # 2. 수급 팩터 매핑 및 생성
@@ -54,37 +59,19 @@ def load_and_preprocess(path):
 def engineer_features(df):
     print("팩터 엔지니어링 및 정규화 진행 중...")
     
-    # 주요 컬럼 매핑 (MKF2000 / DataGuide 표준 코드 기준)
-    # 엑셀 헤더에 있는 코드들을 사람이 읽기 쉬운 이름으로 바꿉니다.
-    col_map = {
-        'I31000010F': 'open',
-        'I31000040F': 'close',
-        'I310000600': 'turnover',  # 거래대금
-        
-        # --- 수급 데이터 (Net Buy Amount) ---
-        'I310023132': 'Net_Foreign',      # 외국인계
-        'I310020032': 'Net_Inst',         # 기관계
-        'I310020732': 'Net_Individual',   # 개인
-        'I310020632': 'Net_Pension',      # 연기금
-        'I310020132': 'Net_FinInvest',    # 금융투자
-        'I310020332': 'Net_Insure',       # 보험
-        'I310020432': 'Net_InvTrust',     # 투신
-        'I310020532': 'Net_Bank',         # 은행
-        'I310021132': 'Net_RegForeign',   # 등록외국인
-        'I310020932': 'Net_PrivFund',     # 사모펀드
-        'I310024132': 'Net_Nation',       # 국가/지자체
-    }
-    
     # 매핑 적용
-    df = df.rename(columns=col_map)
+    df = df.rename(columns=COL_MAP)
     
     # 필수 컬럼 확인
     if 'turnover' not in df.columns:
         df['turnover'] = df['close'] * df['I31000050F'] # 거래량 코드가 있다면 대체 계산
 
+    # 공통 피처는 레지스트리에서 한 번만 계산 (거래대금 5일 평균 공유)
+    store = feature_store(df)
+
     # Target 생성 (다음날 시가 갭)
     # T일 종가 진입 -> T+1일 시가 청산 수익률
-    df['Next_Gap'] = (df['open'].shift(-1) - df['close']) / df['close']
+    df['Next_Gap'] = store.get('next_gap')
 
     # Factor 생성: 거래대금 대비 순매수 비중 (Normalized Flow)
     # 금액 그 자체보다는 "시장 규모 대비 얼마나 샀는지"가 중요함
@@ -92,8 +79,7 @@ def engineer_features(df):
     
     for col in flow_cols:
         # 거래대금의 이동평균(5일)을 사용하여 분모 안정화
-        turnover_ma = df['turnover'].rolling(5).mean().replace(0, np.nan)
-        df[f'Ratio_{col}'] = df[col] / turnover_ma
+        df[f'Ratio_{col}'] = store.get(f'Ratio_{col}')
 
     return df, [f'Ratio_{c}' for c in flow_cols]
 
@@ -112,6 +98,15 @@ def analyze_factors(df, factor_cols):
     ic_df = ic_series.to_frame(name='IC').sort_values(by='IC', key=abs, ascending=False)
     
     print(ic_df)
+
+    # 호라이즌별 IC (Pearson / Rank IC, t-stat, 60일 롤링 IC) 를 한 번에 계산
+    targets = forward_targets(df)
+    ic_all = ic_table(df[factor_cols], targets)
+    print("\n[호라이즌별 Rank IC 감쇠]")
+    print(ic_decay(ic_all, "rank_ic").round(4))
+    print("\n[Next_Gap 기준 IC 요약]")
+    print(ic_all[ic_all['target'] == 'Next_Gap'].set_index('factor')
+          [['ic', 'ic_t', 'rank_ic', 'rank_ic_t', 'rolling_ic_ir']].round(3))
     
     # IC 시각화
     plt.figure(figsize=(10, 6))
@@ -128,13 +123,11 @@ def analyze_factors(df, factor_cols):
     print("="*50)
     print("※ VIF > 5~10 이면 변수 간 중복(공선성)이 심해 신뢰도가 떨어짐")
     
-    # VIF 계산
+    # VIF 계산 (상관행렬 고유분해 한 번으로 전체 VIF)
     X = analysis_df[factor_cols]
-    vif_data = pd.DataFrame()
-    vif_data["Feature"] = X.columns
-    vif_data["VIF"] = [variance_inflation_factor(X.values, i) for i in range(X.shape[1])]
-    vif_data = vif_data.sort_values(by="VIF", ascending=False)
+    vif_data = vif_table(X)
     print(vif_data)
+    print(f"조건수(Condition Number): {condition_number(X):.2f}  (30 이상이면 공선성 심각)")
 
     print("\n" + "="*50)
     print(f" [3] Best Factor ({ic_df.index[0]}) 심층 분석")
@@ -142,9 +135,12 @@ def analyze_factors(df, factor_cols):
     
     best_factor = ic_df.index[0]
     
-    # 10분위 분석
-    analysis_df['Group'] = pd.qcut(analysis_df[best_factor], 10, labels=False)
-    grp_ret = analysis_df.groupby('Group')['Next_Gap'].mean() * 100 # %
+    # 10분위 분석 (전체 팩터 x 전체 타깃을 한 번에, 분위 구간은 pd.qcut 과 같은 방식)
+    quantiles = quantile_analysis(analysis_df[factor_cols], targets, n_bins=10)
+    grp_ret = quantiles.table('Next_Gap').loc[best_factor] * 100 # %
+    print("\n[팩터별 최상위 - 최하위 분위 Next_Gap 차이]")
+    spread = quantiles.spread().xs('Next_Gap', level='target')
+    print(spread.sort_values('spread_t', key=abs, ascending=False).round(5))
 
     plt.figure(figsize=(10, 6))
     colors = ['blue' if x < 0 else 'red' for x in grp_ret]
@@ -1,45 +1,52 @@
+import sys
 from pathlib import Path
 
 import pandas as pd
-from scipy import stats
 
-# 1. 데이터 로드 (분석 결과 파일)
-# 파일 경로가 맞는지 확인해주세요.
-DATA_DIR = Path(__file__).resolve().parents[1] / "database"
-file_path = DATA_DIR / "features_output.csv"
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from correlation_engine import correlation_matrix
+from result_store import load_results
+
+# 검증할 변수 쌍 설정
+# (Gap vs Open_to_High), (Gap vs Dir_Ratio_Long)
+pairs = [
+    ("gap", "open_to_high"),
+    ("gap", "dir_ratio_long")
+]
+TOP_N = 15   # 전체 쌍 중 유의한 상위 출력 개수
 
 try:
-    df = pd.read_csv(file_path, index_col=0)
-    print(f"데이터 로드 성공: 총 {len(df)}일의 데이터가 있습니다.\n")
+    # 1. 데이터 로드 (분석 결과 파일의 숫자 컬럼 전부)
+    df = load_results().select_dtypes("number")
+    print(f"데이터 로드 성공: 총 {len(df)}일, {len(df.columns)}개 변수\n")
 
-    # 2. 검증할 변수 쌍 설정
-    # (Gap vs Open_to_High), (Gap vs Dir_Ratio_Long)
-    pairs = [
-        ("gap", "open_to_high"),
-        ("gap", "dir_ratio_long")
-    ]
+    # 2. 모든 쌍의 상관계수 / P-value / Newey-West t 를 한 번에 (쌍별 결측 제거)
+    result = correlation_matrix(df, newey_west=True)
+    r, p, nw_t = result.matrix("r"), result.matrix("p"), result.matrix("nw_t")
 
-    print(f"{'Variable 1':<15} {'Variable 2':<15} {'Corr(r)':<10} {'P-value':<15} {'Result'}")
-    print("-" * 70)
+    print(f"{'Variable 1':<15} {'Variable 2':<15} {'Corr(r)':<10} {'P-value':<15} {'NW t':<8} {'Result'}")
+    print("-" * 80)
 
     for v1, v2 in pairs:
-        # 결측치 제거 후 계산 (중요)
-        clean_data = df[[v1, v2]].dropna()
-        
-        # 피어슨 상관계수 및 P-value 계산
-        r, p_value = stats.pearsonr(clean_data[v1], clean_data[v2])
-        
+        if v1 not in r.index or v2 not in r.index:
+            print(f"{v1:<15} {v2:<15} (결과 파일에 없는 변수 - 건너뜀)")
+            continue
+
         # 결과 해석
-        significance = "유의함(Significant)" if p_value < 0.05 else "유의하지 않음"
-        
-        print(f"{v1:<15} {v2:<15} {r:<10.4f} {p_value:<15.4e} {significance}")
+        significance = "유의함(Significant)" if p.loc[v1, v2] < 0.05 else "유의하지 않음"
+
+        print(f"{v1:<15} {v2:<15} {r.loc[v1, v2]:<10.4f} {p.loc[v1, v2]:<15.4e} {nw_t.loc[v1, v2]:<8.2f} {significance}")
+
+    # 3. 전체 쌍 중 자기상관 보정 후에도 유의한 쌍
+    table = result.pairs()
+    significant = table[table["nw_p"] < 0.05].sort_values("nw_t", key=abs, ascending=False)
+    print(f"\n[Newey-West 기준 유의한 쌍: {len(significant)} / {len(table)} (lag {result.lags}), 상위 {TOP_N}]")
+    print(significant.head(TOP_N).to_string(index=False, float_format=lambda v: f"{v:.4g}"))
 
     print("\n[해석 가이드]")
     print("- P-value < 0.05: 통계적으로 유의미한 관계임 (우연이 아님)")
     print("- P-value < 0.01: 매우 강력한 관계임")
-    
-except FileNotFoundError:
-    print(
-        "오류: 'features_output.csv' 파일을 찾을 수 없습니다. "
-        "run_analysis.py를 먼저 실행했는지 확인해주세요."
-    )
+    print("- NW t: 자기상관을 보정한 t-stat (|t| > 1.96 이면 5% 유의, 일반 P-value 보다 보수적)")
+
+except FileNotFoundError as e:
+    print(f"오류: {e}")
@@ -1,14 +1,20 @@
+import sys
 from pathlib import Path
 
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
-DATA_DIR = Path(__file__).resolve().parents[1] / "database"
-df = pd.read_csv(DATA_DIR / "features_output.csv", index_col=0, parse_dates=True)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from correlation_engine import correlation_matrix
+from result_store import load_results
 
-# 주요 지표 간 상관관계
-corr = df[['gap', 'ret_1d', 'open_to_high', 'dir_ratio_long']].corr()
+df = load_results(['gap', 'ret_1d', 'open_to_high', 'dir_ratio_long'])
+
+# 주요 지표 간 상관관계 (+ 쌍별 P-value)
+result = correlation_matrix(df)
+corr = result.matrix("r")
+print(result.pairs().to_string(index=False, float_format=lambda v: f"{v:.4g}"))
 
 plt.figure(figsize=(8, 6))
 sns.heatmap(corr, annot=True, cmap='coolwarm', fmt=".2f")
@@ -1,18 +1,20 @@
+import sys
 from pathlib import Path
 
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 
-# 1. 결과 파일 로드
-DATA_DIR = Path(__file__).resolve().parents[1] / "database"
-file_path = DATA_DIR / "final_strategy_result.csv"
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from kpi_bootstrap import bootstrap_kpis, infer_cost
+from result_store import load_results, read_metadata
 
+# 1. 결과 파일 로드 (필요한 컬럼만)
 try:
-    df = pd.read_csv(file_path, index_col=0, parse_dates=True)
+    df = load_results(['gap', 'factor_rank', 'position', 'strategy_ret', 'strategy_net'])
     print(f"데이터 로드 완료: {len(df)} 거래일")
-except FileNotFoundError:
-    print("오류: 'final_strategy_result.csv' 파일을 찾을 수 없습니다.")
+except FileNotFoundError as e:
+    print(f"오류: {e}")
     exit()
 
 # 2. 예열 기간(Warm-up) 제외하기
@@ -54,6 +56,16 @@ print(f"총 매매 횟수               : {len(trade_days)}회")
 print(f"승률 (Win Rate)            : {win_rate:>.2f}%")
 print("="*40)
 
+# 3-1. 유의성 검정 (블록 부트스트랩 95% 구간 + 포지션 순열 p-value)
+# 순열 귀무분포는 백테스트와 같은 거래비용으로 (결과 파일의 Params, 없으면 수익 차이에서 역산)
+try:
+    cost = float(read_metadata()["params"]["cost"])
+except (FileNotFoundError, KeyError):
+    cost = infer_cost(df_clean)
+significance = bootstrap_kpis(df_clean, cost, n_paths=10_000, seed=0)
+print("\n[KPI 유의성 검정] (p-value: 무작위 타이밍이 관측값 이상일 확률)")
+print(significance.round(4))
+
 # 4. 시각화 (차트 그리기)
 plt.figure(figsize=(12, 8))
 
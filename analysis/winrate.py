@@ -1,17 +1,25 @@
+import sys
 from pathlib import Path
 
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
-DATA_DIR = Path(__file__).resolve().parents[1] / "database"
-df = pd.read_csv(DATA_DIR / "features_output.csv", index_col=0, parse_dates=True)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from condition_index import ConditionIndex
+from result_store import load_results
 
-# 갭 크기별 구간 나누기
-df['gap_rank'] = pd.qcut(df['gap'], 5, labels=["Very Low", "Low", "Mid", "High", "Very High"])
+df = load_results(['gap', 'open_to_high'])
+
+# 갭 크기별 구간 나누기 (qcut 과 같은 5분위 경계를 비트맵으로 미리 계산)
+labels = ["Very Low", "Low", "Mid", "High", "Very High"]
+index = ConditionIndex(df, features=['gap'], targets=('open_to_high',), quantiles=len(labels))
 
 # 구간별 '장중 고가 도달(open_to_high)' 평균 확인
-summary = df.groupby('gap_rank')['open_to_high'].mean()
+summary = pd.Series(
+    {label: index.mean('open_to_high', f'gap:q{i + 1}') for i, label in enumerate(labels)},
+    name='open_to_high',
+).rename_axis('gap_rank')
 print(summary)
 
 # 시각화
@@ -0,0 +1,117 @@
+from __future__ import annotations
+import argparse
+import json
+import sys
+import urllib.error
+import urllib.request
+
+# ==============================================================================
+# backtest_service.py 용 얇은 클라이언트 (표준 라이브러리만 사용 -> pandas import 없이 바로 실행)
+# ==============================================================================
+HOST = "127.0.0.1"
+PORT = 8765
+
+def request(op: str, payload: dict | None = None, host: str = HOST, port: int = PORT,
+            timeout: float = 600) -> dict:
+    data = json.dumps(payload or {}).encode("utf-8")
+    req = urllib.request.Request(f"http://{host}:{port}/{op}", data=data,
+                                 headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read())
+    except urllib.error.HTTPError as exc:
+        body = json.loads(exc.read() or b"{}")
+        raise SystemExit(f"[오류] {body.get('error', exc)}")
+    except urllib.error.URLError as exc:
+        raise SystemExit(f"[오류] 서버에 연결할 수 없습니다 ({exc.reason}). "
+                         f"먼저 python backtest_service.py 를 실행하세요.")
+
+def _fmt(value) -> str:
+    if isinstance(value, float): return f"{value:.6g}"
+    return "-" if value is None else str(value)
+
+def print_table(table: dict) -> None:
+    # {"columns", "index", "data"} -> 고정폭 표
+    header = ["", *table["columns"]]
+    rows = [[_fmt(i), *map(_fmt, row)] for i, row in zip(table["index"], table["data"])]
+    widths = [max(len(str(r[c])) for r in [header, *rows]) for c in range(len(header))]
+    for row in [header, *rows]:
+        print("  ".join(str(v).rjust(w) for v, w in zip(row, widths)))
+
+def print_result(result: dict) -> None:
+    for key, value in result.items():
+        if isinstance(value, dict) and {"columns", "data"} <= set(value):
+            print(f"\n[{key}]")
+            print_table(value)
+        elif isinstance(value, dict):
+            print(f"\n[{key}]")
+            for name, item in value.items():
+                print(f"  {name:<16}{_fmt(item) if not isinstance(item, dict) else json.dumps(item, ensure_ascii=False)}")
+        else:
+            print(f"{key}: {_fmt(value)}")
+
+def _params(args) -> dict:
+    names = {"window": "rolling_window", "buy": "buy_threshold", "sell": "sell_threshold", "cost": "cost"}
+    return {field: getattr(args, arg) for arg, field in names.items() if getattr(args, arg) is not None}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Query a running backtest_service.py.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON response.")
+    sub = parser.add_subparsers(dest="op", required=True)
+
+    sub.add_parser("status")
+    sub.add_parser("shutdown")
+    load = sub.add_parser("load")
+    load.add_argument("path")
+    load.add_argument("--name")
+    load.add_argument("--compact", action="store_true")
+    unload = sub.add_parser("unload")
+    unload.add_argument("dataset")
+
+    for op in ("backtest", "kpi"):
+        p = sub.add_parser(op)
+        p.add_argument("--dataset")
+        p.add_argument("--window", type=int)
+        p.add_argument("--buy", type=float)
+        p.add_argument("--sell", type=float)
+        p.add_argument("--cost", type=float)
+        if op == "backtest":
+            p.add_argument("--tail", type=int, default=20)
+
+    sweep = sub.add_parser("sweep")
+    sweep.add_argument("--dataset")
+    sweep.add_argument("--windows", type=int, nargs="+", dest="rolling_windows")
+    sweep.add_argument("--buys", type=float, nargs="+", dest="buy_thresholds")
+    sweep.add_argument("--sells", type=float, nargs="+", dest="sell_thresholds")
+    sweep.add_argument("--costs", type=float, nargs="+")
+    sweep.add_argument("--by", default="sharpe")
+    sweep.add_argument("--top", type=int, default=10)
+
+    ic = sub.add_parser("ic")
+    ic.add_argument("--dataset")
+    ic.add_argument("--target", default="Next_Gap")
+    ic.add_argument("--window", type=int, default=60)
+    return parser.parse_args(argv)
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    if args.op in ("backtest", "kpi"):
+        payload = {"dataset": args.dataset, "params": _params(args)}
+        if args.op == "backtest": payload["tail"] = args.tail
+    elif args.op == "load":
+        payload = {"path": args.path, "name": args.name, "compact": args.compact}
+    else:
+        skip = {"host", "port", "json", "op"}
+        payload = {k: v for k, v in vars(args).items() if k not in skip and v is not None}
+
+    result = request(args.op, payload, args.host, args.port)
+    if args.json:
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=1)
+        print()
+    else:
+        print_result(result)
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,58 @@
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+from condition_index import ConditionIndex
+from features import feature_store
 
 DATE_COL_CANDIDATES = ("date", "Date", "날짜", "일자", "거래일")
 
+# =========================
+# 1. 컬럼 정리 (필요 시 수정)
+# =========================
+RENAME_MAP = {
+    "시가지수(포인트)": "open",
+    "고가지수(포인트)": "high",
+    "저가지수(포인트)": "low",
+    "종가지수(포인트)": "close",
+    "거래대금(원)": "turnover",
+    "거래량 (5일 평균)(주)": "vol_ma5",
+    "거래량 (20일 평균)(주)": "vol_ma20",
+    "순매수대금(외국인계)(백만원)": "foreign_net",
+    "순매수대금(기관/외국인인계)(백만원)": "inst_foreign_net"
+}
 
-def parse_args():
+DATAGUIDE_MAP = {
+    "I31000010F": "open",
+    "I31000020F": "high",
+    "I31000030F": "low",
+    "I31000040F": "close",
+    "I31000050F": "volume"
+}
+
+REQUIRED_COLS = ("open", "high", "low", "close")
+
+# 오프닝 알파 '기회'가 있었던 날 정의 (조건 비트맵 질의식)
+ALPHA_THRESHOLDS = {"open_to_high": [0.003], "open_to_low": [-0.0015], "dir_ratio_long": [0.6]}
+ALPHA_QUERY = "open_to_high>0.003 & open_to_low>-0.0015 & dir_ratio_long>0.6"
+
+FEATURE_NAMES = (
+    "ret_1d",
+    "gap",                                  # 오버나이트 갭
+    "open_to_high", "open_to_low",          # 오프닝 확장 proxy
+    "range", "dir_ratio_long", "dir_ratio_short",
+    "atr20", "vol_regime",                  # True Range / ATR
+)
+
+
+def parse_args(argv=None):
     parser = argparse.ArgumentParser(
         description="Overnight gap analysis for OHLC time series data."
     )
-    parser.add_argument("path", help="Input Excel/CSV file path.")
+    parser.add_argument("paths", nargs="+", metavar="path", help="Input Excel/CSV file path(s).")
     parser.add_argument("--sheet", help="Excel sheet name or index.")
     parser.add_argument("--encoding", help="CSV encoding (e.g. cp949).")
     parser.add_argument("--date-col", dest="date_col", help="Date column name.")
@@ -21,7 +61,13 @@ def parse_args():
     parser.add_argument("--low-col", dest="low_col", help="Low column name.")
     parser.add_argument("--close-col", dest="close_col", help="Close column name.")
     parser.add_argument("--volume-col", dest="volume_col", help="Volume column name.")
-    return parser.parse_args()
+    parser.add_argument("--headless", action="store_true",
+                        help="Render charts to files instead of showing them.")
+    parser.add_argument("--output-dir", dest="output_dir", default="charts",
+                        help="Chart pack directory for --headless (one sub-folder per input).")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for --headless rendering.")
+    return parser.parse_args(argv)
 
 
 def load_data(path, sheet=None, encoding=None):
@@ -46,159 +92,197 @@ def resolve_date_col(df, date_col):
             return candidate
     return None
 
-# =========================
-# 1. 컬럼 정리 (필요 시 수정)
-# =========================
-rename_map = {
-    "시가지수(포인트)": "open",
-    "고가지수(포인트)": "high",
-    "저가지수(포인트)": "low",
-    "종가지수(포인트)": "close",
-    "거래대금(원)": "turnover",
-    "거래량 (5일 평균)(주)": "vol_ma5",
-    "거래량 (20일 평균)(주)": "vol_ma20",
-    "순매수대금(외국인계)(백만원)": "foreign_net",
-    "순매수대금(기관/외국인인계)(백만원)": "inst_foreign_net"
-}
 
-dataguide_map = {
-    "I31000010F": "open",
-    "I31000020F": "high",
-    "I31000030F": "low",
-    "I31000040F": "close",
-    "I31000050F": "volume"
-}
+def prepare_frame(df, date_col=None, column_overrides=None):
+    # 날짜 인덱스 + 컬럼명 통일 (column_overrides: {원본 컬럼명: open/high/...})
+    date_col = resolve_date_col(df, date_col)
+    if date_col:
+        df = df.copy()
+        df[date_col] = pd.to_datetime(df[date_col])
+        df = df.set_index(date_col)
+
+    rename_map = {**RENAME_MAP, **DATAGUIDE_MAP, **(column_overrides or {})}
+    df = df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns})
+    df = df.sort_index()
+
+    missing = [col for col in REQUIRED_COLS if col not in df.columns]
+    if missing:
+        raise SystemExit(
+            f"Missing required columns after renaming: {', '.join(missing)}. "
+            "Use --open-col/--high-col/--low-col/--close-col if needed."
+        )
+    return df
 
-args = parse_args()
-df = load_data(args.path, args.sheet, args.encoding)
-
-date_col = resolve_date_col(df, args.date_col)
-if date_col:
-    df[date_col] = pd.to_datetime(df[date_col])
-    df = df.set_index(date_col)
-
-rename_map = {**rename_map, **dataguide_map}
-for col_name, target in (
-    (args.open_col, "open"),
-    (args.high_col, "high"),
-    (args.low_col, "low"),
-    (args.close_col, "close"),
-    (args.volume_col, "volume"),
-):
-    if col_name:
-        rename_map[col_name] = target
-
-df = df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns})
-df = df.sort_index()
-
-required_cols = ("open", "high", "low", "close")
-missing = [col for col in required_cols if col not in df.columns]
-if missing:
-    raise SystemExit(
-        f"Missing required columns after renaming: {', '.join(missing)}. "
-        "Use --open-col/--high-col/--low-col/--close-col if needed."
-    )
 
 # =========================
 # 2. Feature Engineering
 # =========================
-df["ret_1d"] = df["close"].pct_change()
-
-# 오버나이트 갭
-df["gap"] = (df["open"] - df["close"].shift(1)) / df["close"].shift(1)
-
-# 오프닝 확장 proxy
-df["open_to_high"] = (df["high"] - df["open"]) / df["open"]
-df["open_to_low"]  = (df["low"] - df["open"]) / df["open"]
+def compute_features(df):
+    # 공통 피처 레지스트리에서 계산 (중간값 prev_close / range / true_range 는 한 번만)
+    store = feature_store(df)
+    out = df.copy()
+    for name in FEATURE_NAMES:
+        out[name] = store.get(name)
+    return out
 
-df["range"] = df["high"] - df["low"]
-df["dir_ratio_long"]  = (df["high"] - df["open"]) / df["range"]
-df["dir_ratio_short"] = (df["open"] - df["low"]) / df["range"]
-
-# True Range / ATR
-tr = pd.concat([
-    df["high"] - df["low"],
-    (df["high"] - df["close"].shift(1)).abs(),
-    (df["low"] - df["close"].shift(1)).abs()
-], axis=1).max(axis=1)
-
-df["atr20"] = tr.rolling(20).mean()
-df["vol_regime"] = (df["atr20"] / df["close"]).rolling(20).rank(pct=True)
 
 # =========================
 # 3. 시각화
 # =========================
+def _hist(df, column, title, new_figure):
+    fig = new_figure()
+    ax = fig.add_subplot()
+    df[column].hist(bins=60, ax=ax, figure=fig)
+    ax.set_title(title)
+    return fig
+
+
+def iter_figures(df, new_figure=Figure):
+    # (파일명, Figure) 를 하나씩 생성. new_figure=plt.figure 이면 대화형 창
+    # (1) 가격과 변동성 레짐
+    fig = new_figure()
+    df["close"].plot(title="MKF2000 Close Price", ax=fig.add_subplot())
+    yield "01_close", fig
+
+    fig = new_figure()
+    ax = fig.add_subplot()
+    df["vol_regime"].plot(title="Volatility Regime (ATR-based Percentile)", ax=ax)
+    ax.axhline(0.8, linestyle="--")
+    yield "02_vol_regime", fig
+
+    # (2) 오버나이트 갭 분포
+    yield "03_gap_hist", _hist(df, "gap", "Overnight Gap Distribution", new_figure)
+
+    # (3) 오프닝 확장 분포
+    yield "04_open_to_high_hist", _hist(df, "open_to_high", "Open → High Expansion Distribution", new_figure)
+    yield "05_open_to_low_hist", _hist(df, "open_to_low", "Open → Low Expansion Distribution", new_figure)
+
+    # (4) 방향성 vs 노이즈
+    yield "06_dir_ratio_long_hist", _hist(df, "dir_ratio_long", "Directional Ratio (Long)", new_figure)
+
+    # (5) 수급 누적
+    if "foreign_net" in df.columns:
+        fig = new_figure()
+        df["foreign_net"].cumsum().plot(title="Cumulative Foreign Net Flow", ax=fig.add_subplot())
+        yield "07_foreign_net_cumsum", fig
+
+    if "inst_foreign_net" in df.columns:
+        fig = new_figure()
+        df["inst_foreign_net"].cumsum().plot(title="Cumulative Inst+Foreign Net Flow", ax=fig.add_subplot())
+        yield "08_inst_foreign_net_cumsum", fig
+
+
+def render_charts(df, output_dir):
+    # 백엔드 없이 Figure 객체로 그려 PNG 저장 (배치/서버용)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, fig in iter_figures(df):
+        path = output_dir / f"{name}.png"
+        fig.savefig(path)
+        paths.append(path)
+    return paths
 
-# (1) 가격과 변동성 레짐
-plt.figure()
-df["close"].plot(title="MKF2000 Close Price")
-plt.show()
-
-plt.figure()
-df["vol_regime"].plot(title="Volatility Regime (ATR-based Percentile)")
-plt.axhline(0.8, linestyle="--")
-plt.show()
-
-# (2) 오버나이트 갭 분포
-plt.figure()
-df["gap"].hist(bins=60)
-plt.title("Overnight Gap Distribution")
-plt.show()
-
-# (3) 오프닝 확장 분포
-plt.figure()
-df["open_to_high"].hist(bins=60)
-plt.title("Open → High Expansion Distribution")
-plt.show()
-
-plt.figure()
-df["open_to_low"].hist(bins=60)
-plt.title("Open → Low Expansion Distribution")
-plt.show()
-
-# (4) 방향성 vs 노이즈
-plt.figure()
-df["dir_ratio_long"].hist(bins=60)
-plt.title("Directional Ratio (Long)")
-plt.show()
-
-# (5) 수급 누적
-if "foreign_net" in df.columns:
-    plt.figure()
-    df["foreign_net"].cumsum().plot(title="Cumulative Foreign Net Flow")
-    plt.show()
-
-if "inst_foreign_net" in df.columns:
-    plt.figure()
-    df["inst_foreign_net"].cumsum().plot(title="Cumulative Inst+Foreign Net Flow")
-    plt.show()
 
 # =========================
 # 4. 조건부 분석 (전략에 핵심)
 # =========================
+def condition_index(df, thresholds=None, quantiles=0, targets=()):
+    # 임계값/분위 조건 비트맵을 미리 만들어 두고 AND/OR 조합은 비트 연산으로 질의
+    thresholds = {**ALPHA_THRESHOLDS, **(thresholds or {})}
+    if "foreign_net" in df.columns:
+        thresholds.setdefault("foreign_net", [0])
+    return ConditionIndex(df, features=list(thresholds), targets=targets,
+                          quantiles=quantiles, thresholds=thresholds)
+
+
+def alpha_opportunity(df, index=None):
+    index = index or condition_index(df)
+    alpha_days = index.count(ALPHA_QUERY)
+    stats = {
+        "alpha_days": alpha_days,
+        "alpha_ratio": alpha_days / len(df),
+    }
+    # 수급 조건이 있을 때 확률 변화
+    if "foreign_net" in df.columns:
+        stats["alpha_prob_foreign_net_pos"] = index.probability(ALPHA_QUERY, given="foreign_net>0")
+    return stats
 
-# 오프닝 알파 '기회'가 있었던 날 정의
-alpha_days = df[
-    (df["open_to_high"] > 0.003) &
-    (df["open_to_low"] > -0.0015) &
-    (df["dir_ratio_long"] > 0.6)
-]
-
-print("Alpha opportunity days:", len(alpha_days))
-print("Alpha days ratio:", len(alpha_days) / len(df))
-
-# 수급 조건이 있을 때 확률 변화
-if "foreign_net" in df.columns:
-    cond = df["foreign_net"] > 0
-    print("Alpha prob | Foreign Net > 0:",
-          ((cond) & (df.index.isin(alpha_days.index))).sum() / cond.sum())
 
 # =========================
 # 5. 요약 통계
 # =========================
-summary = df[
-    ["gap", "open_to_high", "open_to_low",
-     "dir_ratio_long", "vol_regime"]
-].describe()
+def summarize(df):
+    return df[
+        ["gap", "open_to_high", "open_to_low",
+         "dir_ratio_long", "vol_regime"]
+    ].describe()
 
-print(summary)
+
+def analyze_file(path, sheet=None, encoding=None, date_col=None, column_overrides=None):
+    df = load_data(path, sheet, encoding)
+    return compute_features(prepare_frame(df, date_col, column_overrides))
+
+
+def _print_report(stats, summary):
+    print("Alpha opportunity days:", stats["alpha_days"])
+    print("Alpha days ratio:", stats["alpha_ratio"])
+    if "alpha_prob_foreign_net_pos" in stats:
+        print("Alpha prob | Foreign Net > 0:", stats["alpha_prob_foreign_net_pos"])
+    print(summary)
+
+
+# =========================
+# 6. 헤드리스 차트 팩 (여러 파일 병렬 렌더링)
+# =========================
+def render_file(path, output_dir, **load_kwargs):
+    # 워커 1개 작업: 파일 하나 -> output_dir/<파일명>/ 에 차트 + 요약 저장
+    df = analyze_file(path, **load_kwargs)
+    target = Path(output_dir) / Path(path).stem
+    charts = render_charts(df, target)
+    summarize(df).to_csv(target / "summary.csv")
+    return {"file": str(path), "charts": len(charts), **alpha_opportunity(df)}
+
+
+def render_chart_packs(paths, output_dir, workers=None, **load_kwargs):
+    paths = list(paths)
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(render_file, p, output_dir, **load_kwargs) for p in paths]
+        results = [f.result() for f in futures]
+    report = pd.DataFrame(results)
+    report.to_csv(Path(output_dir) / "alpha_stats.csv", index=False)
+    return report
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    overrides = {
+        col_name: target
+        for col_name, target in (
+            (args.open_col, "open"),
+            (args.high_col, "high"),
+            (args.low_col, "low"),
+            (args.close_col, "close"),
+            (args.volume_col, "volume"),
+        )
+        if col_name
+    }
+    load_kwargs = dict(sheet=args.sheet, encoding=args.encoding,
+                       date_col=args.date_col, column_overrides=overrides)
+
+    if args.headless or len(args.paths) > 1:
+        report = render_chart_packs(args.paths, args.output_dir, args.workers, **load_kwargs)
+        print(report.to_string(index=False))
+        print(f"\n[완료] 차트가 '{args.output_dir}'에 저장되었습니다.")
+        return
+
+    import matplotlib.pyplot as plt
+
+    df = analyze_file(args.paths[0], **load_kwargs)
+    for _, _fig in iter_figures(df, new_figure=plt.figure):
+        plt.show()
+    _print_report(alpha_opportunity(df), summarize(df))
+
+
+if __name__ == "__main__":
+    main()
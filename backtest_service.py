@@ -0,0 +1,230 @@
+from __future__ import annotations
+import argparse
+import json
+import time
+from dataclasses import asdict, fields
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from flow_ridge import FLOW_CODE_MAP, flow_factors
+from ic_engine import forward_targets, ic_table
+from kpi import cagr, max_drawdown, sharpe_ratio, total_return, trade_count, win_rate
+from overnight_alpha import Params, load_dataguide_excel, map_item_codes, run_alpha_factor_testing
+from param_sweep import run_param_sweep
+from walk_forward import DEFAULT_GRID
+
+# ==============================================================================
+# 1. 설정
+# ==============================================================================
+# 로컬 상주 백테스트 서버: 데이터셋을 한 번 로드해 메모리에 두고 (피처는 feature_store 가 유지)
+# JSON POST 요청으로 backtest / kpi / sweep / ic 질의에 응답. 클라이언트는 backtest_client.py
+# 요청은 한 번에 하나씩 처리 (feature_store 캐시를 스레드 간에 공유하지 않음)
+HOST = "127.0.0.1"
+PORT = 8765
+DEFAULT_TAIL = 20
+
+class ServiceError(Exception):
+    # 클라이언트 요청 오류 (HTTP 400)
+    pass
+
+# ==============================================================================
+# 2. 응답 변환
+# ==============================================================================
+def _records(frame: pd.DataFrame) -> dict:
+    # DataFrame -> {"columns", "index", "data"} (NaN -> null, 날짜 -> ISO 문자열)
+    return json.loads(frame.to_json(orient="split", date_format="iso", double_precision=10))
+
+def _params(payload: dict) -> Params:
+    values = payload.get("params") or {}
+    unknown = set(values) - {f.name for f in fields(Params)}
+    if unknown: raise ServiceError(f"Unknown Params fields: {sorted(unknown)}")
+    return Params(**values)
+
+def flow_frame(df: pd.DataFrame) -> pd.DataFrame:
+    # flow_factors 입력 정리: Item 코드 컬럼은 매핑 이름으로, 수급/가격 컬럼은 숫자로
+    # (이미 정리된 데이터셋이면 같은 객체를 그대로 돌려줌 -> feature_store 캐시 유지)
+    df = map_item_codes(df)
+    sources = [c for pair in FLOW_CODE_MAP.items() for c in pair] + ["open", "close", "turnover"]
+    loose = [c for c in dict.fromkeys(sources) if c in df.columns and df[c].dtype == object]
+    if not loose: return df
+    df = df.copy(deep=False)
+    for col in loose:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+def backtest_kpis(backtest: pd.DataFrame) -> dict:
+    # analysis/result.py 와 같은 정의: 랭크 예열 구간을 잘라낸 뒤 자산 곡선을 1 부터 다시 계산
+    clean = backtest.dropna(subset=["factor_rank"])
+    if clean.empty: raise ServiceError("No rows with a valid factor_rank (history shorter than rolling_window?)")
+    net = clean["strategy_net"].to_numpy(dtype="float64")
+    position = clean["position"].to_numpy(dtype="float64")
+    equity = np.cumprod(1 + np.nan_to_num(net))
+    days = (clean.index[-1] - clean.index[0]).days if isinstance(clean.index, pd.DatetimeIndex) else len(clean)
+    return {
+        "start": str(clean.index[0]),
+        "end": str(clean.index[-1]),
+        "days": int(len(clean)),
+        "total_return": float(total_return(equity)[0]),
+        "cagr": float(cagr(equity, days)[0]),
+        "mdd": float(max_drawdown(equity)[0]),
+        "sharpe": float(sharpe_ratio(net)[0]),
+        "win_rate": float(win_rate(net, position)[0]),
+        "trades": int(trade_count(position)[0]),
+        "last_position": float(position[-1]),
+    }
+
+# ==============================================================================
+# 3. 서비스 (데이터셋 보관 + 질의 처리)
+# ==============================================================================
+class BacktestService:
+    def __init__(self):
+        self.datasets: dict[str, pd.DataFrame] = {}
+        self.sources: dict[str, str] = {}
+        self.started = time.time()
+
+    def dataset(self, payload: dict) -> pd.DataFrame:
+        name = payload.get("dataset")
+        if name is None and len(self.datasets) == 1:
+            name = next(iter(self.datasets))
+        if name not in self.datasets:
+            raise ServiceError(f"Unknown dataset {name!r}; loaded: {sorted(self.datasets)}")
+        return self.datasets[name]
+
+    def op_load(self, payload: dict) -> dict:
+        path = Path(payload["path"]).expanduser()
+        if not path.exists(): raise ServiceError(f"File not found: {path}")
+        name = payload.get("name") or path.stem
+        df = load_dataguide_excel(path, use_cache=payload.get("use_cache", True),
+                                  compact=payload.get("compact", False))
+        self.datasets[name] = df
+        self.sources[name] = str(path.resolve())
+        return {"dataset": name, **self._describe(name)}
+
+    def op_unload(self, payload: dict) -> dict:
+        name = payload.get("dataset")
+        if self.datasets.pop(name, None) is None: raise ServiceError(f"Unknown dataset {name!r}")
+        self.sources.pop(name, None)
+        return {"unloaded": name}
+
+    def _describe(self, name: str) -> dict:
+        df = self.datasets[name]
+        return {"source": self.sources[name], "rows": len(df), "columns": len(df.columns),
+                "start": str(df.index.min()) if len(df) else None,
+                "end": str(df.index.max()) if len(df) else None}
+
+    def op_status(self, payload: dict) -> dict:
+        return {"uptime_s": time.time() - self.started, "defaults": asdict(Params()),
+                "datasets": {name: self._describe(name) for name in self.datasets}}
+
+    def op_backtest(self, payload: dict) -> dict:
+        params = _params(payload)
+        _, _, backtest = run_alpha_factor_testing(self.dataset(payload), params)
+        tail = int(payload.get("tail", DEFAULT_TAIL))
+        return {"params": asdict(params), "kpis": backtest_kpis(backtest),
+                "tail": _records(backtest[["position", "strategy_net", "equity"]].tail(tail))}
+
+    def op_kpi(self, payload: dict) -> dict:
+        params = _params(payload)
+        _, _, backtest = run_alpha_factor_testing(self.dataset(payload), params)
+        return {"params": asdict(params), "kpis": backtest_kpis(backtest)}
+
+    def op_sweep(self, payload: dict) -> dict:
+        grid = {key: payload.get(key) or DEFAULT_GRID[key] for key in DEFAULT_GRID}
+        by = payload.get("by", "sharpe")
+        results = run_param_sweep(self.dataset(payload), **grid)
+        if by not in results.columns: raise ServiceError(f"Unknown sort column {by!r}")
+        top = results.sort_values(by, ascending=False).head(int(payload.get("top", 10)))
+        return {"combinations": len(results), "by": by, "top": _records(top.reset_index(drop=True))}
+
+    def op_ic(self, payload: dict) -> dict:
+        df = flow_frame(self.dataset(payload))
+        factors = flow_factors(df)
+        table = ic_table(factors, forward_targets(df), window=int(payload.get("window", 60)))
+        target = payload.get("target")
+        if target is not None:
+            table = table[table["target"] == target]
+        return {"table": _records(table.reset_index(drop=True))}
+
+    def handle(self, op: str, payload: dict) -> dict:
+        handler = getattr(self, f"op_{op}", None)
+        if handler is None: raise ServiceError(f"Unknown operation {op!r}")
+        t0 = time.perf_counter()
+        result = handler(payload)
+        result["elapsed_ms"] = (time.perf_counter() - t0) * 1000
+        return result
+
+# ==============================================================================
+# 4. HTTP 서버
+# ==============================================================================
+def make_handler(service: BacktestService):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: dict) -> None:
+            data = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _dispatch(self, payload: dict) -> None:
+            op = self.path.strip("/") or "status"
+            if op == "shutdown":
+                self._send(200, {"shutdown": True})
+                self.server.stopping = True
+                return
+            try:
+                self._send(200, service.handle(op, payload))
+            except (ServiceError, KeyError, TypeError, ValueError) as exc:
+                self._send(400, {"error": f"{type(exc).__name__}: {exc}"})
+            except Exception as exc:   # 서버는 계속 살아 있어야 함
+                self._send(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+        def do_GET(self):
+            self._dispatch({})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send(400, {"error": "Request body is not valid JSON"})
+                return
+            self._dispatch(payload)
+
+        def log_message(self, fmt, *args):
+            print(f"[{self.log_date_time_string()}] {fmt % args}")
+
+    return Handler
+
+def serve(host: str = HOST, port: int = PORT, preload=(), compact: bool = False) -> None:
+    service = BacktestService()
+    for path in preload:
+        info = service.op_load({"path": path, "compact": compact})
+        print(f"[로드] {info['dataset']}: {info['rows']}행 ({info['start']} ~ {info['end']})")
+
+    server = HTTPServer((host, port), make_handler(service))
+    server.stopping = False
+    print(f"백테스트 서버 대기 중: http://{host}:{port}  (종료: backtest_client.py shutdown)")
+    try:
+        while not server.stopping:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve backtests over HTTP with datasets kept in memory.")
+    parser.add_argument("paths", nargs="*", help="DataGuide workbooks to load at startup.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--compact", action="store_true", help="Load only the mapped fields as float32.")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    serve(args.host, args.port, args.paths, args.compact)
+
+if __name__ == "__main__":
+    main()
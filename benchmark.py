@@ -0,0 +1,259 @@
+from __future__ import annotations
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import dataguide_cache
+from collinearity import vif_table
+from features import feature_store
+from ic_engine import forward_targets, ic_table
+from kpi_bootstrap import bootstrap_kpis
+from overnight_alpha import (ITEM_CODE_MAP, Params, load_dataguide_excel, run_alpha_factor_testing,
+                             stream_dataguide_excel)
+from overnight_panel import load_dataguide_panel, run_panel_backtest
+from param_sweep import run_param_sweep
+from synthetic_dataguide import (FLOW_CODES, MAX_NS_DAILY_ROWS, synthetic_frame, synthetic_panel,
+                                 write_dataguide_workbook)
+from walk_forward import run_walk_forward
+
+# ==============================================================================
+# 1. 설정
+# ==============================================================================
+BENCH_DIR = Path(__file__).resolve().parent / "database" / "benchmarks"
+ROW_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+INSTRUMENT_SIZES = (1, 10, 100, 500)
+QUICK_ROWS = (1_000, 10_000)
+QUICK_INSTRUMENTS = (1, 10)
+
+# openpyxl 쓰기/읽기가 느리므로 엑셀 단계는 이 행 수까지만 (나머지 단계는 전체 크기)
+# 로더 인덱스가 datetime64[ns] 라 MAX_NS_DAILY_ROWS (~10.3만 일) 를 넘을 수 없음
+WORKBOOK_MAX_ROWS = 100_000
+# 패널 단계: 행 x 종목 셀 수 상한 (필드당 float64 8바이트)
+PANEL_MAX_CELLS = 20_000_000
+# 워크포워드는 폴드 수가, 부트스트랩은 (경로 x 일수) 버퍼가 행 수에 비례하므로 따로 제한
+WALK_FORWARD_MAX_ROWS = 10_000
+BOOTSTRAP_MAX_ROWS = 100_000
+BOOTSTRAP_PATHS = 200
+
+BENCH_GRID = {
+    "rolling_windows": (20, 60, 120),
+    "buy_thresholds": (0.05, 0.10, 0.20),
+    "sell_thresholds": (0.80, 0.90, 0.95),
+}
+REGRESSION_TOLERANCE = 0.10
+WORKBOOK_STAGES = ("load_dataguide_excel", "stream_dataguide_excel", "load_dataguide_excel_cached")
+
+# ==============================================================================
+# 2. 측정 (시간: 반복 중 최솟값/중앙값, 메모리: tracemalloc 별도 1회)
+# ==============================================================================
+def measure(func, setup=None, repeat: int = 3) -> dict:
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+
+    # 추적 오버헤드가 시간에 섞이지 않도록 메모리는 따로 측정
+    arg = setup() if setup else None
+    tracemalloc.start()
+    try:
+        func(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "best_s": min(times),
+        "median_s": statistics.median(times),
+        "peak_mb": peak / 2 ** 20,
+    }
+
+def _cold(df: pd.DataFrame):
+    # 피처 캐시를 비워 매 반복을 처음 실행과 같게 만듦
+    def setup():
+        feature_store(df).clear()
+        return df
+    return setup
+
+# ==============================================================================
+# 3. 단계 정의: (이름, setup, func)
+# ==============================================================================
+def _flow_names(df: pd.DataFrame) -> list[str]:
+    flows = [c for c in df.columns if c in FLOW_CODES or c.startswith("net_")]
+    return [f"Ratio_{c}" for c in flows]
+
+def frame_stages(df: pd.DataFrame, n_rows: int):
+    params = Params()
+    ratios = _flow_names(df)
+    yield "run_alpha_factor_testing", _cold(df), lambda d: run_alpha_factor_testing(d, params)
+    yield "flow_features", _cold(df), lambda d: feature_store(d).frame(ratios)
+
+    factors = feature_store(df).frame(ratios)
+    targets = forward_targets(df)
+    yield "ic_table", None, lambda _: ic_table(factors, targets)
+    yield "vif_table", None, lambda _: vif_table(factors)
+
+    yield "run_param_sweep", _cold(df), lambda d: run_param_sweep(d, **BENCH_GRID)
+    if n_rows <= BOOTSTRAP_MAX_ROWS:
+        _, _, backtest = run_alpha_factor_testing(df, params)
+        yield "bootstrap_kpis", None, lambda _: bootstrap_kpis(backtest, params.cost, n_paths=BOOTSTRAP_PATHS, seed=0)
+
+    if n_rows <= WALK_FORWARD_MAX_ROWS:
+        yield "run_walk_forward", None, lambda _: run_walk_forward(
+            df, train_size=500, test_size=60, grid=BENCH_GRID, max_workers=1)
+
+def workbook_stages(path: Path):
+    yield "load_dataguide_excel", None, lambda _: load_dataguide_excel(path, use_cache=False)
+    yield "stream_dataguide_excel", None, lambda _: stream_dataguide_excel(path, use_cache=False)
+    load_dataguide_excel(path)   # 캐시 생성
+    yield "load_dataguide_excel_cached", None, lambda _: load_dataguide_excel(path)
+
+def panel_stages(panel: dict[str, pd.DataFrame], path: Path | None):
+    params = Params()
+    yield "run_panel_backtest", None, lambda _: run_panel_backtest(panel, params)
+    if path is not None:
+        yield "load_dataguide_panel", None, lambda _: load_dataguide_panel(path, use_cache=False)
+
+# ==============================================================================
+# 4. 실행
+# ==============================================================================
+def _run_stages(stages, n_rows: int, n_instruments: int, repeat: int, only, log) -> list[dict]:
+    results = []
+    for stage, setup, func in stages:
+        if only and stage not in only: continue
+        stats = measure(func, setup, repeat)
+        results.append({"stage": stage, "rows": n_rows, "instruments": n_instruments,
+                        "repeat": repeat, **stats,
+                        "rows_per_s": n_rows * n_instruments / stats["best_s"] if stats["best_s"] else None})
+        log(f"  {stage:<28} rows={n_rows:>9,} inst={n_instruments:>4}  "
+            f"best={stats['best_s']:.4f}s  peak={stats['peak_mb']:.1f}MB")
+    return results
+
+def run_benchmarks(rows=ROW_SIZES, instruments=INSTRUMENT_SIZES, repeat: int = 3,
+                   stages=None, workbook_max_rows: int = WORKBOOK_MAX_ROWS,
+                   panel_max_cells: int = PANEL_MAX_CELLS, seed: int = 0, log=print) -> list[dict]:
+    # rows: DataGuide 시트 행 수 (주말 포함 일별 달력), instruments: 패널 종목 수
+    # 엑셀 단계는 workbook_max_rows 와 MAX_NS_DAILY_ROWS 중 작은 값까지만
+    only = set(stages) if stages else None
+    workbook_max_rows = min(workbook_max_rows, MAX_NS_DAILY_ROWS)
+    results = []
+    saved_cache_dir = dataguide_cache.CACHE_DIR
+    with tempfile.TemporaryDirectory(prefix="overnight_bench_") as tmp:
+        tmp = Path(tmp)
+        dataguide_cache.CACHE_DIR = tmp / "cache"
+        try:
+            for n_rows in rows:
+                log(f"[rows={n_rows:,}]")
+                df = synthetic_frame(n_rows, seed)
+                results += _run_stages(frame_stages(df, n_rows), n_rows, 1, repeat, only, log)
+                if n_rows <= workbook_max_rows and (not only or only & set(WORKBOOK_STAGES)):
+                    path = write_dataguide_workbook(tmp / f"single_{n_rows}.xlsx", n_rows, seed=seed)
+                    results += _run_stages(workbook_stages(path), n_rows, 1, repeat, only, log)
+                del df
+
+                for n_inst in instruments:
+                    if n_rows * n_inst > panel_max_cells: continue
+                    panel = synthetic_panel(n_rows, n_inst, seed)
+                    path = None
+                    if n_rows * n_inst <= workbook_max_rows and (not only or "load_dataguide_panel" in only):
+                        path = write_dataguide_workbook(tmp / f"panel_{n_rows}_{n_inst}.xlsx",
+                                                        n_rows, n_inst, seed=seed, codes=list(ITEM_CODE_MAP))
+                    results += _run_stages(panel_stages(panel, path), n_rows, n_inst, repeat, only, log)
+        finally:
+            dataguide_cache.CACHE_DIR = saved_cache_dir
+    return results
+
+# ==============================================================================
+# 5. 결과 저장 / 비교 (JSON, 실행 간 회귀 확인용)
+# ==============================================================================
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).resolve().parent,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment() -> dict:
+    return {
+        "created": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "git": _git_revision(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+def write_report(results: list[dict], path: str | Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"environment": environment(), "results": results}
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=1), encoding="utf-8")
+    return path
+
+def load_report(path: str | Path) -> pd.DataFrame:
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return pd.DataFrame(payload["results"])
+
+def compare_results(baseline: pd.DataFrame, current: pd.DataFrame,
+                    tolerance: float = REGRESSION_TOLERANCE) -> pd.DataFrame:
+    # 같은 (단계, 행, 종목) 끼리 best 시간 / 최대 메모리 비율 (> 1 + tolerance 이면 회귀)
+    keys = ["stage", "rows", "instruments"]
+    merged = baseline[keys + ["best_s", "peak_mb"]].merge(
+        current[keys + ["best_s", "peak_mb"]], on=keys, suffixes=("_base", "_new"))
+    merged["time_ratio"] = merged["best_s_new"] / merged["best_s_base"]
+    merged["mem_ratio"] = merged["peak_mb_new"] / merged["peak_mb_base"]
+    merged["regression"] = (merged["time_ratio"] > 1 + tolerance) | (merged["mem_ratio"] > 1 + tolerance)
+    return merged
+
+# ==============================================================================
+# 6. CLI
+# ==============================================================================
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the overnight backtest pipeline on synthetic DataGuide data.")
+    parser.add_argument("--rows", type=int, nargs="+", help="Sheet row counts (default: 1k 10k 100k 1M).")
+    parser.add_argument("--instruments", type=int, nargs="+", help="Panel sizes (default: 1 10 100 500).")
+    parser.add_argument("--quick", action="store_true", help="Small preset: rows 1k 10k, instruments 1 10.")
+    parser.add_argument("--stages", nargs="+", help="Only run these stage names.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workbook-max-rows", type=int, default=WORKBOOK_MAX_ROWS)
+    parser.add_argument("--panel-max-cells", type=int, default=PANEL_MAX_CELLS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Result JSON path (default: database/benchmarks/bench-<time>.json).")
+    parser.add_argument("--compare", help="Baseline JSON to compare against.")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    rows = args.rows or (QUICK_ROWS if args.quick else ROW_SIZES)
+    instruments = args.instruments or (QUICK_INSTRUMENTS if args.quick else INSTRUMENT_SIZES)
+
+    results = run_benchmarks(rows, instruments, args.repeat, args.stages,
+                             args.workbook_max_rows, args.panel_max_cells, args.seed)
+    output = Path(args.output) if args.output else \
+        BENCH_DIR / f"bench-{pd.Timestamp.now():%Y%m%d-%H%M%S}.json"
+    write_report(results, output)
+    print(f"\n[완료] 벤치마크 결과가 '{output}'에 저장되었습니다.")
+
+    if args.compare:
+        table = compare_results(load_report(args.compare), pd.DataFrame(results), args.tolerance)
+        with pd.option_context("display.width", 160, "display.max_rows", None):
+            print(table[["stage", "rows", "instruments", "best_s_base", "best_s_new",
+                         "time_ratio", "mem_ratio", "regression"]].round(4).to_string(index=False))
+        if table["regression"].any():
+            print(f"\n[회귀] {int(table['regression'].sum())}개 단계가 기준보다 느리거나 메모리를 더 씁니다.")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+from __future__ import annotations
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+import argparse
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from dataguide_cache import CACHE_VERSION, read_meta, write_frame
+from features import TURNOVER_WINDOW, window_mean
+from instrumentation import instrumented
+from overnight_alpha import Params
+from rolling_rank import rolling_rank_array
+
+# ==============================================================================
+# 1. 설정
+# ==============================================================================
+# 메모리에 다 올리지 않고 컬럼 저장소(.npy, mmap)에서 날짜순 청크를 읽어 run_alpha_factor_testing 과
+# 같은 백테스트를 수행. 청크 경계를 넘는 상태만 들고 다님:
+#   거래대금 마지막 4개 (5일 평균), 비율 마지막 window-1 개 (랭크 윈도우), 마지막 종가, 마지막 시그널, equity
+# 모든 단계가 윈도우 안 값만으로 정해지므로 결과는 메모리 경로와 비트 단위로 같음
+STORE_FIELDS = ("open", "close", "turnover", "net_priv_fund")
+OUTPUT_COLUMNS = ("gap", "priv_fund_ratio", "factor_rank", "position", "strategy_ret", "strategy_net", "equity")
+DEFAULT_CHUNK_ROWS = 100_000
+
+def write_store(df: pd.DataFrame, directory: str | Path, fields=STORE_FIELDS) -> Path:
+    # 프레임 -> 컬럼 저장소 (dataguide_cache 캐시 항목과 같은 형식이라 캐시 폴더를 바로 써도 됨)
+    write_frame(df[[c for c in fields if c in df.columns]].astype("float64"), directory)
+    return Path(directory)
+
+def _open_store(directory: Path, columns) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    meta = read_meta(directory)
+    if meta is None: raise FileNotFoundError(f"No column store in {directory}")
+    # 숫자(native) 컬럼만 mmap 으로 읽을 수 있음. 문자열(str) 컬럼이나 같은 이름이 여러 개면 오류
+    specs = meta["columns"]
+    arrays = {}
+    for name in columns:
+        found = [i for i, spec in enumerate(specs) if spec["name"] == name]
+        if not found: continue
+        if len(found) > 1: raise ValueError(f"Duplicate column {name!r} in {directory}")
+        kind = specs[found[0]].get("kind", "native")
+        if kind != "native": raise ValueError(f"Column {name!r} in {directory} is stored as {kind!r}, not numeric")
+        arrays[name] = np.load(directory / f"c{found[0]:04d}.npy", mmap_mode="r")
+    return np.load(directory / "index.npy", mmap_mode="r"), arrays
+
+def iter_chunks(directory: str | Path, chunk_rows: int = DEFAULT_CHUNK_ROWS, columns=STORE_FIELDS):
+    # 날짜순 (index, {컬럼: 배열}) 청크. 한 번에 chunk_rows 행만 메모리에 올림
+    index, arrays = _open_store(Path(directory), columns)
+    for start in range(0, len(index), chunk_rows):
+        stop = min(start + chunk_rows, len(index))
+        yield np.array(index[start:stop]), {name: np.array(values[start:stop], dtype="float64")
+                                            for name, values in arrays.items()}
+
+# ==============================================================================
+# 2. 청크 간 상태
+# ==============================================================================
+@dataclass
+class ChunkState:
+    params: Params
+    turnover_tail: list[float] = field(default_factory=list)   # 마지막 TURNOVER_WINDOW-1 개
+    ratio_tail: list[float] = field(default_factory=list)      # 마지막 rolling_window-1 개
+    last_close: float = float("nan")
+    last_signal: float = 0.0
+    equity: float = 1.0
+    rows: int = 0
+
+    def process(self, arrays: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        # 청크 하나 -> OUTPUT_COLUMNS 배열 (run_alpha_factor_testing 과 같은 식, 같은 연산 순서)
+        params = self.params
+        open_, close = arrays["open"], arrays["close"]
+        n = len(close)
+        turnover = arrays["turnover"] if "turnover" in arrays else close * 1000
+
+        # 1. 갭 (직전 청크의 마지막 종가 이어 붙임)
+        prev_close = np.concatenate([[self.last_close], close[:-1]])
+        gap = (open_ - prev_close) / prev_close
+
+        # 2. 거래대금 5일 평균 / 비율
+        turnover_ext = np.concatenate([self.turnover_tail, turnover])
+        turnover_ma = window_mean(turnover_ext, TURNOVER_WINDOW)[-n:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = arrays["net_priv_fund"] / turnover_ma
+
+        # 3. 랭크 (직전 window-1 개 비율을 앞에 붙여 같은 윈도우로)
+        ratio_ext = np.concatenate([self.ratio_tail, ratio])
+        rank = rolling_rank_array(ratio_ext, params.rolling_window, pct=True)[-n:]
+
+        # 4~7. 시그널 -> 포지션(하루 뒤) -> 수익률 -> 누적
+        signal = (rank < params.buy_threshold).astype(int) - (rank > params.sell_threshold).astype(int)
+        position = np.concatenate([[self.last_signal], signal[:-1]]).astype("float64")
+        strategy_ret = position * gap
+        strategy_net = strategy_ret - np.abs(position) * params.cost
+        growth = 1 + np.where(np.isnan(strategy_net), 0.0, strategy_net)
+        equity = np.cumprod(np.concatenate([[self.equity], growth]))[1:]
+
+        # 다음 청크로 넘길 상태
+        self.turnover_tail = turnover_ext[-(TURNOVER_WINDOW - 1):].tolist()
+        self.ratio_tail = ratio_ext[-(params.rolling_window - 1):].tolist() if params.rolling_window > 1 else []
+        self.last_close = float(close[-1])
+        self.last_signal = float(signal[-1])
+        self.equity = float(equity[-1])
+        self.rows += n
+        return {"gap": gap, "priv_fund_ratio": ratio, "factor_rank": rank, "position": position,
+                "strategy_ret": strategy_ret, "strategy_net": strategy_net, "equity": equity}
+
+# ==============================================================================
+# 3. 증분 출력 (.npy 를 전체 길이로 미리 만들고 청크마다 채움 -> read_frame 으로 읽기 가능)
+# ==============================================================================
+class ChunkWriter:
+    def __init__(self, directory: str | Path, n_rows: int, columns=OUTPUT_COLUMNS):
+        self.directory = Path(directory)
+        self.tmp = self.directory.with_name(self.directory.name + ".tmp")
+        if self.tmp.exists():
+            shutil.rmtree(self.tmp)
+        self.tmp.mkdir(parents=True)
+        self.columns = list(columns)
+        self.index = np.lib.format.open_memmap(self.tmp / "index.npy", mode="w+",
+                                               dtype="datetime64[ns]", shape=(n_rows,))
+        self.arrays = [np.lib.format.open_memmap(self.tmp / f"c{i:04d}.npy", mode="w+",
+                                                 dtype="float64", shape=(n_rows,))
+                       for i in range(len(self.columns))]
+        self.rows = 0
+
+    def write(self, index: np.ndarray, values: dict[str, np.ndarray]) -> None:
+        stop = self.rows + len(index)
+        self.index[self.rows:stop] = index
+        for name, out in zip(self.columns, self.arrays):
+            out[self.rows:stop] = values[name]
+            out.flush()
+        self.index.flush()
+        self.rows = stop
+
+    def close(self, meta: dict | None = None) -> Path:
+        del self.index, self.arrays
+        payload = dict(meta or {})
+        payload.update({"version": CACHE_VERSION, "index_name": "date",
+                        "columns": [{"name": name, "kind": "native"} for name in self.columns]})
+        (self.tmp / "meta.json").write_text(json.dumps(payload, ensure_ascii=False, indent=1), encoding="utf-8")
+        if self.directory.exists():
+            shutil.rmtree(self.directory)
+        os.replace(self.tmp, self.directory)
+        return self.directory
+
+@instrumented()
+def run_chunked_backtest(store: str | Path, output: str | Path, params: Params = Params(),
+                         chunk_rows: int = DEFAULT_CHUNK_ROWS) -> ChunkState:
+    # store: write_store / dataguide_cache 형식의 컬럼 저장소, output: 결과 컬럼 저장소
+    store = Path(store)
+    index, _ = _open_store(store, ())
+    writer = ChunkWriter(output, len(index))
+    state = ChunkState(params)
+    for chunk_index, arrays in iter_chunks(store, chunk_rows):
+        writer.write(chunk_index, state.process(arrays))
+    writer.close({"params": asdict(params), "source": str(store.resolve()), "chunk_rows": chunk_rows})
+    return state
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Run the overnight backtest chunk by chunk from a column store.")
+    parser.add_argument("store", help="Column store directory (write_store output or a database/.cache entry).")
+    parser.add_argument("output", help="Directory for the result column store.")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    for name, default in asdict(Params()).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(default), default=default)
+    args = parser.parse_args(argv)
+
+    params = Params(**{name: getattr(args, name) for name in asdict(Params())})
+    state = run_chunked_backtest(args.store, args.output, params, args.chunk_rows)
+    print(f"[완료] {state.rows}행 처리, 최종 equity {state.equity:.4f} -> '{args.output}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# 다중공선성 진단 (상관행렬 고유분해 한 번으로 모든 VIF)
+# ==============================================================================
+# VIF_j = [R^-1]_jj  (R: 상관행렬) = 절편 포함 회귀의 1 / (1 - R_j^2)
+# 고유분해 R = V diag(λ) V' 를 쓰면 [R^-1]_jj = Σ_k V_jk² / λ_k
+# 특이에 가까운 경우에도 λ 를 하한으로 잘라 값이 폭주하거나 에러나지 않음
+EIGEN_FLOOR = 1e-12
+
+def _standardize(x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    std = x.std(axis=0, ddof=1)
+    usable = std > 0
+    return (x[:, usable] - x[:, usable].mean(axis=0)) / std[usable], usable
+
+def _eigh_corr(z: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    corr = (z.T @ z) / (len(z) - 1)
+    eigval, eigvec = np.linalg.eigh(corr)
+    return np.clip(eigval, 0.0, None), eigvec
+
+def _vif_from_eigen(eigval: np.ndarray, eigvec: np.ndarray) -> np.ndarray:
+    floor = max(eigval.max(), 1.0) * EIGEN_FLOOR
+    return (eigvec ** 2 / np.maximum(eigval, floor)).sum(axis=1)
+
+def vif_table(df: pd.DataFrame) -> pd.DataFrame:
+    # 결측 행 제거 후 전체 표본 VIF (분산이 0 인 컬럼은 NaN)
+    x = df.dropna().to_numpy(dtype="float64")
+    z, usable = _standardize(x)
+    vif = np.full(df.shape[1], np.nan)
+    if usable.any():
+        vif[usable] = _vif_from_eigen(*_eigh_corr(z))
+    return (pd.DataFrame({"Feature": df.columns, "VIF": vif})
+            .sort_values(by="VIF", ascending=False))
+
+def eigen_spectrum(df: pd.DataFrame) -> pd.DataFrame:
+    # 고유값 스펙트럼 + 조건 지수 (sqrt(λ_max / λ_k), 30 이상이면 심각)
+    z, _ = _standardize(df.dropna().to_numpy(dtype="float64"))
+    eigval, _ = _eigh_corr(z)
+    eigval = eigval[::-1]
+    with np.errstate(divide="ignore"):
+        condition_index = np.sqrt(eigval[0] / eigval)
+    return pd.DataFrame({
+        "eigenvalue": eigval,
+        "share": eigval / eigval.sum(),
+        "condition_index": condition_index,
+    })
+
+def condition_number(df: pd.DataFrame) -> float:
+    return float(eigen_spectrum(df)["condition_index"].iloc[-1])
+
+def rolling_vif(df: pd.DataFrame, window: int = 250, step: int = 20,
+                batch: int = 64) -> pd.DataFrame:
+    # step 일마다 직전 window 일의 VIF. 윈도우들을 묶어 배치 고유분해
+    x = df.to_numpy(dtype="float64")
+    ends = np.arange(window, len(x) + 1, step)
+    out = np.full((len(ends), x.shape[1]), np.nan)
+    offsets = np.arange(window)
+
+    for b in range(0, len(ends), batch):
+        chunk = ends[b:b + batch]
+        windows = x[(chunk[:, None] - window + offsets)[:, :, None], np.arange(x.shape[1])]
+        complete = ~np.isnan(windows).any(axis=(1, 2))
+        if not complete.any(): continue
+
+        w = windows[complete]
+        centered = w - w.mean(axis=1, keepdims=True)
+        std = centered.std(axis=1, ddof=1, keepdims=True)
+        # 분산 0 컬럼은 0 으로 두면 고유벡터가 분리되어 다른 컬럼 VIF 에 영향 없음
+        z = centered / np.where(std > 0, std, 1.0)
+        corr = np.matmul(z.transpose(0, 2, 1), z) / (window - 1)
+        eigval, eigvec = np.linalg.eigh(corr)
+        eigval = np.clip(eigval, 0.0, None)
+        floor = np.maximum(eigval.max(axis=1, keepdims=True), 1.0) * EIGEN_FLOOR
+        vif = (eigvec ** 2 / np.maximum(eigval, floor)[:, None, :]).sum(axis=2)
+        vif[std[:, 0, :] == 0] = np.nan
+        out[np.flatnonzero(complete) + b] = vif
+    return pd.DataFrame(out, index=df.index[ends - 1], columns=df.columns)
@@ -0,0 +1,217 @@
+from __future__ import annotations
+import re
+import numpy as np
+import pandas as pd
+from features import feature_store
+from quantile_engine import full_sample_bins
+
+# ==============================================================================
+# 1. 비트맵 유틸리티 (행 64개 = uint64 워드 1개)
+# ==============================================================================
+DEFAULT_QUANTILES = 5
+# 타깃 수익률 고정소수점 비트 평면 수. 값을 step = 범위 / (2^32 - 1) 격자에 반올림하므로
+# 값당 (그리고 평균의) 양자화 오차 <= step / 2 = 범위 / (2 (2^32 - 1)) ~= 범위 x 1.16e-10
+# (예: 범위 0.2 인 수익률 -> ~2.3e-11). 비트를 줄이면 오차는 비트당 2배씩 커짐
+TARGET_BITS = 32
+
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    # 마지막 축 방향 비트 수 합계
+    if hasattr(np, "bitwise_count"):   # numpy >= 2.0
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    as_bytes = words.view(np.uint8).reshape(*words.shape[:-1], -1)
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=-1)
+
+def pack_bits(mask: np.ndarray) -> np.ndarray:
+    # (..., T) bool -> (..., ceil(T/64)) uint64
+    mask = np.asarray(mask, dtype=bool)
+    packed = np.packbits(mask, axis=-1, bitorder="little")
+    pad = (-packed.shape[-1]) % 8
+    if pad:
+        packed = np.concatenate([packed, np.zeros((*packed.shape[:-1], pad), dtype=np.uint8)], axis=-1)
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+def unpack_bits(words: np.ndarray, n_rows: int) -> np.ndarray:
+    return np.unpackbits(words.view(np.uint8), axis=-1, count=n_rows, bitorder="little").astype(bool)
+
+def quantile_bins(values: np.ndarray, quantiles: int, duplicates: str = "raise") -> np.ndarray:
+    # 1차원 값 -> 분위 번호, 결측은 -1 (경계 / 중복 경계 처리는 quantile_engine.full_sample_bins 와 공유)
+    return full_sample_bins(np.asarray(values, dtype="float64")[:, None], quantiles, duplicates)[:, 0]
+
+# ==============================================================================
+# 2. 조건 인덱스
+# ==============================================================================
+# 조건 이름: "<피처>:q1".."<피처>:qN" (분위), "<피처>>v" / "<피처><=v" (임계값)
+# 질의식: 조건 이름을 & (AND) / | (OR) / ~ (NOT) / 괄호로 조합
+#   예) "open_to_high>0.003 & dir_ratio_long>0.6 & (foreign_net>0 | gap:q5)"
+# 타깃(다음날 갭 등)의 평균은 값을 고정소수점 비트 평면으로 나눠
+#   합계 = Σ_b 2^b * popcount(조건 & 평면_b) 로 계산 (행 필터링 없음)
+_TOKEN = re.compile(r"\s*([()&|~]|[^()&|~\s]+)")
+
+class ConditionIndex:
+    def __init__(self, df: pd.DataFrame, features=None, targets=("next_gap",),
+                 quantiles: int = DEFAULT_QUANTILES, thresholds: dict | None = None,
+                 bits: int = TARGET_BITS, duplicates: str = "raise"):
+        store = feature_store(df)
+        targets = [t for t in (targets or ())]
+        if features is None:
+            features = [c for c in df.select_dtypes("number").columns if c not in targets]
+        self.index = df.index
+        self.n_rows = len(df)
+        self.all_rows = pack_bits(np.ones(self.n_rows, dtype=bool))
+
+        names, masks = [], []
+        for feature in features:
+            values = store.get(feature).to_numpy(dtype="float64")
+            if quantiles:
+                bins = quantile_bins(values, quantiles, duplicates)
+                # duplicates="drop" 이면 구간 수가 quantiles 보다 적을 수 있음
+                n_bins = int(bins.max()) + 1 if (bins >= 0).any() else quantiles
+                for q in range(n_bins):
+                    names.append(f"{feature}:q{q + 1}")
+                    masks.append(bins == q)
+            for level in (thresholds or {}).get(feature, ()):
+                names += [f"{feature}>{level:g}", f"{feature}<={level:g}"]
+                masks += [values > level, values <= level]
+        self.names = names
+        self._pos = {name: i for i, name in enumerate(names)}
+        self.bits = pack_bits(np.array(masks).reshape(len(masks), self.n_rows))
+
+        # 타깃: 유효 행 비트맵 + 고정소수점 비트 평면
+        self.targets = {}
+        for target in targets:
+            values = store.get(target).to_numpy(dtype="float64")
+            valid = ~np.isnan(values)
+            low = values[valid].min() if valid.any() else 0.0
+            high = values[valid].max() if valid.any() else 0.0
+            step = (high - low) / (2 ** bits - 1) or 1.0
+            fixed = np.where(valid, np.rint((values - low) / step), 0).astype(np.uint64)
+            planes = (fixed[None, :] >> np.arange(bits, dtype=np.uint64)[:, None]) & np.uint64(1)
+            self.targets[target] = {
+                "valid": pack_bits(valid),
+                "planes": pack_bits(planes.astype(bool)),
+                "low": low,
+                "step": step,
+                "weights": 2.0 ** np.arange(bits),
+            }
+
+    # --------------------------------------------------------------------------
+    # 질의식 -> 비트맵
+    # --------------------------------------------------------------------------
+    def condition(self, name: str) -> np.ndarray:
+        if name not in self._pos:
+            raise KeyError(f"Unknown condition: {name}")
+        return self.bits[self._pos[name]]
+
+    def evaluate(self, expr: str) -> np.ndarray:
+        tokens = _TOKEN.findall(expr)
+        pos = 0
+
+        def peek():
+            return tokens[pos] if pos < len(tokens) else None
+
+        def take():
+            nonlocal pos
+            pos += 1
+            return tokens[pos - 1]
+
+        def parse_or():
+            bits = parse_and()
+            while peek() == "|":
+                take()
+                bits = bits | parse_and()
+            return bits
+
+        def parse_and():
+            bits = parse_not()
+            while peek() == "&":
+                take()
+                bits = bits & parse_not()
+            return bits
+
+        def parse_not():
+            if peek() == "~":
+                take()
+                return ~parse_not() & self.all_rows
+            if peek() == "(":
+                take()
+                bits = parse_or()
+                if peek() != ")": raise ValueError(f"Unbalanced parentheses in {expr!r}")
+                take()
+                return bits
+            token = peek()
+            if token is None or token in "&|)": raise ValueError(f"Malformed query {expr!r}")
+            return self.condition(take())
+
+        bits = parse_or()
+        if pos != len(tokens): raise ValueError(f"Malformed query {expr!r}")
+        return bits
+
+    def _bits(self, query) -> np.ndarray:
+        if query is None: return self.all_rows
+        return self.evaluate(query) if isinstance(query, str) else query
+
+    def mask(self, query) -> pd.Series:
+        return pd.Series(unpack_bits(self._bits(query), self.n_rows), index=self.index)
+
+    # --------------------------------------------------------------------------
+    # 집계 (popcount)
+    # --------------------------------------------------------------------------
+    def count(self, query=None) -> int:
+        return int(_popcount(self._bits(query)))
+
+    def probability(self, event, given=None) -> float:
+        # P(event | given), given=None 이면 전체 행 대비 비율
+        base = self._bits(given)
+        n = _popcount(base)
+        return float(_popcount(self._bits(event) & base) / n) if n else float("nan")
+
+    def _target_sums(self, target: str, bits: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # bits: (..., W) -> (유효 행 수, 합계)
+        spec = self.targets[target]
+        bits = bits & spec["valid"]
+        n = _popcount(bits)
+        planes = _popcount(bits[..., None, :] & spec["planes"])       # (..., bits)
+        total = spec["low"] * n + spec["step"] * (planes @ spec["weights"])
+        return n, total
+
+    def mean(self, target: str, query=None) -> float:
+        n, total = self._target_sums(target, self._bits(query))
+        return float(total / n) if n else float("nan")
+
+    def summary(self, query=None, event=None) -> dict:
+        bits = self._bits(query)
+        n = int(_popcount(bits))
+        out = {"count": n, "support": n / self.n_rows if self.n_rows else float("nan")}
+        if event is not None:
+            out["prob_event"] = self.probability(event, bits)
+        for target in self.targets:
+            out[f"mean_{target}"] = self.mean(target, bits)
+        return out
+
+    def pair_table(self, conditions=None, event=None, op: str = "and",
+                   min_count: int = 1) -> pd.DataFrame:
+        # 조건 쌍 (a AND/OR b) 전체를 앵커 조건 하나당 벡터 연산 한 번으로 집계
+        if op not in ("and", "or"): raise ValueError("op must be 'and' or 'or'")
+        names = list(conditions or self.names)
+        bits = self.bits[[self._pos[n] for n in names]]
+        event_bits = None if event is None else self._bits(event)
+
+        frames = []
+        for i in range(len(names) - 1):
+            combo = bits[i] & bits[i + 1:] if op == "and" else bits[i] | bits[i + 1:]
+            count = _popcount(combo)
+            frame = pd.DataFrame({"cond_a": names[i], "cond_b": names[i + 1:], "count": count})
+            frame["support"] = count / self.n_rows
+            with np.errstate(divide="ignore", invalid="ignore"):
+                if event_bits is not None:
+                    frame["prob_event"] = _popcount(combo & event_bits) / count
+                for target in self.targets:
+                    n, total = self._target_sums(target, combo)
+                    frame[f"mean_{target}"] = total / n
+            frames.append(frame[count >= min_count])
+
+        columns = ["cond_a", "cond_b", "count", "support"]
+        if not frames: return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
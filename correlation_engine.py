@@ -0,0 +1,202 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from scipy import stats
+from pairwise_corr import (MIN_OBS, REFRESH_EVERY, centered, corr_from_moments, pearson_cross,
+                           spearman_cross)
+
+# ==============================================================================
+# 1. 쌍별 완전 관측(pairwise-complete) 상관행렬 (pairwise_corr 의 행렬곱 엔진, x 와 x 자신)
+# ==============================================================================
+METHODS = ("pearson", "spearman")
+
+def pearson_matrix(x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # x (T, F) -> 상관행렬 (F, F), 쌍별 관측 수 (F, F)
+    return pearson_cross(x)
+
+def spearman_matrix(x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # 결측 패턴이 같은 컬럼끼리 묶어 패턴 쌍마다 공통 행을 한 번 랭크
+    # (워밍업 길이가 몇 종류뿐이면 몇 번이면 끝)
+    return spearman_cross(x)
+
+def _t_test(r: np.ndarray, n: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # H0: ρ = 0,  t = r sqrt((n-2) / (1-r²)),  양측 p (scipy pearsonr / spearmanr 과 동일)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df = n - 2
+        t = r * np.sqrt(df / (1 - r ** 2))
+        p = 2 * stats.t.sf(np.abs(t), np.where(df > 0, df, np.nan))
+    p = np.where(np.abs(r) == 1, 0.0, p)
+    return t, np.where(n < MIN_OBS, np.nan, p)
+
+# ==============================================================================
+# 2. Newey-West (HAC) t-stat: 표준화 곱 u_t = z_it z_jt 평균의 자기상관 보정
+# ==============================================================================
+# 모든 쌍의 Σ_t d_t d_{t-l} (d = u - ū, 유효한 날만) 을 시차마다 행렬곱 4번으로
+def default_lags(n_obs: int) -> int:
+    # Newey-West (1994) 경험식 floor(4 (n/100)^(2/9))
+    return int(np.floor(4 * (max(n_obs, 1) / 100) ** (2 / 9)))
+
+def newey_west_t(x: np.ndarray, lags: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+    x = np.asarray(x, dtype="float64")
+    valid = ~np.isnan(x)
+    m = valid.astype("float64")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nanmean(np.where(valid.any(axis=0), x, 0.0), axis=0)
+        std = np.nanstd(np.where(valid.any(axis=0), x, 0.0), axis=0, ddof=1)
+        z = np.where(valid & (std > 0), (x - mean) / std, 0.0)
+
+    n = m.T @ m
+    with np.errstate(divide="ignore", invalid="ignore"):
+        u_bar = (z.T @ z) / n
+        lags = default_lags(int(n.max()) if n.size else 0) if lags is None else lags
+        # d_t = z_i z_j - ū m_i m_j  ->  Σ d_t² = Σ z_i² z_j² - 2ū Σ z_i z_j + ū² n = Σ z_i² z_j² - ū² n
+        long_run = ((z * z).T @ (z * z) - u_bar ** 2 * n) / n
+        for lag in range(1, min(lags, len(x) - 1) + 1):
+            zl, zp, ml, mp = z[lag:], z[:-lag], m[lag:], m[:-lag]
+            cross = ((zl * zp).T @ (zl * zp) - u_bar * ((ml * zp).T @ (ml * zp))
+                     - u_bar * ((zl * mp).T @ (zl * mp)) + u_bar ** 2 * ((ml * mp).T @ (ml * mp))) / n
+            long_run += 2 * (1 - lag / (lags + 1)) * cross           # Bartlett 가중치
+        t = u_bar / np.sqrt(long_run / n)
+        p = 2 * stats.norm.sf(np.abs(t))
+    bad = (n < MIN_OBS) | ~(long_run > 0)
+    t[bad], p[bad] = np.nan, np.nan
+    np.fill_diagonal(t, np.nan)
+    np.fill_diagonal(p, np.nan)
+    return t, p
+
+# ==============================================================================
+# 3. 결과 / 진입점
+# ==============================================================================
+@dataclass
+class CorrelationResult:
+    columns: list[str]
+    method: str
+    r: np.ndarray
+    n: np.ndarray
+    t: np.ndarray
+    p: np.ndarray
+    nw_t: np.ndarray | None = None   # Newey-West 보정 t (newey_west=True 일 때)
+    nw_p: np.ndarray | None = None
+    lags: int | None = None
+
+    def matrix(self, stat: str = "r") -> pd.DataFrame:
+        values = getattr(self, stat)
+        if values is None: raise ValueError(f"{stat} was not computed (newey_west=False)")
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+    def pairs(self, columns=None) -> pd.DataFrame:
+        # 상삼각 쌍을 한 줄씩 (var1, var2, n, r, t, p[, nw_t, nw_p]), columns 로 관심 변수 제한
+        i, j = np.triu_indices(len(self.columns), k=1)
+        if columns is not None:
+            wanted = {self.columns.index(c) for c in columns}
+            keep = np.isin(i, list(wanted)) | np.isin(j, list(wanted))
+            i, j = i[keep], j[keep]
+        out = pd.DataFrame({"var1": np.array(self.columns, dtype=object)[i],
+                            "var2": np.array(self.columns, dtype=object)[j],
+                            "n": self.n[i, j].astype(int), "r": self.r[i, j],
+                            "t": self.t[i, j], "p": self.p[i, j]})
+        if self.nw_t is not None:
+            out["nw_t"], out["nw_p"] = self.nw_t[i, j], self.nw_p[i, j]
+        return out
+
+def correlation_matrix(df: pd.DataFrame, method: str = "pearson", newey_west: bool = False,
+                       lags: int | None = None) -> CorrelationResult:
+    # 모든 숫자 컬럼 쌍의 상관계수 / t / p (쌍별 완전 관측), 옵션으로 Newey-West t
+    if method not in METHODS: raise ValueError(f"method must be one of {METHODS}")
+    numeric = df.select_dtypes("number")
+    x = numeric.to_numpy(dtype="float64")
+    r, n = pearson_matrix(x) if method == "pearson" else spearman_matrix(x)
+    np.fill_diagonal(r, 1.0)
+    t, p = _t_test(r, n)
+    np.fill_diagonal(t, np.nan)
+    np.fill_diagonal(p, np.nan)
+    result = CorrelationResult([str(c) for c in numeric.columns], method, r, n, t, p)
+    if newey_west:
+        result.lags = default_lags(int(n.max()) if n.size else 0) if lags is None else lags
+        result.nw_t, result.nw_p = newey_west_t(x, result.lags)
+    return result
+
+# ==============================================================================
+# 4. 롤링 상관 (윈도우 합을 하루 1번 추가 + 1번 제거로 갱신)
+# ==============================================================================
+# 추가/제거 누적 오차 방지를 위해 REFRESH_EVERY 일마다 윈도우 합을 다시 계산
+def _iter_rolling_corr(x: np.ndarray, window: int, min_periods: int):
+    # T 일마다 (F, F) 상관행렬. 메모리는 O(F²) (전체 (T, F, F) 를 만들지 않음)
+    x0, m = centered(x)
+    n_cols = x.shape[1]
+    sums = [np.zeros((n_cols, n_cols)) for _ in range(4)]          # n, Σx, Σx², Σxy
+
+    def outer_terms(t):
+        return (np.outer(m[t], m[t]), np.outer(x0[t], m[t]), np.outer(x0[t] ** 2, m[t]),
+                np.outer(x0[t], x0[t]))
+
+    for t in range(len(x)):
+        if t % REFRESH_EVERY == 0 and t:
+            lo = max(0, t - window)
+            sums = list(_pairwise_block(x0[lo:t], m[lo:t]))
+        for acc, term in zip(sums, outer_terms(t)):
+            acc += term
+        if t >= window:
+            for acc, term in zip(sums, outer_terms(t - window)):
+                acc -= term
+        r = corr_from_moments(*sums)
+        r[sums[0] < min_periods] = np.nan
+        yield r
+
+def _pairwise_block(x0: np.ndarray, m: np.ndarray):
+    return m.T @ m, x0.T @ m, (x0 * x0).T @ m, x0.T @ x0
+
+def rolling_corr(df: pd.DataFrame, window: int = 60, pairs=None,
+                 min_periods: int | None = None) -> pd.DataFrame:
+    # 날짜 x 쌍 롤링 Pearson 상관. pairs 기본값 = 모든 상삼각 쌍 (컬럼이 많으면 관심 쌍만 넘길 것)
+    numeric = df.select_dtypes("number")
+    names = [str(c) for c in numeric.columns]
+    if pairs is None:
+        i, j = np.triu_indices(len(names), k=1)
+        pairs = [(names[a], names[b]) for a, b in zip(i, j)]
+    pos = {name: k for k, name in enumerate(names)}
+    i = np.array([pos[str(a)] for a, _ in pairs], dtype=int)
+    j = np.array([pos[str(b)] for _, b in pairs], dtype=int)
+
+    out = np.full((len(numeric), len(pairs)), np.nan)
+    min_periods = window if min_periods is None else min_periods
+    for t, r in enumerate(_iter_rolling_corr(numeric.to_numpy(dtype="float64"), window, min_periods)):
+        out[t] = r[i, j]
+    return pd.DataFrame(out, index=numeric.index,
+                        columns=pd.MultiIndex.from_tuples([(str(a), str(b)) for a, b in pairs],
+                                                          names=["var1", "var2"]))
+
+def correlation_stability(df: pd.DataFrame, window: int = 60, min_periods: int | None = None) -> pd.DataFrame:
+    # 모든 쌍의 롤링 상관 요약 (평균 / 표준편차 / 최소 / 최대 / 전체 표본과 같은 부호 비율)
+    # 쌍이 수만 개여도 (F, F) 누적값만 들고 가므로 메모리는 컬럼 수 제곱에 비례
+    numeric = df.select_dtypes("number")
+    x = numeric.to_numpy(dtype="float64")
+    full, _ = pearson_matrix(x)
+    count = np.zeros_like(full)
+    total, total_sq, same_sign = np.zeros_like(full), np.zeros_like(full), np.zeros_like(full)
+    low, high = np.full_like(full, np.inf), np.full_like(full, -np.inf)
+
+    min_periods = window if min_periods is None else min_periods
+    for r in _iter_rolling_corr(x, window, min_periods):
+        ok = ~np.isnan(r)
+        rv = np.where(ok, r, 0.0)
+        count += ok
+        total += rv
+        total_sq += rv ** 2
+        same_sign += ok & (np.sign(rv) == np.sign(full))
+        low = np.where(ok, np.minimum(low, rv), low)
+        high = np.where(ok, np.maximum(high, rv), high)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / count
+        std = np.sqrt(np.maximum(total_sq - count * mean ** 2, 0.0) / (count - 1))
+    i, j = np.triu_indices(len(numeric.columns), k=1)
+    names = np.array([str(c) for c in numeric.columns], dtype=object)
+    none = count[i, j] == 0
+    return pd.DataFrame({
+        "var1": names[i], "var2": names[j], "windows": count[i, j].astype(int),
+        "full_r": full[i, j], "mean": mean[i, j], "std": std[i, j],
+        "min": np.where(none, np.nan, low[i, j]), "max": np.where(none, np.nan, high[i, j]),
+        "same_sign": same_sign[i, j] / np.where(none, np.nan, count[i, j]),
+    })
@@ -0,0 +1,187 @@
+from __future__ import annotations
+import ast
+import hashlib
+import inspect
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Callable
+import numpy as np
+import pandas as pd
+from instrumentation import instrumented
+
+# ==============================================================================
+# 1. 캐시 설정
+# ==============================================================================
+# 파싱이 끝난 DataGuide 프레임을 컬럼별 .npy 파일로 저장합니다.
+# (pyarrow 없이 numpy만으로 읽기 가능 + mmap 지원)
+CACHE_DIR = Path(__file__).resolve().parent / "database" / ".cache"
+CACHE_VERSION = 1
+_HASH_CHUNK = 1 << 20
+PROJECT_DIR = Path(__file__).resolve().parent
+
+# ==============================================================================
+# 2. 원본 파일 지문 (경로 / 크기 / 수정시각 / 내용 해시)
+# ==============================================================================
+def _content_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def file_fingerprint(path: str | Path) -> dict:
+    path = Path(path).resolve()
+    stat = path.stat()
+    return {
+        "path": str(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": _content_hash(path),
+    }
+
+def _entry_dir(path: Path, tag: str, cache_dir: Path) -> Path:
+    key = hashlib.sha1(f"{path}|{tag}".encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"{path.stem}-{tag}-{key}"
+
+# ==============================================================================
+# 3. 코드 지문 (빌더 모듈 + 그 모듈이 import 하는 프로젝트 모듈 전체의 소스 해시)
+# ==============================================================================
+# 파서 코드를 고치면 CACHE_VERSION 을 올리지 않아도 캐시가 자동으로 무효
+_SOURCE_HASHES: dict[Path, tuple[int, str, tuple[Path, ...]]] = {}
+
+def _project_imports(tree: ast.AST) -> tuple[Path, ...]:
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.add(node.module.split(".")[0])
+    return tuple(sorted(PROJECT_DIR / f"{name}.py" for name in names if (PROJECT_DIR / f"{name}.py").exists()))
+
+def _source_info(path: Path) -> tuple[str, tuple[Path, ...]]:
+    # 파일별 (내용 해시, 프로젝트 import) - 수정시각이 같으면 다시 읽지 않음
+    mtime = path.stat().st_mtime_ns
+    cached = _SOURCE_HASHES.get(path)
+    if cached is None or cached[0] != mtime:
+        source = path.read_bytes()
+        cached = (mtime, hashlib.blake2b(source, digest_size=8).hexdigest(), _project_imports(ast.parse(source)))
+        _SOURCE_HASHES[path] = cached
+    return cached[1], cached[2]
+
+def code_fingerprint(*objects) -> str:
+    # 함수/모듈/파일 경로 -> 정의된 소스 파일과 import 폐포(프로젝트 안 모듈만)의 해시
+    # 데코레이터(functools.wraps)로 감싼 함수는 원래 함수가 정의된 파일 기준
+    pending = [Path(o if isinstance(o, (str, Path)) else inspect.getsourcefile(inspect.unwrap(o))).resolve()
+               for o in objects]
+    seen: dict[Path, str] = {}
+    while pending:
+        path = pending.pop()
+        if path in seen: continue
+        seen[path], imports = _source_info(path)
+        pending.extend(imports)
+    digest = hashlib.blake2b(digest_size=8)
+    for path in sorted(seen):
+        digest.update(f"{path.name}:{seen[path]}".encode("utf-8"))
+    return digest.hexdigest()
+
+# ==============================================================================
+# 4. 프레임 <-> 컬럼 파일 변환
+# ==============================================================================
+def to_storable(col: pd.Series) -> tuple[np.ndarray, str]:
+    if col.dtype != object:
+        return col.to_numpy(), "native"
+    # object 컬럼: 숫자로 손실 없이 바뀌면 float, 아니면 문자열로 보관
+    numeric = pd.to_numeric(col, errors="coerce")
+    if numeric.notna().sum() == col.notna().sum():
+        return numeric.to_numpy(dtype="float64"), "native"
+    return col.where(col.notna(), "").astype(str).to_numpy(dtype=str), "str"
+
+def write_frame(frame: pd.DataFrame, directory: str | Path, meta: dict | None = None) -> None:
+    directory = Path(directory)
+    tmp = directory.with_name(directory.name + ".tmp")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+
+    columns = []
+    for i, name in enumerate(frame.columns):
+        values, kind = to_storable(frame.iloc[:, i])
+        np.save(tmp / f"c{i:04d}.npy", values, allow_pickle=False)
+        columns.append({"name": str(name), "kind": kind})
+    np.save(tmp / "index.npy", frame.index.to_numpy(dtype="datetime64[ns]"), allow_pickle=False)
+
+    payload = dict(meta or {})
+    payload.update({"version": CACHE_VERSION, "index_name": frame.index.name, "columns": columns})
+    (tmp / "meta.json").write_text(json.dumps(payload, ensure_ascii=False, indent=1), encoding="utf-8")
+
+    # 원자적 교체: 읽는 쪽이 반쯤 쓰인 캐시를 보지 않도록
+    if directory.exists():
+        shutil.rmtree(directory)
+    os.replace(tmp, directory)
+
+def read_meta(directory: str | Path) -> dict | None:
+    meta_path = Path(directory) / "meta.json"
+    if not meta_path.exists(): return None
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def read_frame(directory: str | Path, columns: list[str] | None = None,
+               mmap_mode: str | None = None) -> pd.DataFrame:
+    directory = Path(directory)
+    meta = read_meta(directory)
+    if meta is None: raise FileNotFoundError(f"No cached frame in {directory}")
+
+    index = pd.DatetimeIndex(np.load(directory / "index.npy"), name=meta["index_name"])
+    data = {}
+    for i, spec in enumerate(meta["columns"]):
+        if columns is not None and spec["name"] not in columns: continue
+        values = np.load(directory / f"c{i:04d}.npy", mmap_mode=mmap_mode)
+        if spec["kind"] == "str":
+            values = pd.Series(values, dtype=object).replace("", None).to_numpy()
+        data[i] = values
+    frame = pd.DataFrame(data, index=index)
+    frame.columns = [meta["columns"][i]["name"] for i in data]
+    return frame
+
+# ==============================================================================
+# 5. 캐시 조회 / 재생성
+# ==============================================================================
+def _is_fresh(meta: dict | None, path: Path, tag: str, code: str) -> bool:
+    if meta is None or meta.get("version") != CACHE_VERSION: return False
+    if meta.get("code") != code: return False
+    source = meta.get("source", {})
+    if source.get("path") != str(path) or meta.get("tag") != tag: return False
+
+    stat = path.stat()
+    if source.get("size") != stat.st_size: return False
+    if source.get("mtime_ns") == stat.st_mtime_ns: return True
+    # 수정시각만 바뀐 경우(복사/touch): 내용 해시로 최종 판단
+    return source.get("sha256") == _content_hash(path)
+
+@instrumented()
+def cached_frame(path: str | Path, builder: Callable[[Path], pd.DataFrame], tag: str = "dataguide",
+                 cache_dir: str | Path | None = None) -> pd.DataFrame:
+    path = Path(path).resolve()
+    entry = _entry_dir(path, tag, Path(cache_dir) if cache_dir else CACHE_DIR)
+    code = code_fingerprint(builder)
+
+    meta = read_meta(entry)
+    if _is_fresh(meta, path, tag, code):
+        if meta["source"]["mtime_ns"] != path.stat().st_mtime_ns:
+            meta["source"]["mtime_ns"] = path.stat().st_mtime_ns
+            (entry / "meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=1), encoding="utf-8")
+        return read_frame(entry)
+
+    frame = builder(path)
+    write_frame(frame, entry, {"tag": tag, "code": code, "source": file_fingerprint(path)})
+    # 캐시 적중 시와 동일한 dtype을 돌려주기 위해 저장본을 다시 읽음
+    return read_frame(entry)
+
+def clear_cache(cache_dir: str | Path | None = None) -> None:
+    target = Path(cache_dir) if cache_dir else CACHE_DIR
+    if target.exists():
+        shutil.rmtree(target)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+from datetime import date, datetime
+from itertools import chain
+import re
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# DataGuide 시트 행 파싱 (openpyxl read-only 행 이터레이터 기준, 단일/패널 로더 공용)
+# ==============================================================================
+def normalize_code(value) -> str | None:
+    if pd.isna(value): return None
+    text = str(value)
+    text = re.sub(r"[^A-Za-z0-9]", "", text)
+    return text or None
+
+# 날짜 셀: datetime / 날짜 문자열 / 엑셀 일련번호 (날짜 서식이 빠진 내보내기)
+EXCEL_EPOCH = pd.Timestamp("1899-12-30")
+EXCEL_SERIAL_MAX = 2958465   # 9999-12-31
+
+def _is_serial(value) -> bool:
+    return (isinstance(value, (int, float, np.number)) and not isinstance(value, (bool, np.bool_))
+            and 0 < value <= EXCEL_SERIAL_MAX)
+
+def _to_timestamp(value) -> pd.Timestamp:
+    if isinstance(value, (datetime, date)): return pd.Timestamp(value)
+    if _is_serial(value): return EXCEL_EPOCH + pd.Timedelta(days=float(value))
+    if isinstance(value, str): return pd.to_datetime(value, errors="coerce")
+    return pd.NaT
+
+def is_date_cell(value) -> bool:
+    stamp = _to_timestamp(value)
+    return not pd.isna(stamp) and stamp.year > 1900
+
+def to_date_index(values: list) -> pd.DatetimeIndex:
+    cells = pd.Series(values, dtype=object)
+    serial = cells.map(_is_serial).astype(bool)
+    dates = pd.to_datetime(cells.where(~serial), errors="coerce")
+    if serial.any():
+        dates[serial] = EXCEL_EPOCH + pd.to_timedelta(cells[serial].astype("float64"), unit="D")
+    # pandas 버전에 따라 추론 단위가 달라지므로(pandas 3: us) ns 로 고정
+    return pd.DatetimeIndex(dates, name="date").as_unit("ns")
+
+def is_item_row(row) -> bool:
+    return any(isinstance(v, str) and "I3100" in v for v in row)
+
+def find_item_row(rows, limit: int = 50) -> list:
+    for _, row in zip(range(limit), rows):
+        if is_item_row(row): return list(row)
+    raise SystemExit("Item row not found.")
+
+def first_data_row(rows, limit: int = 50) -> tuple | None:
+    for _, row in zip(range(limit), rows):
+        if row and is_date_cell(row[0]): return row
+    return None
+
+def to_float_array(values: list) -> np.ndarray:
+    try:
+        return np.array(values, dtype="float64")
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype="float64")
+
+def read_data_block(rows, first_row: tuple, col_idx: list[int]) -> tuple[list, list[list]]:
+    dates, columns = [], [[] for _ in col_idx]
+    for row in chain([first_row], rows):
+        width = len(row)
+        dates.append(row[0])
+        for out, j in zip(columns, col_idx):
+            out.append(row[j] if j < width else None)
+    return dates, columns
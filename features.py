@@ -0,0 +1,220 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable
+import hashlib
+import re
+import weakref
+import numpy as np
+import pandas as pd
+from rolling_rank import rolling_rank
+
+# ==============================================================================
+# 1. 피처 레지스트리 (각 피처가 입력 피처를 선언 -> 요청 시 지연 계산)
+# ==============================================================================
+@dataclass(frozen=True)
+class Feature:
+    name: str
+    inputs: tuple[str, ...]
+    func: Callable[..., pd.Series]
+    fallback: bool = False    # True: 원본에 같은 이름 컬럼이 있으면 원본 우선 (없을 때만 계산)
+
+FEATURES: dict[str, Feature] = {}
+# 이름 패턴 피처: (정규식, 매치 -> Feature)
+PATTERNS: list[tuple[re.Pattern, Callable[[re.Match], Feature]]] = []
+
+def feature(name: str, *inputs: str, fallback: bool = False):
+    def register(func):
+        FEATURES[name] = Feature(name, inputs, func, fallback)
+        return func
+    return register
+
+def pattern(regex: str):
+    def register(builder):
+        PATTERNS.append((re.compile(regex), builder))
+        return builder
+    return register
+
+def resolve(name: str) -> Feature | None:
+    if name in FEATURES: return FEATURES[name]
+    for regex, builder in PATTERNS:
+        match = regex.fullmatch(name)
+        if match: return builder(match)
+    return None
+
+# ==============================================================================
+# 2. 피처 정의
+# ==============================================================================
+TURNOVER_WINDOW = 5
+
+def window_mean(values, window: int) -> np.ndarray:
+    # 고정 순서 윈도우 평균: (x[t-w+1] + ... + x[t]) / w, 윈도우에 NaN 이 있으면 NaN (axis 0)
+    # pandas rolling().mean() 은 전체 이력에 걸친 누적합이라 마지막 비트가 시작 위치에 따라 달라짐
+    # -> 윈도우 안 값만으로 정해지므로 청크/일 단위 처리(live_state, chunked_backtest)와 비트 단위로 같음
+    values = np.asarray(values, dtype="float64")
+    out = np.full(values.shape, np.nan)
+    n = len(values)
+    if n < window: return out
+    total = values[:n - window + 1].copy()
+    for k in range(1, window):
+        total += values[k:n - window + 1 + k]
+    out[window - 1:] = total / window
+    return out
+
+@feature("turnover", "close", fallback=True)
+def _turnover(close):
+    # 원본에 거래대금이 없을 때만 호출됨 (원본 컬럼이 우선)
+    return close * 1000
+
+@feature("prev_close", "close")
+def _prev_close(close):
+    return close.shift(1)
+
+@feature("gap", "open", "prev_close")
+def _gap(open_, prev_close):
+    return (open_ - prev_close) / prev_close
+
+@feature("next_gap", "open", "close")
+def _next_gap(open_, close):
+    # T일 종가 진입 -> T+1일 시가 청산
+    return (open_.shift(-1) - close) / close
+
+@feature("ret_1d", "close")
+def _ret_1d(close):
+    return close.pct_change()
+
+@feature("turnover_ma", "turnover")
+def _turnover_ma(turnover):
+    return pd.Series(window_mean(turnover, TURNOVER_WINDOW), index=turnover.index)
+
+@feature("turnover_ma_nonzero", "turnover_ma")
+def _turnover_ma_nonzero(turnover_ma):
+    return turnover_ma.replace(0, np.nan)
+
+@feature("priv_fund_ratio", "net_priv_fund", "turnover_ma")
+def _priv_fund_ratio(net_priv_fund, turnover_ma):
+    return net_priv_fund / turnover_ma
+
+@pattern(r"factor_rank_(\d+)")
+def _factor_rank(match):
+    window = int(match.group(1))
+    return Feature(match.group(0), ("priv_fund_ratio",),
+                   lambda ratio: rolling_rank(ratio, window, pct=True))
+
+@pattern(r"Ratio_(.+)")
+def _flow_ratio(match):
+    # Ratio_<수급 컬럼> = 순매수 / 거래대금 5일 평균 (0 은 NaN)
+    return Feature(match.group(0), (match.group(1), "turnover_ma_nonzero"),
+                   lambda flow, turnover_ma: flow / turnover_ma)
+
+@feature("open_to_high", "open", "high")
+def _open_to_high(open_, high):
+    return (high - open_) / open_
+
+@feature("open_to_low", "open", "low")
+def _open_to_low(open_, low):
+    return (low - open_) / open_
+
+@feature("range", "high", "low")
+def _range(high, low):
+    return high - low
+
+@feature("dir_ratio_long", "open", "high", "range")
+def _dir_ratio_long(open_, high, range_):
+    return (high - open_) / range_
+
+@feature("dir_ratio_short", "open", "low", "range")
+def _dir_ratio_short(open_, low, range_):
+    return (open_ - low) / range_
+
+@feature("true_range", "high", "low", "prev_close")
+def _true_range(high, low, prev_close):
+    return pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()],
+                     axis=1).max(axis=1)
+
+@feature("atr20", "true_range")
+def _atr20(true_range):
+    return true_range.rolling(20).mean()
+
+@feature("vol_regime", "atr20", "close")
+def _vol_regime(atr20, close):
+    return rolling_rank(atr20 / close, 20, pct=True)
+
+# ==============================================================================
+# 3. 데이터셋별 메모이제이션
+# ==============================================================================
+def _content_key(values: np.ndarray) -> tuple:
+    # 배열 내용 지문 (숫자/날짜는 원시 바이트 해시, 그 외는 pandas 해시)
+    if values.dtype.kind in "biufcmM":
+        data = np.ascontiguousarray(values).view(np.uint8)
+    else:
+        data = pd.util.hash_array(values.astype(object), categorize=False)
+    return values.dtype.str, values.shape, hashlib.blake2b(data, digest_size=16).digest()
+
+class FeatureStore:
+    # 원본 컬럼은 그대로 쓰고, 파생 피처는 항상 레지스트리 정의로 계산 후 캐시 (원본은 약한 참조로만 잡아 둠)
+    # 프레임에 같은 이름의 파생 컬럼이 있어도 (이전 실행에서 남은 gap / priv_fund_ratio 등) 무시.
+    # 예외: fallback 피처 (turnover), 그리고 입력이 프레임에 없어 계산할 수 없는 피처
+    #       (results.npz 에서 gap 만 읽은 경우 등) 는 프레임의 컬럼을 그대로 사용
+    # 캐시 항목은 그 피처가 읽는 원본 컬럼(+인덱스)의 내용 지문과 함께 저장
+    # -> df["open"] = ... 처럼 원본을 바꾸면 지문이 달라져 다시 계산
+    def __init__(self, df: pd.DataFrame):
+        self._df_ref = weakref.ref(df)
+        self._cache: dict[str, tuple[tuple, pd.Series]] = {}
+
+    @property
+    def df(self) -> pd.DataFrame:
+        df = self._df_ref()
+        if df is None: raise ReferenceError("The dataset behind this FeatureStore was released.")
+        return df
+
+    def _computable(self, name: str) -> bool:
+        if name in self.df.columns: return True
+        spec = resolve(name)
+        return spec is not None and all(self._computable(dep) for dep in spec.inputs)
+
+    def _use_column(self, name: str) -> bool:
+        if name not in self.df.columns: return False
+        spec = resolve(name)
+        return spec is None or spec.fallback or not all(self._computable(dep) for dep in spec.inputs)
+
+    def sources(self, name: str) -> tuple[str, ...]:
+        # 피처가 (간접적으로) 읽는 원본 컬럼들
+        if self._use_column(name): return (name,)
+        spec = resolve(name)
+        if spec is None: raise KeyError(f"Unknown feature or column: {name}")
+        return tuple(dict.fromkeys(c for dep in spec.inputs for c in self.sources(dep)))
+
+    def _source_key(self, name: str) -> tuple:
+        df = self.df
+        return (_content_key(df.index.to_numpy()),
+                *((c, _content_key(df[c].to_numpy())) for c in self.sources(name)))
+
+    def get(self, name: str) -> pd.Series:
+        if self._use_column(name):
+            return self.df[name]
+        key = self._source_key(name)
+        hit = self._cache.get(name)
+        if hit is not None and hit[0] == key: return hit[1]
+
+        spec = resolve(name)
+        value = spec.func(*(self.get(dep) for dep in spec.inputs)).rename(name)
+        self._cache[name] = (key, value)
+        return value
+
+    def frame(self, names) -> pd.DataFrame:
+        return pd.DataFrame({name: self.get(name) for name in names}, index=self.df.index)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+_STORES: dict[int, FeatureStore] = {}
+
+def feature_store(df: pd.DataFrame) -> FeatureStore:
+    # 같은 프로세스 안에서는 같은 DataFrame 객체에 대해 캐시를 재사용
+    key = id(df)
+    store = _STORES.get(key)
+    if store is None or store._df_ref() is not df:
+        store = FeatureStore(df)
+        _STORES[key] = store
+        weakref.finalize(df, _STORES.pop, key, None)
+    return store
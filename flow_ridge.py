@@ -0,0 +1,151 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+from features import feature_store
+from instrumentation import instrumented
+from overnight_alpha import Params, apply_rank_strategy
+from result_cache import memoized
+from rolling_rank import rolling_rank
+
+# ==============================================================================
+# 1. 수급 팩터 (투자자별 순매수 / 거래대금 5일 평균)
+# ==============================================================================
+# 매핑된 이름(net_priv_fund 등)이 있으면 그 컬럼을, 없으면 원본 Item 코드 컬럼을 사용
+FLOW_CODE_MAP = {
+    "I310020932": "net_priv_fund",    # 사모펀드
+    "I310023132": "net_foreign",      # 외국인계
+    "I310020032": "net_inst",         # 기관계
+    "I310020732": "net_individual",   # 개인
+    "I310020632": "net_pension",      # 연기금
+    "I310020132": "net_fin_invest",   # 금융투자
+    "I310020332": "net_insure",       # 보험
+    "I310020432": "net_inv_trust",    # 투신
+    "I310020532": "net_bank",         # 은행
+    "I310021132": "net_reg_foreign",  # 등록외국인
+    "I310024132": "net_nation",       # 국가/지자체
+}
+DEFAULT_WINDOW = 250   # 회귀 학습 기간 (None = 확장 윈도우)
+DEFAULT_RIDGE = 1e-4   # 계수 L2 벌점 (원 비율 단위, 250일 윈도우 Gram 대각의 ~0.3%)
+REFRESH_EVERY = 250    # 랭크-1 갱신 누적 오차 방지를 위해 역행렬을 다시 계산하는 주기
+
+def flow_factors(df: pd.DataFrame) -> pd.DataFrame:
+    # 존재하는 수급 컬럼 전부 -> Ratio_<이름> 프레임
+    store = feature_store(df)
+    factors = {}
+    for code, name in FLOW_CODE_MAP.items():
+        source = name if name in df.columns else code if code in df.columns else None
+        if source is not None:
+            factors[f"Ratio_{name}"] = store.get(f"Ratio_{source}")
+    if not factors: raise KeyError("No investor-flow columns found.")
+    return pd.DataFrame(factors, index=df.index)
+
+# ==============================================================================
+# 2. 롤링/확장 릿지 (Sherman-Morrison 랭크-1 갱신)
+# ==============================================================================
+# T일 장마감 예측 = [1, x_T] @ beta_T
+#   beta_T 는 (x_s, next_gap_s), s <= T-1 쌍으로만 학습 (next_gap_{T-1} 은 T일 시가에 확정 -> lookahead 없음)
+# A = λD + Σ z z',  b = Σ z y,  P = A^-1  (D = diag(0, 1, ..., 1): 절편은 벌점 없음)
+#   P 를 하루에 관측치 추가 1번 + 제거 1번의 랭크-1 갱신으로 유지
+#   추가: P <- P - (P z)(P z)' / (1 + z'P z)
+#   제거: P <- P + (P z)(P z)' / (1 - z'P z)
+# 매일 (k+1)^3 재적합 대신 (k+1)^2, REFRESH_EVERY 번마다 A 를 직접 역행렬로 다시 맞춤
+def rolling_ridge(x, y, window: int | None = DEFAULT_WINDOW, ridge: float = DEFAULT_RIDGE,
+                  min_periods: int | None = None,
+                  refresh: int = REFRESH_EVERY) -> tuple[np.ndarray, np.ndarray]:
+    # x (T, k), y (T,) -> 예측 (T,), 계수 (T, k+1) [절편, 팩터...]
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    if x.ndim == 1: x = x[:, None]
+    n_rows, n_coef = len(x), x.shape[1] + 1
+    if window is not None and window < 2: raise ValueError("window must be >= 2")
+    min_periods = 2 * n_coef if min_periods is None else max(1, min_periods)
+
+    z = np.hstack([np.ones((n_rows, 1)), x])
+    usable = np.isfinite(z).all(axis=1)
+    pair = usable & np.isfinite(y)
+    zy = np.where(pair[:, None], z * np.where(pair, y, 0.0)[:, None], 0.0)
+
+    forecast = np.full(n_rows, np.nan)
+    coefs = np.full((n_rows, n_coef), np.nan)
+    # 절편은 벌점 없음 (y 를 평행이동해도 기울기는 그대로). 학습 쌍이 1개 이상이면 gram[0, 0] = n > 0
+    gram = ridge * np.eye(n_coef)
+    gram[0, 0] = 0.0
+    moment = np.zeros(n_coef)
+    inv, n_obs, updates = None, 0, 0
+
+    for t in range(n_rows):
+        s = t - 1                                       # T일에 새로 확정되는 학습 쌍
+        if s >= 0 and pair[s]:
+            zs = z[s]
+            gram += np.outer(zs, zs)
+            moment += zy[s]
+            n_obs += 1
+            if inv is not None:
+                pz = inv @ zs
+                inv -= np.outer(pz, pz) / (1.0 + zs @ pz)
+                updates += 1
+        old = s - window if window is not None else -1  # 윈도우에서 빠지는 쌍
+        if old >= 0 and pair[old]:
+            zo = z[old]
+            gram -= np.outer(zo, zo)
+            moment -= zy[old]
+            n_obs -= 1
+            if inv is not None:
+                pz = inv @ zo
+                denom = 1.0 - zo @ pz
+                # 제거 후 특이 행렬에 가까우면 랭크-1 갱신을 버리고 다시 역행렬
+                if denom <= 1e-12: inv = None
+                else:
+                    inv += np.outer(pz, pz) / denom
+                    updates += 1
+
+        if n_obs < min_periods: continue
+        if inv is None or updates >= refresh:
+            try:
+                inv = np.linalg.inv(gram)
+            except np.linalg.LinAlgError:
+                inv = None
+                continue
+            updates = 0
+        beta = inv @ moment
+        coefs[t] = beta
+        if usable[t]:
+            forecast[t] = z[t] @ beta
+    return forecast, coefs
+
+@instrumented()
+@memoized
+def composite_forecast(df: pd.DataFrame, factors: pd.DataFrame | None = None,
+                       window: int | None = DEFAULT_WINDOW, ridge: float = DEFAULT_RIDGE,
+                       min_periods: int | None = None) -> pd.DataFrame:
+    # 모든 수급 비율로 다음날 갭을 예측 -> forecast + coef_<팩터> 컬럼
+    factors = flow_factors(df) if factors is None else factors
+    target = feature_store(df).get("next_gap").reindex(factors.index)
+    forecast, coefs = rolling_ridge(factors.to_numpy(dtype="float64"), target.to_numpy(dtype="float64"),
+                                    window, ridge, min_periods)
+    out = pd.DataFrame(coefs, index=factors.index,
+                       columns=["coef_intercept"] + [f"coef_{c}" for c in factors.columns])
+    out.insert(0, "forecast", forecast)
+    return out
+
+def composite_factor(forecast) -> pd.Series | np.ndarray:
+    # 기존 랭크 규칙(하위 분위 -> 매수)에 그대로 넣을 수 있게 부호 반전: 예측 갭이 클수록 낮은 값
+    return -forecast
+
+# ==============================================================================
+# 3. 합성 시그널 백테스트 (기존 랭크 -> 임계값 -> 포지션 로직 재사용)
+# ==============================================================================
+@instrumented()
+def run_composite_backtest(df: pd.DataFrame, params: Params, window: int | None = DEFAULT_WINDOW,
+                           ridge: float = DEFAULT_RIDGE, forecast: pd.DataFrame | None = None) -> tuple:
+    # forecast 를 넘기면 회귀를 다시 돌리지 않음 (Params 만 바꿔 반복 실행할 때)
+    store = feature_store(df)
+    forecast = composite_forecast(df, window=window, ridge=ridge) if forecast is None else forecast
+    df = df.copy(deep=False)
+    df["gap"] = store.get("gap")
+    df["composite_forecast"] = forecast["forecast"]
+    df["factor_rank"] = rolling_rank(composite_factor(df["composite_forecast"]), params.rolling_window, pct=True)
+    apply_rank_strategy(df, params)
+
+    backtest = df[["gap", "composite_forecast", "factor_rank", "position", "strategy_ret", "strategy_net", "equity"]]
+    return df, forecast, backtest
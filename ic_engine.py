@@ -0,0 +1,84 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+from pairwise_corr import MIN_OBS, pearson_cross, spearman_cross, window_sums
+from result_cache import memoized
+
+# ==============================================================================
+# IC / Rank-IC 엔진 (모든 팩터 x 모든 타깃을 행렬 연산으로 한 번에)
+# ==============================================================================
+FORWARD_DAYS = (2, 3, 4, 5)
+
+def forward_targets(df: pd.DataFrame, days=FORWARD_DAYS) -> pd.DataFrame:
+    # T일 장마감 기준으로 알 수 없는 미래 수익률들
+    close, open_ = df["close"], df["open"]
+    targets = {
+        "Next_Gap": (open_.shift(-1) - close) / close,          # 다음날 시가 갭
+        "Next_OC": (close.shift(-1) - open_.shift(-1)) / open_.shift(-1),  # 다음날 시가->종가
+    }
+    for h in days:
+        targets[f"Fwd_{h}D"] = close.shift(-h) / close - 1   # h일 보유 (종가->종가)
+    return pd.DataFrame(targets, index=df.index)
+
+def _t_stat(r: np.ndarray, n: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return r * np.sqrt((n - 2) / (1 - r ** 2))
+
+def rolling_ic(factors: pd.DataFrame, target: pd.Series, window: int = 60) -> pd.DataFrame:
+    # 윈도우 합으로 모든 팩터의 롤링 Pearson IC 를 한 번에 (팩터별로 타깃과 모두 유효한 행만)
+    x = factors.to_numpy(dtype="float64")
+    y = target.to_numpy(dtype="float64")[:, None]
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    # 팩터별 유효 쌍 평균으로 중심화 (상관계수는 평행이동에 불변, n Σx² - (Σx)² 상쇄 오차 감소)
+    count = np.maximum(valid.sum(axis=0), 1)
+    x0 = np.where(valid, x, 0.0)
+    y0 = np.where(valid, y, 0.0)
+    x0 = np.where(valid, x0 - x0.sum(axis=0) / count, 0.0)
+    y0 = np.where(valid, y0 - y0.sum(axis=0) / count, 0.0)
+
+    n = window_sums(valid.astype("float64"), window)
+    sx, sy = window_sums(x0, window), window_sums(y0, window)
+    sxx, syy, sxy = window_sums(x0 * x0, window), window_sums(y0 * y0, window), window_sums(x0 * y0, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = n * sxy - sx * sy
+        ic = cov / np.sqrt((n * sxx - sx ** 2) * (n * syy - sy ** 2))
+    ic[~(n >= MIN_OBS)] = np.nan
+    return pd.DataFrame(ic, index=factors.index, columns=factors.columns)
+
+@memoized
+def ic_table(factors: pd.DataFrame, targets: pd.DataFrame, window: int = 60) -> pd.DataFrame:
+    # 결과: 팩터 x 타깃 한 줄씩 (Pearson/Spearman IC, t-stat, 롤링 IC 요약)
+    # 결측은 팩터-타깃 쌍별로 제외 (다른 팩터의 결측 때문에 행을 버리지 않음)
+    # 모든 쌍의 IC 는 마스크 행렬곱 한 번, Rank IC 는 결측 패턴 묶음마다 랭크 한 번 (pairwise_corr)
+    x = factors.to_numpy(dtype="float64")
+    y = targets.to_numpy(dtype="float64")
+    ic, n = pearson_cross(x, y)                      # (팩터, 타깃)
+    rank_ic, _ = spearman_cross(x, y)
+
+    rolls = [rolling_ic(factors, target, window) for _, target in targets.items()]
+    roll_mean = np.array([roll.mean().to_numpy() for roll in rolls])      # (타깃, 팩터)
+    roll_std = np.array([roll.std().to_numpy() for roll in rolls])
+    roll_hit = np.array([(roll > 0).astype("float64").where(roll.notna()).mean().to_numpy() for roll in rolls])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roll_ir = np.where(roll_std > 0, roll_mean / roll_std, np.nan)
+
+    # 타깃별로 팩터 순서대로 (타깃 x 팩터 행 순서)
+    n_factors, n_targets = x.shape[1], y.shape[1]
+    return pd.DataFrame({
+        "factor": np.tile(np.array(factors.columns, dtype=object), n_targets),
+        "target": np.repeat(np.array(targets.columns, dtype=object), n_factors),
+        "n": n.T.ravel().astype(int),
+        "ic": ic.T.ravel(),
+        "ic_t": _t_stat(ic, n).T.ravel(),
+        "rank_ic": rank_ic.T.ravel(),
+        "rank_ic_t": _t_stat(rank_ic, n).T.ravel(),
+        "rolling_ic_mean": roll_mean.ravel(),
+        "rolling_ic_std": roll_std.ravel(),
+        "rolling_ic_ir": roll_ir.ravel(),
+        "rolling_ic_hit": roll_hit.ravel(),
+    })
+
+def ic_decay(table: pd.DataFrame, value: str = "rank_ic") -> pd.DataFrame:
+    # 팩터 x 타깃(호라이즌) 피벗: 예측력이 기간에 따라 어떻게 줄어드는지
+    targets = list(dict.fromkeys(table["target"]))
+    return table.pivot(index="factor", columns="target", values=value)[targets]
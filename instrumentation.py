@@ -0,0 +1,200 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+import json
+import platform
+import sys
+import time
+
+# ==============================================================================
+# 1. 단계별 계측 (벽시계 / CPU 시간 / 최대 RSS / 행·열 수)
+# ==============================================================================
+# 기본은 비활성: stage() 는 공용 null 객체를, @instrumented 는 원래 함수를 바로 호출
+# enable() / profiling() 으로 켜면 중첩 단계까지 기록해 JSON 리포트로 저장
+_ACTIVE: "RunProfiler | None" = None
+
+def _peak_rss_mb() -> float | None:
+    # 프로세스 최대 상주 메모리 (high-water mark). Windows 에는 resource 모듈이 없어 psapi 사용
+    if sys.platform == "win32":
+        return _windows_peak_rss_mb()
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10   # macOS: bytes, Linux: KB
+
+def _windows_peak_rss_mb() -> float | None:
+    # GetProcessMemoryInfo 의 PeakWorkingSetSize (Windows 가 아니면 windll 이 없어 None)
+    try:
+        import ctypes
+        from ctypes import wintypes
+    except ImportError:
+        return None
+
+    class _Counters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + \
+                   [(name, ctypes.c_size_t) for name in (
+                       "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                       "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage",
+                       "PagefileUsage", "PeakPagefileUsage")]
+
+    try:
+        counters = _Counters()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return None
+    except (AttributeError, OSError):
+        return None
+    return counters.PeakWorkingSetSize / 2 ** 20
+
+def _shape(obj) -> tuple[int | None, int | None]:
+    # DataFrame / Series / ndarray, 또는 그런 값이 첫 원소인 튜플
+    if isinstance(obj, tuple) and obj:
+        obj = obj[0]
+    shape = getattr(obj, "shape", None)
+    if not isinstance(shape, tuple) or not shape:
+        return None, None
+    return int(shape[0]), int(shape[1]) if len(shape) > 1 else 1
+
+@dataclass
+class StageRecord:
+    name: str
+    parent: str | None
+    depth: int
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_rss_mb: float | None = None
+    rss_growth_mb: float | None = None   # 이 단계에서 최대 RSS 가 늘어난 양
+    rows: int | None = None
+    columns: int | None = None
+    error: str | None = None
+
+    def record(self, obj) -> None:
+        rows, columns = _shape(obj)
+        if rows is not None:
+            self.rows, self.columns = rows, columns
+
+class _NullStage:
+    # 비활성 상태에서 stage() 가 돌려주는 공용 객체 (할당/시간 측정 없음)
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+    def record(self, obj) -> None: pass
+
+_NULL_STAGE = _NullStage()
+
+# ==============================================================================
+# 2. 프로파일러
+# ==============================================================================
+class RunProfiler:
+    def __init__(self, name: str = "run"):
+        self.name = name
+        self.started = datetime.now()
+        self.stages: list[StageRecord] = []
+        self.meta: dict = {}
+        self._stack: list[StageRecord] = []
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+
+    @contextmanager
+    def stage(self, name: str):
+        parent = self._stack[-1].name if self._stack else None
+        rec = StageRecord(name, parent, len(self._stack))
+        self.stages.append(rec)
+        self._stack.append(rec)
+        rss0 = _peak_rss_mb()
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield rec
+        except BaseException as exc:
+            rec.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            rec.wall_s = time.perf_counter() - wall0
+            rec.cpu_s = time.process_time() - cpu0
+            rec.peak_rss_mb = _peak_rss_mb()
+            if rss0 is not None and rec.peak_rss_mb is not None:
+                rec.rss_growth_mb = rec.peak_rss_mb - rss0
+            self._stack.pop()
+
+    def report(self) -> dict:
+        return {
+            "name": self.name,
+            "started": self.started.isoformat(timespec="seconds"),
+            "total_wall_s": time.perf_counter() - self._t0,
+            "total_cpu_s": time.process_time() - self._cpu0,
+            "peak_rss_mb": _peak_rss_mb(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **self.meta,
+            "stages": [asdict(rec) for rec in self.stages],
+        }
+
+    def write(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), ensure_ascii=False, indent=1, default=str),
+                        encoding="utf-8")
+        return path
+
+    def summary(self) -> str:
+        lines = [f"{'stage':<36}{'wall_s':>9}{'cpu_s':>9}{'peak_mb':>10}{'rows':>10}{'cols':>6}"]
+        for rec in self.stages:
+            peak = f"{rec.peak_rss_mb:.1f}" if rec.peak_rss_mb is not None else "-"
+            lines.append(f"{'  ' * rec.depth + rec.name:<36}{rec.wall_s:>9.3f}{rec.cpu_s:>9.3f}"
+                         f"{peak:>10}{rec.rows if rec.rows is not None else '-':>10}"
+                         f"{rec.columns if rec.columns is not None else '-':>6}")
+        return "\n".join(lines)
+
+# ==============================================================================
+# 3. 훅 (모듈 전역 프로파일러 사용)
+# ==============================================================================
+def active() -> RunProfiler | None:
+    return _ACTIVE
+
+def enable(name: str = "run") -> RunProfiler:
+    global _ACTIVE
+    _ACTIVE = RunProfiler(name)
+    return _ACTIVE
+
+def disable() -> RunProfiler | None:
+    global _ACTIVE
+    profiler, _ACTIVE = _ACTIVE, None
+    return profiler
+
+@contextmanager
+def profiling(path: str | Path | None = None, name: str = "run"):
+    # with profiling("database/run_report.json"): ... -> 종료 시 리포트 저장
+    profiler = enable(name)
+    try:
+        yield profiler
+    finally:
+        disable()
+        if path is not None:
+            profiler.write(path)
+
+def stage(name: str):
+    # with stage("write") as s: ...; s.record(df)
+    return _NULL_STAGE if _ACTIVE is None else _ACTIVE.stage(name)
+
+def instrumented(name: str | None = None):
+    # 반환값(없으면 첫 DataFrame 인자)의 행/열 수까지 기록
+    def decorate(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _ACTIVE is None:
+                return func(*args, **kwargs)
+            with _ACTIVE.stage(label) as rec:
+                result = func(*args, **kwargs)
+                rec.record(result)
+                if rec.rows is None and args:
+                    rec.record(args[0])
+                return result
+        return wrapper
+    return decorate
@@ -0,0 +1,138 @@
+from __future__ import annotations
+from itertools import product
+import numpy as np
+import pandas as pd
+from features import feature_store
+from kpi import TRADING_DAYS, equity_curves, max_drawdown, summarize
+from overnight_alpha import Params
+
+# ==============================================================================
+# 장중 손절/익절 시뮬레이터 (일봉 OHLC 만 사용)
+# ==============================================================================
+# position(전일 종가 진입 -> 시가 갭) 을 시가 이후에도 들고 가면서
+#   - 손절 stop: 시가 대비 불리한 방향으로 stop 만큼 움직이면 그 가격에 청산
+#   - 익절 target: 유리한 방향으로 target 만큼 움직이면 그 가격에 청산
+#   - 둘 다 안 닿으면 종가 청산
+# 일봉만으로는 장중 순서를 알 수 없으므로 같은 날 둘 다 닿으면 손절이 먼저라고 가정 (보수적)
+# 하루 수익률 = p * ((1 + gap) * (1 + x) - 1),  x = 시가 -> 청산가 변화율
+#            = p * gap + |p| * (1 + gap) * m    (m: 포지션 방향 기준 장중 수익률)
+MAX_BLOCK_CELLS = 1 << 23   # (날짜 x 룰) 블록 크기 상한
+
+def _day_arrays(df: pd.DataFrame, position) -> dict[str, np.ndarray]:
+    store = feature_store(df)
+    position = np.asarray(position, dtype="float64")
+    direction = np.sign(position)
+    up = store.get("open_to_high").to_numpy(dtype="float64")       # (high - open) / open
+    down = -store.get("open_to_low").to_numpy(dtype="float64")     # (open - low) / open
+    oc = (df["close"] / df["open"] - 1).to_numpy(dtype="float64")
+    return {
+        "position": position,
+        "size": np.abs(position),
+        "gap": store.get("gap").to_numpy(dtype="float64"),
+        # 포지션 방향 기준 불리/유리한 최대 이동, 종가 청산 수익률
+        "adverse": np.where(direction > 0, down, up),
+        "favorable": np.where(direction > 0, up, down),
+        "held": direction * oc,
+        "traded": direction != 0,
+    }
+
+def _stop_block(days: dict, stops: np.ndarray, targets: np.ndarray, cost: float) -> dict:
+    # stops (S,) x targets (K,) -> (T, S*K) 순수익 / 체결 통계
+    stop_hit = days["adverse"][:, None] >= stops[None, :]                     # (T, S)
+    target_hit = days["favorable"][:, None] >= targets[None, :]               # (T, K)
+    move = np.where(target_hit[:, None, :], targets[None, None, :], days["held"][:, None, None])
+    move = np.where(stop_hit[:, :, None], -stops[None, :, None], move)          # 손절 우선
+    move = move.reshape(len(move), -1)
+
+    gap = days["gap"][:, None]
+    ret = days["position"][:, None] * gap + (days["size"] * (1 + days["gap"]))[:, None] * move
+    net = ret - days["size"][:, None] * cost
+
+    # 체결 횟수: 같은 날 둘 다 닿은 횟수는 (S, T) @ (T, K) 한 번으로
+    traded = days["traded"][:, None]
+    stop_hit = (stop_hit & traded).astype("float64")
+    target_hit = (target_hit & traded).astype("float64")
+    both = stop_hit.T @ target_hit
+    return {
+        "net": net,
+        "stop_hits": np.repeat(stop_hit.sum(axis=0), len(targets)).astype(int),
+        "target_hits": (target_hit.sum(axis=0)[None, :] - both).ravel().astype(int),
+        "ambiguous": both.ravel().astype(int),
+    }
+
+def _summarize_traded(net: np.ndarray, n_rows: int, leading_flat: bool) -> dict[str, np.ndarray]:
+    # 포지션이 없는 날은 순수익 0 -> 거래일 행만으로 전체 기간 KPI (kpi.summarize 와 같은 값)
+    # 무포지션 날의 자산은 직전 값 그대로라 MDD 의 고점 후보가 아님. 단 첫 거래일 전에 무포지션 날이
+    # 있으면 그날 자산 1 이 고점 후보이므로 (leading_flat) 그 한 행만 앞에 붙임
+    net = np.nan_to_num(net)
+    n_traded = len(net)
+    equity = equity_curves(np.vstack([np.zeros((1, net.shape[1])), net]) if leading_flat else net)
+    mean = net.sum(axis=0) / n_rows
+    # 표본 분산: 거래일 편차 제곱합 + 무포지션 날 (0 - mean)² (ddof=1)
+    var = (np.square(net - mean).sum(axis=0) + (n_rows - n_traded) * mean ** 2) / (n_rows - 1)
+    std = np.sqrt(var)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(TRADING_DAYS), np.nan)
+    return {
+        "equity": equity[-1],
+        "sharpe": sharpe,
+        "mdd": max_drawdown(equity),
+        "trades": np.full(net.shape[1], n_traded),
+    }
+
+def run_exit_grid(df: pd.DataFrame, position, stops, targets, cost: float = Params.cost,
+                  include_open_exit: bool = True) -> pd.DataFrame:
+    # 손절 x 익절 격자 전체를 한 번에 평가 (np.inf = 해당 주문 없음)
+    # include_open_exit: 시가 청산(현재 전략, 장중 보유 없음) 기준 행 추가
+    stops = np.asarray(stops, dtype="float64")
+    targets = np.asarray(targets, dtype="float64")
+    if (stops <= 0).any() or (targets <= 0).any():
+        raise ValueError("stops and targets must be positive (use np.inf for no order)")
+    days = _day_arrays(df, position)
+
+    frames = []
+    if include_open_exit:
+        net = days["position"] * days["gap"] - days["size"] * cost
+        stats = summarize(net, days["position"])
+        frames.append(pd.DataFrame({"exit": ["open"], "stop": [np.nan], "target": [np.nan], **stats,
+                                    "stop_hits": [0], "target_hits": [0], "ambiguous": [0]}))
+
+    # 손절/익절은 포지션이 있는 날에만 영향 -> 거래일 행만 (날짜 x 룰) 행렬로 계산
+    traded = {name: values[days["traded"]] for name, values in days.items()}
+    n_traded = int(days["traded"].sum())
+
+    # 메모리 상한 안에서 손절 값을 묶어 블록 단위로 계산
+    per_stop = max(1, MAX_BLOCK_CELLS // max(1, n_traded * len(targets)))
+    for i in range(0, len(stops), per_stop):
+        block_stops = stops[i:i + per_stop]
+        block = _stop_block(traded, block_stops, targets, cost)
+        stats = _summarize_traded(block["net"], len(df), leading_flat=len(df) > 0 and not days["traded"][0])
+
+        grid = pd.DataFrame(list(product(block_stops, targets)), columns=["stop", "target"])
+        grid.insert(0, "exit", "close")
+        for name, values in stats.items():
+            grid[name] = values
+        for name in ("stop_hits", "target_hits", "ambiguous"):
+            grid[name] = block[name]
+        frames.append(grid)
+
+    return pd.concat(frames, ignore_index=True)
+
+def simulate_exits(df: pd.DataFrame, position, stop: float = np.inf, target: float = np.inf,
+                   cost: float = Params.cost) -> pd.DataFrame:
+    # 룰 하나의 일별 결과 (청산 사유 포함)
+    days = _day_arrays(df, position)
+    stop_hit = days["traded"] & (days["adverse"] >= stop)
+    target_hit = days["traded"] & (days["favorable"] >= target) & ~stop_hit
+    move = np.where(stop_hit, -stop, np.where(target_hit, target, days["held"]))
+    move = np.where(days["traded"], move, 0.0)
+
+    out = pd.DataFrame(index=df.index)
+    out["position"] = days["position"]
+    out["gap"] = days["gap"]
+    out["exit_reason"] = np.select([~days["traded"], stop_hit, target_hit], ["flat", "stop", "target"], "close")
+    out["intraday_ret"] = move
+    out["strategy_ret"] = days["position"] * days["gap"] + days["size"] * (1 + days["gap"]) * move
+    out["strategy_net"] = out["strategy_ret"] - days["size"] * cost
+    out["equity"] = equity_curves(out["strategy_net"].to_numpy())[:, 0]
+    return out
@@ -0,0 +1,53 @@
+from __future__ import annotations
+import numpy as np
+
+# ==============================================================================
+# 컬럼 단위 성과 지표 (행 = 날짜, 열 = 전략/파라미터 조합)
+# ==============================================================================
+TRADING_DAYS = 252
+
+def _as_2d(values) -> np.ndarray:
+    arr = np.asarray(values, dtype="float64")
+    return arr[:, None] if arr.ndim == 1 else arr
+
+def equity_curves(net) -> np.ndarray:
+    # 결측 수익률은 0 으로 보고 누적 (run_alpha_factor_testing 과 동일)
+    return np.cumprod(1 + np.nan_to_num(_as_2d(net)), axis=0)
+
+def max_drawdown(equity) -> np.ndarray:
+    equity = _as_2d(equity)
+    return (equity / np.maximum.accumulate(equity, axis=0) - 1.0).min(axis=0)
+
+def sharpe_ratio(net, periods: int = TRADING_DAYS) -> np.ndarray:
+    net = np.nan_to_num(_as_2d(net))
+    std = net.std(axis=0, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 0, net.mean(axis=0) / std * np.sqrt(periods), np.nan)
+
+def trade_count(position) -> np.ndarray:
+    return (_as_2d(position) != 0).sum(axis=0)
+
+def total_return(equity) -> np.ndarray:
+    return _as_2d(equity)[-1] - 1.0
+
+def cagr(equity, days: int) -> np.ndarray:
+    # analysis/result.py 와 같은 정의: 달력일 기준 연환산
+    end = _as_2d(equity)[-1]
+    return end ** (365 / days) - 1.0 if days > 0 else np.zeros_like(end)
+
+def win_rate(net, position) -> np.ndarray:
+    # 포지션이 있었던 날 중 순수익 > 0 인 비율
+    traded = _as_2d(position) != 0
+    wins = (traded & (_as_2d(net) > 0)).sum(axis=0)
+    n_trades = traded.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(n_trades > 0, wins / n_trades, 0.0)
+
+def summarize(net, position) -> dict[str, np.ndarray]:
+    equity = equity_curves(net)
+    return {
+        "equity": equity[-1],
+        "sharpe": sharpe_ratio(net),
+        "mdd": max_drawdown(equity),
+        "trades": trade_count(position),
+    }
@@ -0,0 +1,181 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+from kpi import cagr, equity_curves, max_drawdown, sharpe_ratio, total_return, win_rate, TRADING_DAYS
+
+# ==============================================================================
+# KPI 유의성 검정 (블록 부트스트랩 신뢰구간 + 시그널 순열 귀무분포)
+# ==============================================================================
+# 경로별 파이썬 루프 없이 (경로 x 날짜) 행렬로 계산합니다.
+#  - 부트스트랩: 블록 (시작, 길이) 별 누적 통계를 미리 표로 만들고, 블록 단위로 합성
+#    (로그 수익 누적/최소·최대 prefix/내부 낙폭만 있으면 경로 MDD 까지 정확히 복원)
+#  - 귀무분포: 포지션 순서를 섞은 (경로 x 날짜) 행렬을 로그 누적으로 한 번에 계산
+KPI_NAMES = ("total_return", "cagr", "mdd", "win_rate", "sharpe")
+_MAX_BLOCK_FACTOR = 20   # 정상 부트스트랩 블록 길이 상한 = mean_block * 20
+
+def _observed(net: np.ndarray, position: np.ndarray, days: int) -> dict[str, float]:
+    equity = equity_curves(net)
+    return {
+        "total_return": float(total_return(equity)[0]),
+        "cagr": float(cagr(equity, days)[0]),
+        "mdd": float(max_drawdown(equity)[0]),
+        "win_rate": float(win_rate(net, position)[0]),
+        "sharpe": float(sharpe_ratio(net)[0]),
+    }
+
+def _finish(log_total, log_mdd, s1, s2, wins, trades, n_rows: int, days: int) -> dict[str, np.ndarray]:
+    end = np.exp(log_total)
+    mean = s1 / n_rows
+    std = np.sqrt(np.maximum(s2 - s1 * mean, 0.0) / (n_rows - 1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "total_return": end - 1.0,
+            "cagr": end ** (365 / days) - 1.0 if days > 0 else np.zeros_like(end),
+            "mdd": np.expm1(log_mdd),
+            "win_rate": np.where(trades > 0, wins / trades, 0.0),
+            "sharpe": np.where(std > 0, mean / std * np.sqrt(TRADING_DAYS), np.nan),
+        }
+
+# ------------------------------------------------------------------------------
+# 1. 블록 통계 표 (원형 시계열, 시작 s / 길이 l)
+# ------------------------------------------------------------------------------
+def _block_tables(log_ret: np.ndarray, max_len: int) -> dict[str, np.ndarray]:
+    n_rows = len(log_ret)
+    doubled = np.concatenate([log_ret, log_ret])
+    cum = np.zeros((n_rows, max_len + 1))
+    low = np.full((n_rows, max_len + 1), np.inf)      # min prefix (k >= 1)
+    high = np.full((n_rows, max_len + 1), -np.inf)    # max prefix (k >= 1)
+    inner = np.full((n_rows, max_len + 1), np.inf)    # 블록 내부 최대 낙폭 (로그)
+    starts = np.arange(n_rows)
+    for length in range(1, max_len + 1):
+        cum[:, length] = cum[:, length - 1] + doubled[starts + length - 1]
+        low[:, length] = np.minimum(low[:, length - 1], cum[:, length])
+        high[:, length] = np.maximum(high[:, length - 1], cum[:, length])
+        inner[:, length] = np.minimum(inner[:, length - 1], cum[:, length] - high[:, length])
+    return {"cum": cum, "low": low, "high": high, "inner": inner}
+
+def _block_lengths(n_paths: int, n_rows: int, mean_block: float, method: str,
+                   rng: np.random.Generator) -> tuple[np.ndarray, int]:
+    if method == "block":
+        length = max(1, min(int(mean_block), n_rows))
+        n_blocks = -(-n_rows // length)
+        return np.full((n_paths, n_blocks), length), length
+    # 정상 부트스트랩: 기하분포 블록 길이 (평균 mean_block)
+    max_len = max(1, min(n_rows, int(np.ceil(mean_block * _MAX_BLOCK_FACTOR))))
+    n_blocks = int(np.ceil(2 * n_rows / mean_block)) + 8
+    while True:
+        lengths = np.minimum(rng.geometric(1.0 / mean_block, (n_paths, n_blocks)), max_len)
+        if lengths.sum(axis=1).min() >= n_rows: return lengths, max_len
+        n_blocks *= 2
+
+def _bootstrap_paths(net: np.ndarray, position: np.ndarray, n_paths: int, mean_block: float,
+                     method: str, days: int, rng: np.random.Generator) -> dict[str, np.ndarray]:
+    n_rows = len(net)
+    lengths, max_len = _block_lengths(n_paths, n_rows, mean_block, method, rng)
+    starts = rng.integers(0, n_rows, lengths.shape)
+
+    # 마지막 블록은 n_rows 에 맞춰 자르고, 모든 경로에서 빈 뒤쪽 블록은 버림
+    used = np.cumsum(lengths, axis=1)
+    lengths = np.clip(n_rows - (used - lengths), 0, lengths)
+    n_blocks = int((lengths > 0).sum(axis=1).max())
+    lengths, starts = lengths[:, :n_blocks], starts[:, :n_blocks]
+
+    # 덧셈형 통계는 원형 prefix sum 으로 O(1)
+    traded = position != 0
+    doubled = np.concatenate([net, net])
+    prefix = np.zeros((4, 2 * n_rows + 1))
+    prefix[0, 1:] = np.cumsum(doubled)
+    prefix[1, 1:] = np.cumsum(doubled ** 2)
+    prefix[2, 1:] = np.cumsum(np.tile(traded & (net > 0), 2))
+    prefix[3, 1:] = np.cumsum(np.tile(traded, 2))
+    s1, s2, wins, trades = (prefix[:, starts + lengths] - prefix[:, starts]).sum(axis=2)
+
+    # 블록을 순서대로 이어 붙이며 (현재 낙폭, 최대 낙폭) 갱신 - 루프는 블록 수만큼
+    tables = _block_tables(np.log1p(net), max_len)
+    flat = starts * (max_len + 1) + lengths
+    level_dd = np.full(n_paths, np.inf)     # 첫 블록 전에는 고점 없음
+    worst = np.zeros(n_paths)
+    log_total = np.zeros(n_paths)
+    for k in range(n_blocks):
+        cell = flat[:, k]
+        tot = tables["cum"].take(cell)
+        active = lengths[:, k] > 0
+        block_worst = np.minimum(level_dd + tables["low"].take(cell), tables["inner"].take(cell))
+        worst = np.where(active, np.minimum(worst, block_worst), worst)
+        level_dd = np.where(active, np.minimum(level_dd + tot, tot - tables["high"].take(cell)), level_dd)
+        log_total += tot
+    return _finish(log_total, worst, s1, s2, wins, trades, n_rows, days)
+
+# ------------------------------------------------------------------------------
+# 2. 순열 귀무분포 (포지션 타이밍 무작위화)
+# ------------------------------------------------------------------------------
+def _permutation_null(position: np.ndarray, gap: np.ndarray, cost: float, n_paths: int,
+                      days: int, rng: np.random.Generator) -> dict[str, np.ndarray]:
+    # 큰 (경로 x 날짜) 배열은 두 개만 만들고 나머지는 제자리 연산 (할당 비용이 큼)
+    # 갭이 NaN 인 날은 strategy_net 도 NaN -> 수익 0 (비용 없음) 으로 처리
+    n_rows = len(position)
+    missing = np.isnan(gap)
+    gap = np.where(missing, 0.0, gap)
+    day_cost = np.where(missing, 0.0, cost)
+
+    buf = np.broadcast_to(position, (n_paths, n_rows)).copy()
+    rng.permuted(buf, axis=1, out=buf)
+    trades = np.count_nonzero(buf, axis=1)
+    net = np.multiply(buf, gap, out=np.empty_like(buf))
+    np.abs(buf, out=buf)
+    buf *= day_cost
+    net -= buf
+
+    wins = np.count_nonzero(net > 0, axis=1)     # net > 0 이면 포지션이 있었던 날
+    s1, s2 = net.sum(axis=1), np.einsum("ij,ij->i", net, net)
+
+    log_cum = np.cumsum(np.log1p(net, out=net), axis=1, out=net)
+    peak = np.maximum.accumulate(log_cum, axis=1, out=buf)
+    log_mdd = np.subtract(log_cum, peak, out=buf).min(axis=1)
+    return _finish(log_cum[:, -1], log_mdd, s1, s2, wins, trades, n_rows, days)
+
+# ==============================================================================
+# 3. 실행
+# ==============================================================================
+def infer_cost(backtest: pd.DataFrame) -> float:
+    # 결과 파일에 Params 가 없을 때: strategy_ret - strategy_net = |position| * cost
+    traded = backtest["position"].abs() > 0
+    paid = (backtest["strategy_ret"] - backtest["strategy_net"])[traded] / backtest["position"].abs()[traded]
+    paid = paid.dropna()
+    if paid.empty: raise ValueError("Cannot infer the cost: no traded day with both strategy_ret and strategy_net.")
+    return float(paid.median())
+
+def bootstrap_kpis(backtest: pd.DataFrame, cost: float, n_paths: int = 10_000, mean_block: float = 10,
+                   method: str = "stationary", alpha: float = 0.05,
+                   seed: int | None = None) -> pd.DataFrame:
+    # backtest: run_alpha_factor_testing 의 세 번째 반환값 (gap / position / strategy_net)
+    # cost: 백테스트에 쓴 Params.cost (순열 귀무분포가 같은 비용을 물어야 관측값과 비교 가능)
+    if method not in ("stationary", "block"):
+        raise ValueError("method must be 'stationary' or 'block'")
+    rng = np.random.default_rng(seed)
+    net = np.nan_to_num(backtest["strategy_net"].to_numpy(dtype="float64"))
+    position = np.nan_to_num(backtest["position"].to_numpy(dtype="float64"))
+    gap = backtest["gap"].to_numpy(dtype="float64")
+    days = (backtest.index[-1] - backtest.index[0]).days
+
+    # 로그 수익 누적은 일 수익 > -100% 에서만 정의됨 (관측 경로 / 순열 경로의 최악 손실 모두)
+    if (net <= -1).any():
+        raise ValueError("strategy_net has a day with a loss of 100% or more; log-return KPIs are undefined.")
+    worst = np.abs(position).max(initial=0.0) * (np.nanmax(np.abs(gap), initial=0.0) + cost)
+    if worst >= 1:
+        raise ValueError("A permuted position can lose 100% or more in a day (|gap| + cost >= 1); "
+                         "log-return KPIs are undefined.")
+
+    observed = _observed(net, position, days)
+    boot = _bootstrap_paths(net, position, n_paths, mean_block, method, days, rng)
+    null = _permutation_null(position, gap, cost, n_paths, days, rng)
+
+    rows = []
+    for name in KPI_NAMES:
+        obs = observed[name]
+        low, high = np.nanquantile(boot[name], [alpha / 2, 1 - alpha / 2])
+        # 단측 p-value: 무작위 타이밍이 관측값 이상을 낼 확률
+        p_value = (1 + np.sum(null[name] >= obs)) / (n_paths + 1)
+        rows.append({"kpi": name, "observed": obs, "ci_low": low, "ci_high": high,
+                     "null_mean": float(np.nanmean(null[name])), "p_value": p_value})
+    return pd.DataFrame(rows).set_index("kpi")
@@ -0,0 +1,165 @@
+from __future__ import annotations
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+import json
+import math
+import numpy as np
+import pandas as pd
+from features import TURNOVER_WINDOW
+from overnight_alpha import Params
+
+# ==============================================================================
+# 증분 일일 업데이트 (전체 재계산 없이 다음날 포지션 산출)
+# ==============================================================================
+# run_alpha_factor_testing 과 같은 결과를 하루 단위로 만들어냄:
+#  - turnover 5일 평균 / priv_fund_ratio 랭크 윈도우 버퍼만 보관
+#  - 체크포인트는 작은 JSON 파일 하나
+
+def _value(row, key: str) -> float:
+    value = row.get(key) if hasattr(row, "get") else None
+    return float("nan") if value is None or pd.isna(value) else float(value)
+
+def _div(a: float, b: float) -> float:
+    # pandas 나눗셈과 같게: 0 으로 나누면 ±inf / NaN (ZeroDivisionError 없음)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return float(np.float64(a) / b)
+
+# 체크포인트는 표준 JSON 만 씀 (NaN / Infinity 토큰 없음): NaN -> null, ±inf -> "inf" / "-inf"
+_FLOAT_FIELDS = ("turnover_buf", "ratio_buf", "last_close")
+
+def _encode(value):
+    if isinstance(value, list): return [_encode(v) for v in value]
+    if isinstance(value, float) and not math.isfinite(value):
+        return None if math.isnan(value) else ("inf" if value > 0 else "-inf")
+    return value
+
+def _decode(value):
+    if isinstance(value, list): return [_decode(v) for v in value]
+    if value is None: return float("nan")
+    return float(value)
+
+@dataclass
+class OvernightState:
+    params: Params
+    turnover_buf: list[float] = field(default_factory=list)
+    ratio_buf: list[float] = field(default_factory=list)
+    last_close: float = float("nan")
+    signal: float = 0.0          # 오늘 장마감 시그널 = 내일 포지션
+    equity: float = 1.0
+    last_date: str | None = None
+    n_rows: int = 0
+
+    # --------------------------------------------------------------------------
+    # 업데이트
+    # --------------------------------------------------------------------------
+    def _rank(self, value: float) -> float:
+        # pandas rolling(window).rank(pct=True): 윈도우가 NaN 없이 가득 차야 함 (±inf 는 버퍼에 NaN 으로 저장)
+        window = self.params.rolling_window
+        if math.isnan(value) or len(self.ratio_buf) < window: return float("nan")
+        nobs = sum(1 for v in self.ratio_buf if not math.isnan(v))
+        if nobs < window: return float("nan")
+        below = sum(1 for v in self.ratio_buf if v < value)
+        upto = sum(1 for v in self.ratio_buf if v <= value)
+        return (below + 1 + upto) * 0.5 / nobs
+
+    def update(self, row, date=None) -> dict:
+        date = pd.Timestamp(date if date is not None else row.name)
+        if self.last_date is not None and date <= pd.Timestamp(self.last_date):
+            raise ValueError(f"{date.date()} is not after the last processed date {self.last_date}.")
+
+        open_, close = _value(row, "open"), _value(row, "close")
+        has_turnover = "turnover" in row
+        turnover = _value(row, "turnover") if has_turnover else close * 1000
+
+        # 1. 갭 / 오늘 포지션 (어제 시그널)
+        gap = _div(open_ - self.last_close, self.last_close)
+        position = self.signal
+        strategy_ret = position * gap
+        strategy_net = strategy_ret - abs(position) * self.params.cost
+        self.equity *= 1 + (0.0 if math.isnan(strategy_net) else strategy_net)
+
+        # 2. 팩터 (거래대금 5일 평균 정규화)
+        self.turnover_buf = (self.turnover_buf + [turnover])[-TURNOVER_WINDOW:]
+        turnover_ma = float("nan")
+        if len(self.turnover_buf) == TURNOVER_WINDOW:
+            turnover_ma = sum(self.turnover_buf) / TURNOVER_WINDOW
+        ratio = _div(_value(row, "net_priv_fund"), turnover_ma)
+
+        # 3. 랭크 -> 내일 포지션
+        self.ratio_buf = (self.ratio_buf + [ratio if math.isfinite(ratio) else float("nan")])[-self.params.rolling_window:]
+        rank = self._rank(ratio)
+        self.signal = float((rank < self.params.buy_threshold) - (rank > self.params.sell_threshold))
+
+        self.last_close = close
+        self.last_date = str(date.date())
+        self.n_rows += 1
+        return {
+            "date": date,
+            "gap": gap,
+            "priv_fund_ratio": ratio,
+            "factor_rank": rank,
+            "position": position,
+            "strategy_ret": strategy_ret,
+            "strategy_net": strategy_net,
+            "equity": self.equity,
+            "next_position": self.signal,
+        }
+
+    def catch_up(self, df: pd.DataFrame) -> pd.DataFrame:
+        # 체크포인트 이후의 새 거래일만 반영
+        if self.last_date is not None:
+            df = df[df.index > pd.Timestamp(self.last_date)]
+        rows = [self.update(row) for _, row in df.iterrows()]
+        return pd.DataFrame(rows).set_index("date") if rows else pd.DataFrame()
+
+    # --------------------------------------------------------------------------
+    # 생성 / 체크포인트
+    # --------------------------------------------------------------------------
+    @classmethod
+    def from_history(cls, df: pd.DataFrame, params: Params) -> "OvernightState":
+        state = cls(params)
+        state.catch_up(df)
+        return state
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        payload = asdict(self)
+        for name in _FLOAT_FIELDS:
+            payload[name] = _encode(payload[name])
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, indent=1, allow_nan=False), encoding="utf-8")
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "OvernightState":
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        payload["params"] = Params(**payload["params"])
+        for name in _FLOAT_FIELDS:
+            payload[name] = _decode(payload[name])
+        return cls(**payload)
+
+def main() -> None:
+    from overnight_alpha import load_dataguide_excel
+    from run_analysis import DATA_PATH, OUTPUT_DIR
+
+    checkpoint = OUTPUT_DIR / "live_state.json"
+    df = load_dataguide_excel(DATA_PATH)
+
+    if checkpoint.exists():
+        state = OvernightState.load(checkpoint)
+        print(f"체크포인트 로드: {state.last_date} 까지 반영됨")
+    else:
+        state = OvernightState(Params())
+        print("체크포인트가 없어 전체 이력으로 초기화합니다...")
+
+    new_rows = state.catch_up(df)
+    print(f"\n[신규 반영 {len(new_rows)}일]")
+    if len(new_rows):
+        print(new_rows[["position", "strategy_net", "equity"]].tail())
+    print(f"\n[다음 거래일 포지션] {state.signal:+.0f}  (equity {state.equity:.4f})")
+
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    state.save(checkpoint)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,15 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
-import re
+import hashlib
 import numpy as np
 import pandas as pd
+from dataguide_cache import cached_frame
+from dataguide_sheet import (find_item_row, first_data_row, normalize_code, read_data_block,
+                             to_date_index, to_float_array)
+from features import feature_store
+from instrumentation import instrumented
+from result_cache import memoized
 
 # ==============================================================================
 # 1. 데이터 매핑 (사모펀드 포함)
@@ -31,17 +37,12 @@ class Params:
 # ==============================================================================
 # 3. 유틸리티 함수들
 # ==============================================================================
-def _normalize_code(value) -> str | None:
-    if pd.isna(value): return None
-    text = str(value)
-    text = re.sub(r"[^A-Za-z0-9]", "", text)
-    return text or None
-
-def _map_item_codes(df: pd.DataFrame) -> pd.DataFrame:
-    normalized_map = {_normalize_code(code): name for code, name in ITEM_CODE_MAP.items()}
+@instrumented()
+def map_item_codes(df: pd.DataFrame) -> pd.DataFrame:
+    normalized_map = {normalize_code(code): name for code, name in ITEM_CODE_MAP.items()}
     rename_map = {}
     for col in df.columns:
-        normalized = _normalize_code(col)
+        normalized = normalize_code(col)
         if normalized and normalized in normalized_map:
             rename_map[col] = normalized_map[normalized]
     
@@ -51,65 +52,103 @@ def _map_item_codes(df: pd.DataFrame) -> pd.DataFrame:
         mapped[col] = pd.to_numeric(mapped[col], errors="coerce")
     return mapped
 
-def load_dataguide_excel(path: str | Path) -> pd.DataFrame:
-    # 1. 헤더 파싱
-    raw = pd.read_excel(path, header=None)
-    item_row_idx = None
-    for i in range(50):
-        row_str = raw.iloc[i].astype(str).values
-        if any("I3100" in s for s in row_str):
-            item_row_idx = i
-            break
-            
-    if item_row_idx is None: raise SystemExit("Item row not found.")
-    
-    # 2. 데이터 로드
-    raw.columns = raw.iloc[item_row_idx]
-    data_start = item_row_idx + 1
-    for i in range(item_row_idx+1, item_row_idx+50):
-        try:
-            dt = pd.to_datetime(raw.iloc[i, 0])
-            if dt.year > 1900:
-                data_start = i
-                break
-        except: continue
-            
-    df = raw.iloc[data_start:].copy()
-    
-    # 3. 컬럼 정리
-    cols = []
-    for c in df.columns:
-        norm = _normalize_code(c)
-        cols.append(norm if norm else "unknown")
-    df.columns = cols
-    
-    df = df.rename(columns={df.columns[0]: "date"})
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    df = df.dropna(subset=["date"]).set_index("date").sort_index()
-    
-    # 주말 제거
-    df = df[df.index.dayofweek < 5]
-    df = _map_item_codes(df)
-    
-    return df
+# 예전 이름 (기존 호출부 호환용)
+_map_item_codes = map_item_codes
 
-def run_alpha_factor_testing(df: pd.DataFrame, params: Params) -> tuple:
-    df = df.copy()
-    
-    # 1. 갭 계산 (Target)
-    df["gap"] = (df["open"] - df["close"].shift(1)) / df["close"].shift(1)
-    
-    # 2. 팩터 계산
-    if "turnover" not in df.columns:
-        df["turnover"] = df["close"] * 1000 
-    
-    # 거래대금 5일 평균으로 정규화
-    turnover_ma = df["turnover"].rolling(5).mean()
-    df["priv_fund_ratio"] = df["net_priv_fund"] / turnover_ma
-    
-    # 3. 랭크 산출 (0.0 ~ 1.0)
-    df["factor_rank"] = df["priv_fund_ratio"].rolling(window=params.rolling_window).rank(pct=True)
-    
+# 컴팩트 데이터 모델: 매핑된 필드만 + float32 (왕복 상대오차가 COMPACT_RTOL 이내인 컬럼만)
+COMPACT_RTOL = 1e-6
+
+def downcast(values: np.ndarray, rtol: float = COMPACT_RTOL) -> np.ndarray:
+    values = np.asarray(values, dtype="float64")
+    with np.errstate(over="ignore"):
+        compact = values.astype("float32")
+    finite = np.isfinite(values)
+    # float32 범위를 넘거나(inf) 유효숫자가 모자라면 float64 유지
+    if not np.array_equal(np.isfinite(compact), finite): return values
+    err = np.abs(compact[finite] - values[finite])
+    if (err > rtol * np.abs(values[finite])).any(): return values
+    return compact
+
+@instrumented()
+def compact_frame(df: pd.DataFrame, fields=None, rtol: float = COMPACT_RTOL) -> pd.DataFrame:
+    # 사용하지 않는 I31000xxx / object 컬럼을 버리고 필요한 필드만 숫자 배열로
+    fields = [c for c in dict.fromkeys(fields or ITEM_CODE_MAP.values()) if c in df.columns]
+    data = {c: downcast(pd.to_numeric(df[c], errors="coerce").to_numpy(), rtol) for c in fields}
+    return pd.DataFrame(data, index=df.index)
+
+@instrumented()
+def load_dataguide_excel(path: str | Path, use_cache: bool = True, compact: bool = False) -> pd.DataFrame:
+    # 파싱 결과를 database/.cache 에 보관 (원본이 바뀌면 자동 재생성)
+    # 시트 전체를 read_excel 로 올리지 않고 행 단위 스트리밍 (_stream_parse)
+    # compact=True: 매핑된 코드만 읽어 컴팩트 프레임을 따로 캐시 (캐시 적중 시에도 필요한 컬럼만 메모리에 올림)
+    builder = _parse_compact if compact else _parse_dataguide_excel
+    if use_cache:
+        return cached_frame(path, builder, tag="dataguide-compact" if compact else "dataguide")
+    return builder(path)
+
+@instrumented()
+def _parse_dataguide_excel(path: str | Path) -> pd.DataFrame:
+    # 모든 컬럼: Item 코드 컬럼은 숫자로 변환, 코드가 없는 컬럼은 "unknown" 이름의 원본 값(object) 그대로
+    # 주말 제거, 매핑된 코드는 이름 변경
+    return _stream_parse(path, None, drop_weekends=True, rename=True)
+
+def _parse_compact(path: str | Path) -> pd.DataFrame:
+    codes = [normalize_code(c) for c in ITEM_CODE_MAP]
+    return compact_frame(_stream_parse(path, codes, drop_weekends=True, rename=True))
+
+# ==============================================================================
+# 4. 스트리밍 로더 (필요한 컬럼만 한 번에 읽기)
+# ==============================================================================
+@instrumented()
+def stream_dataguide_excel(path: str | Path, columns: list[str] | None = None,
+                           drop_weekends: bool = True, rename: bool = True,
+                           use_cache: bool = True) -> pd.DataFrame:
+    # 기본값: ITEM_CODE_MAP 에 있는 코드만 읽음 (나머지 I31000xxx 컬럼은 건너뜀)
+    codes = [normalize_code(c) for c in (columns or ITEM_CODE_MAP)]
+    if use_cache:
+        key = hashlib.sha1(f"{codes}|{drop_weekends}|{rename}".encode("utf-8")).hexdigest()[:8]
+        return cached_frame(path, lambda p: _stream_parse(p, codes, drop_weekends, rename),
+                            tag=f"stream{key}")
+    return _stream_parse(path, codes, drop_weekends, rename)
+
+def _stream_parse(path: str | Path, codes: list[str] | None, drop_weekends: bool,
+                  rename: bool) -> pd.DataFrame:
+    # codes=None: 시트의 모든 컬럼 (같은 코드가 여러 번 나오면 컬럼도 그대로 중복,
+    #             코드가 없는 컬럼은 예전 로더처럼 "unknown" 이름으로 원본 값 유지)
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = [normalize_code(v) for v in find_item_row(rows)]
+
+        wanted = None if codes is None else set(codes)
+        col_idx = [j for j, code in enumerate(header)
+                   if j > 0 and (wanted is None or code in wanted)]
+        first_row = first_data_row(rows)
+        if first_row is None:
+            dates, values = [], [[] for _ in col_idx]
+        else:
+            dates, values = read_data_block(rows, first_row, col_idx)
+    finally:
+        wb.close()
+
+    index = to_date_index(dates)
+    df = pd.DataFrame({i: pd.Series(to_float_array(v) if header[j] else v, index=index,
+                                    dtype="float64" if header[j] else object)
+                       for i, (j, v) in enumerate(zip(col_idx, values))}, index=index)
+    df.columns = [header[j] or "unknown" for j in col_idx]
+    df = df[df.index.notna()].sort_index()
+
+    if drop_weekends:
+        df = df[df.index.dayofweek < 5]
+    return map_item_codes(df) if rename else df
+
+# ==============================================================================
+# 5. 팩터 백테스트
+# ==============================================================================
+def apply_rank_strategy(df: pd.DataFrame, params: Params) -> pd.DataFrame:
+    # df["factor_rank"], df["gap"] -> position / strategy_ret / strategy_net / equity 컬럼 추가
     # 4. 시그널 생성
     # 매도폭탄(하위 10%) -> Long
     long_signal = df["factor_rank"] < params.buy_threshold
@@ -127,6 +166,31 @@ def run_alpha_factor_testing(df: pd.DataFrame, params: Params) -> tuple:
     
     # 7. 누적 수익
     df["equity"] = (1 + df["strategy_net"].fillna(0)).cumprod()
+    return df
+
+@instrumented()
+@memoized
+def run_alpha_factor_testing(df: pd.DataFrame, params: Params) -> tuple:
+    # gap / 거래대금 평균 / 랭크는 데이터셋별로 캐시 (같은 df 로 반복 실행 시 재사용)
+    store = feature_store(df)
+    # 얕은 복사: 원본 컬럼 배열은 공유하고 파생 컬럼만 새로 붙임 (전체 프레임 복사 없음)
+    df = df.copy(deep=False)
+    
+    # 1. 갭 계산 (Target)
+    df["gap"] = store.get("gap")
+    
+    # 2. 팩터 계산
+    if "turnover" not in df.columns:
+        df["turnover"] = store.get("turnover")
+    
+    # 거래대금 5일 평균으로 정규화
+    df["priv_fund_ratio"] = store.get("priv_fund_ratio")
+    
+    # 3. 랭크 산출 (0.0 ~ 1.0)
+    df["factor_rank"] = store.get(f"factor_rank_{params.rolling_window}")
+    
+    # 4~7. 시그널 -> 포지션 -> 수익률 -> 누적 수익
+    apply_rank_strategy(df, params)
     
     backtest = df[["gap", "priv_fund_ratio", "factor_rank", "position", "strategy_ret", "strategy_net", "equity"]]
     
@@ -0,0 +1,163 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from dataguide_cache import cached_frame
+from dataguide_sheet import (first_data_row, is_item_row, normalize_code, read_data_block, to_date_index,
+                             to_float_array)
+from features import TURNOVER_WINDOW, window_mean
+from overnight_alpha import COMPACT_RTOL, ITEM_CODE_MAP, Params, downcast
+from rolling_rank import rolling_rank_array
+
+# ==============================================================================
+# 1. 패널 (날짜 x 종목) 데이터 로드
+# ==============================================================================
+PANEL_FIELDS = ("open", "close", "turnover", "net_priv_fund")
+EXCEL_SUFFIXES = {".xlsx", ".xlsm"}
+
+def _read_header(rows, limit: int = 50) -> tuple[list, dict]:
+    # Item 행과 그 위의 라벨 행들 (Symbol, Kind 등 첫 칸 이름 -> 행)
+    labels = {}
+    for _, row in zip(range(limit), rows):
+        if is_item_row(row): return list(row), labels
+        if row and isinstance(row[0], str):
+            labels[row[0].strip()] = list(row)
+    raise SystemExit("Item row not found.")
+
+def _parse_panel_sheet(path: Path) -> pd.DataFrame:
+    # 멀티 종목 시트: Item 행 위의 Symbol 행으로 종목을 구분
+    # (Symbol 행이 없으면 파일 이름을 종목 코드로 사용). 컬럼명은 "종목|필드"
+    from openpyxl import load_workbook
+
+    normalized_map = {normalize_code(code): name for code, name in ITEM_CODE_MAP.items()}
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        item_row, labels = _read_header(rows)
+        symbol_row = labels.get("Symbol")
+
+        names, col_idx = [], []
+        for j, value in enumerate(item_row):
+            field = normalized_map.get(normalize_code(value))
+            if j == 0 or field is None: continue
+            symbol = symbol_row[j] if symbol_row and j < len(symbol_row) and symbol_row[j] else path.stem
+            names.append(f"{symbol}|{field}")
+            col_idx.append(j)
+
+        first_row = first_data_row(rows)
+        if first_row is None:
+            dates, values = [], [[] for _ in col_idx]
+        else:
+            dates, values = read_data_block(rows, first_row, col_idx)
+    finally:
+        wb.close()
+
+    df = pd.DataFrame({i: to_float_array(v) for i, v in enumerate(values)}, index=to_date_index(dates))
+    df.columns = names
+    df = df[df.index.notna()].sort_index()
+    return df[df.index.dayofweek < 5]
+
+def _split_fields(flat: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    symbols = flat.columns.str.split("|", n=1).str[0]
+    fields = flat.columns.str.split("|", n=1).str[1]
+    panel = {}
+    for field in dict.fromkeys(fields):
+        block = flat.loc[:, fields == field]
+        block.columns = pd.Index(symbols[fields == field], name="instrument")
+        panel[field] = block.T.groupby(level=0, sort=False).first().T
+    return panel
+
+def compact_panel(panel: dict[str, pd.DataFrame], rtol: float = COMPACT_RTOL) -> dict[str, pd.DataFrame]:
+    # 필드별 (날짜 x 종목) 블록을 float32 로 (정밀도가 허용되는 필드만)
+    return {name: pd.DataFrame(downcast(block.to_numpy(), rtol), index=block.index, columns=block.columns)
+            for name, block in panel.items()}
+
+def load_dataguide_panel(source: str | Path, use_cache: bool = True,
+                         compact: bool = False) -> dict[str, pd.DataFrame]:
+    # source: DataGuide 엑셀 폴더(종목별 파일) 또는 멀티 종목 시트 하나
+    source = Path(source)
+    paths = sorted(p for p in source.iterdir() if p.suffix.lower() in EXCEL_SUFFIXES) \
+        if source.is_dir() else [source]
+    if not paths: raise SystemExit(f"No DataGuide workbooks found in {source}")
+
+    frames = []
+    for path in paths:
+        if use_cache:
+            frames.append(cached_frame(path, _parse_panel_sheet, tag="panel"))
+        else:
+            frames.append(_parse_panel_sheet(path))
+    panel = _split_fields(pd.concat(frames, axis=1).sort_index())
+    return compact_panel(panel) if compact else panel
+
+def build_panel(frames: dict[str, pd.DataFrame], fields=PANEL_FIELDS) -> dict[str, pd.DataFrame]:
+    # {종목: load_dataguide_excel 결과} -> {필드: 날짜 x 종목}
+    panel = {}
+    for field in fields:
+        columns = {name: df[field] for name, df in frames.items() if field in df.columns}
+        if columns:
+            panel[field] = pd.DataFrame(columns).rename_axis(columns="instrument")
+    return panel
+
+# ==============================================================================
+# 2. 패널 백테스트 (종목 루프 없이 2-D 배열 연산)
+# ==============================================================================
+@dataclass
+class PanelResult:
+    gap: pd.DataFrame
+    factor_rank: pd.DataFrame
+    position: pd.DataFrame
+    strategy_net: pd.DataFrame
+    equity: pd.DataFrame
+    portfolio_net: pd.Series
+    portfolio_equity: pd.Series
+
+def run_panel_backtest(panel: dict[str, pd.DataFrame], params: Params) -> PanelResult:
+    close_df = panel["close"]
+    index, columns = close_df.index, close_df.columns
+
+    def field(name: str) -> np.ndarray:
+        return panel[name].reindex(index=index, columns=columns).to_numpy(dtype="float64")
+
+    open_, close = field("open"), close_df.to_numpy(dtype="float64")
+    prev_close = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+
+    # 1. 갭
+    gap = (open_ - prev_close) / prev_close
+
+    # 2. 팩터: 거래대금이 없는 종목은 close*1000 대체 (단일 종목 로직과 동일)
+    turnover = field("turnover") if "turnover" in panel else np.full_like(close, np.nan)
+    missing = np.isnan(turnover).all(axis=0)
+    # to_numpy 결과는 읽기 전용 뷰일 수 있으므로(pandas copy-on-write) 제자리 대입 대신 새 배열
+    turnover = np.where(missing, close * 1000, turnover)
+    turnover_ma = window_mean(turnover, TURNOVER_WINDOW)
+    ratio = field("net_priv_fund") / turnover_ma
+
+    # 3. 랭크 / 시그널 / 포지션
+    rank = rolling_rank_array(ratio, params.rolling_window, pct=True)
+    signal = (rank < params.buy_threshold).astype("float64") - (rank > params.sell_threshold)
+    position = np.zeros_like(signal)
+    position[1:] = signal[:-1]
+
+    # 4. 수익률 / 누적
+    net = position * gap - np.abs(position) * params.cost
+    equity = np.cumprod(1 + np.nan_to_num(net), axis=0)
+
+    # 동일가중 포트폴리오: 그날 활성 종목(전날 랭크가 있고 당일 수익률이 있는 종목)만 평균
+    # 상장 전/상폐 후/랭크 예열 종목은 분모에서 빠짐. 활성 종목이 없는 날은 0
+    ranked = np.zeros_like(rank, dtype=bool)
+    ranked[1:] = ~np.isnan(rank[:-1])
+    active = ranked & ~np.isnan(net)
+    n_active = active.sum(axis=1)
+    portfolio_net = np.where(active, net, 0.0).sum(axis=1) / np.maximum(n_active, 1)
+
+    frame = lambda values: pd.DataFrame(values, index=index, columns=columns)
+    return PanelResult(
+        gap=frame(gap),
+        factor_rank=frame(rank),
+        position=frame(position),
+        strategy_net=frame(net),
+        equity=frame(equity),
+        portfolio_net=pd.Series(portfolio_net, index=index, name="portfolio_net"),
+        portfolio_equity=pd.Series(np.cumprod(1 + portfolio_net), index=index, name="portfolio_equity"),
+    )
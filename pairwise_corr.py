@@ -0,0 +1,88 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# 쌍별 완전 관측(pairwise-complete) 상관 (ic_engine / correlation_engine 공용)
+# ==============================================================================
+# 결측을 0 으로 채운 X0, Y0 와 유효 마스크 Mx, My 로
+#   n = Mx'My,  Σx = X0'My,  Σx² = (X0²)'My,  Σy = Mx'Y0,  Σy² = Mx'(Y0²),  Σxy = X0'Y0
+# (x 의 i 열과 y 의 j 열이 모두 유효한 행만 합산)
+# r = (n Σxy - Σx Σy) / sqrt((n Σx² - (Σx)²)(n Σy² - (Σy)²))
+# 각 컬럼을 전체 평균으로 먼저 빼서 상쇄 오차를 줄임 (상관계수는 평행이동에 불변)
+MIN_OBS = 3
+REFRESH_EVERY = 500   # 롤링 윈도우 합을 처음부터 다시 쌓는 주기 (추가/제거 누적 오차 방지)
+
+def centered(x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # (결측 0 으로 채운 중심화 값, 유효 마스크 float)
+    valid = ~np.isnan(x)
+    with np.errstate(invalid="ignore"):
+        center = np.nanmean(np.where(valid.any(axis=0), x, 0.0), axis=0) if len(x) else np.zeros(x.shape[1])
+    return np.where(valid, x - center, 0.0), valid.astype("float64")
+
+def pairwise_moments(x: np.ndarray, y: np.ndarray | None = None) -> tuple[np.ndarray, ...]:
+    # x (T, F), y (T, G) -> (F, G) 모멘트 n, Σx, Σx², Σy, Σy², Σxy  (y=None 이면 x 자신과)
+    x0, mx = centered(x)
+    y0, my = (x0, mx) if y is None else centered(y)
+    return mx.T @ my, x0.T @ my, (x0 * x0).T @ my, mx.T @ y0, mx.T @ (y0 * y0), x0.T @ y0
+
+def corr_from_moments(n, sx, sxx, sxy, sy=None, syy=None) -> np.ndarray:
+    # sy / syy 를 생략하면 대칭 (x 와 x) 모멘트로 봄
+    sy = sx.T if sy is None else sy
+    syy = sxx.T if syy is None else syy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var_x = n * sxx - sx ** 2
+        var_y = n * syy - sy ** 2
+        r = (n * sxy - sx * sy) / np.sqrt(var_x * var_y)
+    r[(n < MIN_OBS) | (var_x <= 0) | (var_y <= 0)] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+def pearson_cross(x: np.ndarray, y: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    # x (T, F), y (T, G) -> 상관 (F, G), 쌍별 관측 수 (F, G). 행렬곱 한 번씩
+    x = np.asarray(x, dtype="float64")
+    y = None if y is None else np.asarray(y, dtype="float64")
+    n, sx, sxx, sy, syy, sxy = pairwise_moments(x, y)
+    return corr_from_moments(n, sx, sxx, sxy, sy, syy), n
+
+def rank_columns(x: np.ndarray) -> np.ndarray:
+    # 컬럼별 평균 동점 랭크 (결측은 결측 그대로)
+    return pd.DataFrame(x).rank(method="average").to_numpy()
+
+def _mask_groups(valid: np.ndarray) -> list[list[int]]:
+    # 결측 패턴이 같은 컬럼끼리 묶음
+    groups: dict[bytes, list[int]] = {}
+    for j in range(valid.shape[1]):
+        groups.setdefault(np.packbits(valid[:, j]).tobytes(), []).append(j)
+    return list(groups.values())
+
+def spearman_cross(x: np.ndarray, y: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    # 랭크는 쌍의 공통 유효 행 안에서 매겨야 하므로 (scipy spearmanr 과 동일) 결측 패턴이 같은
+    # 컬럼끼리 묶어 패턴 쌍마다 공통 행을 한 번 랭크 -> 블록 상관. 패턴이 모두 같으면 랭크 1번 + 행렬곱 1번
+    x = np.asarray(x, dtype="float64")
+    symmetric = y is None
+    y = x if symmetric else np.asarray(y, dtype="float64")
+    valid_x, valid_y = ~np.isnan(x), ~np.isnan(y)
+    groups_x, groups_y = _mask_groups(valid_x), _mask_groups(valid_y)
+
+    r = np.full((x.shape[1], y.shape[1]), np.nan)
+    n = np.zeros_like(r)
+    for a, cols_a in enumerate(groups_x):
+        for cols_b in groups_y[a:] if symmetric else groups_y:
+            rows = valid_x[:, cols_a[0]] & valid_y[:, cols_b[0]]
+            sub, sub_n = pearson_cross(rank_columns(x[rows][:, cols_a]), rank_columns(y[rows][:, cols_b]))
+            r[np.ix_(cols_a, cols_b)], n[np.ix_(cols_a, cols_b)] = sub, sub_n
+            if symmetric:
+                r[np.ix_(cols_b, cols_a)], n[np.ix_(cols_b, cols_a)] = sub.T, sub_n.T
+    return r, n
+
+def window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    # 윈도우 합 (T, F). 누적합은 REFRESH_EVERY 행마다 윈도우 시작점부터 새로 쌓음
+    # (전체 이력 누적합의 차이는 이력이 길수록 상쇄 오차가 커짐)
+    out = np.full(values.shape, np.nan)
+    for lo in range(window - 1, len(values), REFRESH_EVERY):
+        hi = min(lo + REFRESH_EVERY, len(values))
+        cum = np.cumsum(values[lo - window + 1:hi], axis=0)
+        block = cum[window - 1:].copy()
+        block[1:] -= cum[:len(block) - 1]
+        out[lo:hi] = block
+    return out
@@ -0,0 +1,88 @@
+from __future__ import annotations
+from itertools import product
+import numpy as np
+import pandas as pd
+from kpi import summarize
+from features import feature_store
+from result_cache import memoized
+from rolling_rank import rolling_rank_array
+from overnight_alpha import Params
+
+# ==============================================================================
+# 파라미터 스윕 (윈도우별 랭크 1회 계산 -> 임계값/비용 조합은 행렬로 브로드캐스트)
+# ==============================================================================
+# 한 번에 만드는 (T, 매수 임계값 묶음 x 매도 x 비용) 블록의 최대 원소 수
+# 블록마다 같은 크기의 float64 배열 ~4개(수익/순수익/포지션/KPI 임시)가 생기므로
+# 최대 메모리 ~ 4 x 8B x MAX_BLOCK_CELLS (기본 2^22 -> ~128MB). 매수 임계값 축을 나눠 처리
+# (매수 임계값 1개짜리 블록 T x 매도 x 비용 이 상한보다 크면 그 크기가 최소 단위)
+MAX_BLOCK_CELLS = 1 << 22
+
+def _shift_down(values: np.ndarray) -> np.ndarray:
+    # pandas .shift(1).fillna(0) 과 동일 (axis 0)
+    out = np.zeros_like(values)
+    out[1:] = values[:-1]
+    return out
+
+def _window_block(rank: np.ndarray, gap: np.ndarray, buys: np.ndarray, sells: np.ndarray,
+                  costs: np.ndarray, mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # (T, nb, ns) 포지션 -> (T, K) 로 펼침
+    long_signal = (rank[:, None] < buys[None, :]).astype("float64")
+    short_signal = (rank[:, None] > sells[None, :]).astype("float64")
+    signal = long_signal[:, :, None] - short_signal[:, None, :]
+    position = _shift_down(signal.reshape(len(rank), -1))[mask]
+
+    # 비용 축까지 브로드캐스트: (T, K, nc) -> (T, K*nc)
+    strategy_ret = position * gap[mask, None]
+    net = strategy_ret[:, :, None] - np.abs(position)[:, :, None] * costs[None, None, :]
+    net = net.reshape(len(position), -1)
+    position = np.repeat(position, len(costs), axis=1)
+    return net, position
+
+@memoized
+def run_param_sweep(df: pd.DataFrame, rolling_windows, buy_thresholds, sell_thresholds,
+                    costs=(Params.cost,), start=None, factor=None) -> pd.DataFrame:
+    # factor: priv_fund_ratio 대신 랭크할 팩터 (예: flow_ridge.composite_factor), 낮을수록 매수
+    store = feature_store(df)
+    gap = store.get("gap").to_numpy(dtype="float64")
+    buys = np.asarray(buy_thresholds, dtype="float64")
+    sells = np.asarray(sell_thresholds, dtype="float64")
+    costs = np.asarray(costs, dtype="float64")
+
+    # start 이전 구간은 랭크 예열에만 쓰고 성과 집계에서는 제외
+    mask = np.ones(len(df), dtype=bool) if start is None else np.asarray(df.index >= start)
+
+    frames = []
+    for window in dict.fromkeys(int(w) for w in rolling_windows):
+        if factor is None:
+            rank = store.get(f"factor_rank_{window}").to_numpy(dtype="float64")
+        else:
+            rank = rolling_rank_array(np.asarray(factor, dtype="float64"), window, pct=True)
+        # 매수 임계값이 가장 바깥 축이므로 묶음별 결과를 이어 붙이면 product 순서 그대로
+        step = max(1, MAX_BLOCK_CELLS // max(1, len(gap) * len(sells) * len(costs)))
+        for lo in range(0, len(buys), step):
+            chunk = buys[lo:lo + step]
+            net, position = _window_block(rank, gap, chunk, sells, costs, mask)
+            stats = summarize(net, position)
+
+            grid = pd.DataFrame(list(product(chunk, sells, costs)),
+                                columns=["buy_threshold", "sell_threshold", "cost"])
+            grid.insert(0, "rolling_window", window)
+            for name, values in stats.items():
+                grid[name] = values
+            frames.append(grid)
+
+    return pd.concat(frames, ignore_index=True)
+
+def best_params(results: pd.DataFrame, by: str = "sharpe") -> Params:
+    # 모든 조합의 점수가 NaN (데이터가 짧거나 포지션이 전부 0) 이면 고를 수 없음
+    scores = results[by]
+    if scores.notna().sum() == 0:
+        raise ValueError(f"No valid '{by}' in the sweep results ({len(results)} combinations); "
+                         "the sample is too short or every combination stays flat.")
+    row = results.loc[scores.idxmax()]
+    return Params(
+        rolling_window=int(row["rolling_window"]),
+        buy_threshold=float(row["buy_threshold"]),
+        sell_threshold=float(row["sell_threshold"]),
+        cost=float(row["cost"]),
+    )
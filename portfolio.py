@@ -0,0 +1,113 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from kpi import TRADING_DAYS, cagr, equity_curves, max_drawdown, sharpe_ratio, total_return, trade_count, win_rate
+from overnight_alpha import Params
+
+# ==============================================================================
+# 1. 사이징 (결정일 T 기준 목표 비중, 열 = 전략 변형)
+# ==============================================================================
+# 모든 함수는 (T,) 또는 (T, N) 을 받아 (T, N) 비중을 돌려줌. 포지션은 run_portfolio 에서 lag 만큼 밀어서 적용
+COST_BASES = ("turnover", "position")
+DEFAULT_VOL_WINDOW = 20
+
+def _as_matrix(values) -> tuple[np.ndarray, pd.Index | None, list | None]:
+    if isinstance(values, pd.DataFrame):
+        return values.to_numpy(dtype="float64"), values.index, list(values.columns)
+    if isinstance(values, pd.Series):
+        return values.to_numpy(dtype="float64")[:, None], values.index, [values.name or 0]
+    arr = np.asarray(values, dtype="float64")
+    return (arr[:, None] if arr.ndim == 1 else arr), None, None
+
+def _shift(values: np.ndarray, lag: int) -> np.ndarray:
+    # pandas .shift(lag).fillna(0) 과 동일 (axis 0)
+    out = np.zeros_like(values)
+    if lag == 0: out[:] = values
+    elif lag < len(values): out[lag:] = values[:-lag]
+    return np.nan_to_num(out)
+
+def rank_score(rank):
+    # 랭크(0~1) -> 연속 점수(+1 ~ -1): 하위 분위일수록 매수 (기존 임계값 규칙과 같은 방향)
+    return 1.0 - 2.0 * rank
+
+def threshold_weights(rank, buy_threshold: float = Params.buy_threshold,
+                      sell_threshold: float = Params.sell_threshold) -> np.ndarray:
+    # run_alpha_factor_testing 의 -1/0/+1 시그널 (결측 랭크 = 0)
+    rank, _, _ = _as_matrix(rank)
+    return (rank < buy_threshold).astype("float64") - (rank > sell_threshold)
+
+def proportional_weights(signal, scale: float = 1.0, max_leverage: float = 1.0) -> np.ndarray:
+    # 시그널 비례 비중: signal / scale 을 ±max_leverage 로 자름 (결측 = 0)
+    signal, _, _ = _as_matrix(signal)
+    return np.clip(np.nan_to_num(signal / scale), -max_leverage, max_leverage)
+
+def vol_target_weights(signal, returns, target_vol: float = 0.10, window: int = DEFAULT_VOL_WINDOW,
+                       max_leverage: float = 2.0, periods: int = TRADING_DAYS) -> np.ndarray:
+    # 변동성 타기팅: clip(signal, ±1) * target_vol / 연환산 실현 변동성(T일까지 window 일)
+    signal, _, _ = _as_matrix(signal)
+    returns, _, _ = _as_matrix(returns)
+    vol = pd.DataFrame(returns).rolling(window).std().to_numpy() * np.sqrt(periods)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        leverage = np.where(vol > 0, np.minimum(target_vol / vol, max_leverage), 0.0)
+    return np.clip(np.nan_to_num(signal), -1.0, 1.0) * np.nan_to_num(leverage)
+
+# ==============================================================================
+# 2. 회계 (포지션 -> 회전율 비용 -> 순수익 -> 자산 곡선, 전략 N개 동시)
+# ==============================================================================
+@dataclass
+class PortfolioResult:
+    position: pd.DataFrame       # (T, N) 보유 비중
+    turnover: pd.DataFrame       # |Δposition| (cost_basis="position" 이면 |position|)
+    net: pd.DataFrame            # 비용 차감 일별 수익률
+    equity: pd.DataFrame         # 1 에서 시작한 누적 자산
+
+    def kpis(self, periods: int = TRADING_DAYS) -> pd.DataFrame:
+        # analysis/result.py 와 같은 정의를 전략(열)별로 한 번에
+        net = self.net.to_numpy()
+        position = self.position.to_numpy()
+        equity = self.equity.to_numpy()
+        index = self.net.index
+        days = (index[-1] - index[0]).days if isinstance(index, pd.DatetimeIndex) and len(index) else len(index)
+        return pd.DataFrame({
+            "total_return": total_return(equity),
+            "cagr": cagr(equity, days),
+            "mdd": max_drawdown(equity),
+            "sharpe": sharpe_ratio(net, periods),
+            "win_rate": win_rate(net, position),
+            "trades": trade_count(position),
+            "turnover": self.turnover.to_numpy().mean(axis=0),   # 일평균
+            "exposure": np.abs(position).mean(axis=0),
+        }, index=self.net.columns)
+
+    def combine(self, weights=None) -> pd.Series:
+        # 전략 간 배분 (기본 동일가중, 매일 리밸런싱) -> 포트폴리오 일별 순수익
+        weights = np.full(self.net.shape[1], 1 / self.net.shape[1]) if weights is None \
+            else np.asarray(weights, dtype="float64")
+        return pd.Series(np.nan_to_num(self.net.to_numpy()) @ weights, index=self.net.index,
+                         name="portfolio_net")
+
+def run_portfolio(weights, returns, cost: float = Params.cost, cost_basis: str = "turnover",
+                  lag: int = 1, start=None, names=None) -> PortfolioResult:
+    # weights (T, N): 결정일 T 목표 비중 -> lag 일 뒤 보유 (기본 1: 오늘 장마감 판단 -> 내일 시가 갭)
+    # returns (T,) 또는 (T, N): 보유일 수익률 (예: gap)
+    # cost_basis="turnover": 비중 변화량에만 비용, "position": 기존처럼 매일 |position| 에 비용
+    # start: 이 날짜 이전은 예열 구간으로 잘라내고 자산 곡선을 1 부터 다시 시작
+    if cost_basis not in COST_BASES: raise ValueError(f"cost_basis must be one of {COST_BASES}")
+    weights, index, columns = _as_matrix(weights)
+    returns, ret_index, _ = _as_matrix(returns)
+    index = index if index is not None else ret_index
+    if index is None: index = pd.RangeIndex(len(weights))
+    columns = list(names) if names is not None else columns or list(range(weights.shape[1]))
+
+    position = _shift(weights, lag)
+    previous = np.vstack([np.zeros((1, position.shape[1])), position[:-1]])
+    turnover = np.abs(position - previous) if cost_basis == "turnover" else np.abs(position)
+    net = position * returns - turnover * cost
+
+    if start is not None:
+        keep = np.asarray(index >= start)
+        position, turnover, net, index = position[keep], turnover[keep], net[keep], index[keep]
+
+    frame = lambda values: pd.DataFrame(values, index=index, columns=columns)
+    return PortfolioResult(frame(position), frame(turnover), frame(net), frame(equity_curves(net)))
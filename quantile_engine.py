@@ -0,0 +1,154 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+import json
+import numpy as np
+import pandas as pd
+from result_cache import memoized
+from rolling_rank import rolling_rank_array
+
+# ==============================================================================
+# 1. 분위 배정 (컬럼당 정렬 한 번)
+# ==============================================================================
+DEFAULT_BINS = 10
+STATS = ("count", "mean", "std", "t_stat", "hit_rate")
+DUPLICATES = ("raise", "drop")
+
+def quantile_probs(n_bins: int) -> np.ndarray:
+    # 0, 1/n, ..., 1 을 12자리로 반올림 (linspace 의 0.7000000000000001 같은 마지막 비트 오차 제거)
+    # -> 경계값과 같은 관측치의 구간이 pandas / numpy 버전의 확률 처리에 따라 바뀌지 않음
+    return np.round(np.linspace(0, 1, n_bins + 1), 12)
+
+def _lerp(a: np.ndarray, b: np.ndarray, t: np.ndarray) -> np.ndarray:
+    # np.quantile(method="linear") 과 같은 보간식
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+
+def sample_edges(x: np.ndarray, n_bins: int = DEFAULT_BINS) -> np.ndarray:
+    # x (T, F) -> 컬럼별 분위 경계 (n_bins + 1, F). 결측 제외 np.quantile(quantile_probs(n_bins))
+    # 과 비트 단위로 같음 (정렬 한 번 + 선형 보간)
+    x = np.asarray(x, dtype="float64")
+    n_valid = (~np.isnan(x)).sum(axis=0)
+    ordered = np.sort(x, axis=0)                    # 결측은 뒤로
+    pos = quantile_probs(n_bins)[:, None] * np.maximum(n_valid - 1, 0)[None, :]
+    lo = np.floor(pos).astype(int)
+    hi = np.minimum(lo + 1, np.maximum(n_valid - 1, 0)[None, :])
+    cols = np.arange(x.shape[1])[None, :]
+    return _lerp(ordered[lo, cols], ordered[hi, cols], pos - lo)
+
+def full_sample_bins(x: np.ndarray, n_bins: int = DEFAULT_BINS, duplicates: str = "raise") -> np.ndarray:
+    # x (T, F) -> 분위 번호 (T, F), 결측은 -1. pd.qcut(labels=False) 처럼 (e_i, e_i+1] 구간
+    # 동점이 많아 경계가 겹치면 pd.qcut 처럼 ValueError
+    # (duplicates="drop": 그 컬럼만 겹친 경계를 빼고 구간 수를 줄임 -> 높은 분위 번호는 비어 있음)
+    if duplicates not in DUPLICATES:
+        raise ValueError(f"invalid value for 'duplicates' parameter, valid options are: {', '.join(DUPLICATES)}")
+    x = np.asarray(x, dtype="float64")
+    n_valid = (~np.isnan(x)).sum(axis=0)
+    edges = sample_edges(x, n_bins)
+    repeated = (np.diff(edges, axis=0) == 0).any(axis=0) & (n_valid > 0)
+    if repeated.any() and duplicates == "raise":
+        raise ValueError(f"Bin edges must be unique: {edges[:, repeated.argmax()]!r}.\n"
+                         "You can drop duplicate edges by setting the 'duplicates' kwarg")
+
+    # (e_i, e_i+1] 구간 = 내부 경계보다 큰 개수
+    bins = (x[:, :, None] > edges[1:-1].T[None, :, :]).sum(axis=2)
+    for j in np.flatnonzero(repeated):
+        unique = np.unique(edges[:, j])
+        bins[:, j] = (x[:, j, None] > unique[None, 1:-1]).sum(axis=1)
+    return np.where(np.isnan(x) | (n_valid == 0)[None, :], -1, bins)
+
+def rolling_bins(x: np.ndarray, n_bins: int = DEFAULT_BINS, window: int = 250,
+                 min_periods: int | None = None) -> np.ndarray:
+    # 과거 window 일 안에서의 백분위 랭크로 분위 배정 (T일 값까지만 사용 -> lookahead 없음)
+    pct = rolling_rank_array(np.asarray(x, dtype="float64"), window, min_periods, pct=True)
+    if pct.ndim == 1: pct = pct[:, None]
+    bins = np.clip(np.ceil(pct * n_bins) - 1, 0, n_bins - 1)
+    return np.where(np.isnan(pct), -1, bins).astype(int)
+
+def assign_bins(factors: pd.DataFrame, n_bins: int = DEFAULT_BINS, window: int | None = None,
+                min_periods: int | None = None, duplicates: str = "raise") -> pd.DataFrame:
+    x = factors.to_numpy(dtype="float64")
+    bins = full_sample_bins(x, n_bins, duplicates) if window is None else rolling_bins(x, n_bins, window, min_periods)
+    return pd.DataFrame(bins, index=factors.index, columns=factors.columns)
+
+# ==============================================================================
+# 2. 팩터 x 타깃 x 분위 통계 (bincount 한 번씩)
+# ==============================================================================
+def _cell_stats(bins: np.ndarray, y: np.ndarray, n_bins: int) -> np.ndarray:
+    n_factors, n_targets = bins.shape[1], y.shape[1]
+    valid = (bins[:, :, None] >= 0) & ~np.isnan(y)[:, None, :]                    # (T, F, G)
+    cell = (np.arange(n_factors)[:, None] * n_targets + np.arange(n_targets)[None, :]) * n_bins
+    idx = (cell[None, :, :] + bins[:, :, None])[valid]
+    values = np.broadcast_to(y[:, None, :], valid.shape)[valid]
+    size = n_factors * n_targets * n_bins
+
+    count = np.bincount(idx, minlength=size).astype("float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.bincount(idx, values, size) / count
+        # 두 번째 패스: 평균 제거 후 제곱합 (합/제곱합 공식의 상쇄 오차 방지)
+        ss = np.bincount(idx, (values - mean[idx]) ** 2, size)
+        std = np.where(count > 1, np.sqrt(ss / (count - 1)), np.nan)
+        t_stat = np.where(std > 0, mean / (std / np.sqrt(count)), np.nan)
+        hit_rate = np.bincount(idx, (values > 0).astype("float64"), size) / count
+
+    stats = np.stack([count, mean, std, t_stat, hit_rate], axis=-1)
+    return stats.reshape(n_factors, n_targets, n_bins, len(STATS))
+
+@dataclass
+class QuantileResult:
+    factors: list[str]
+    targets: list[str]
+    n_bins: int
+    stats: np.ndarray            # (팩터, 타깃, 분위, STATS)
+    window: int | None = None    # None = 전체 표본 분위, 정수 = 롤링 분위
+
+    def stat(self, name: str) -> np.ndarray:
+        return self.stats[..., STATS.index(name)]
+
+    def table(self, target: str, stat: str = "mean") -> pd.DataFrame:
+        # 팩터 x 분위 표 (분위 0 = 가장 낮은 팩터 값)
+        values = self.stat(stat)[:, self.targets.index(target), :]
+        return pd.DataFrame(values, index=pd.Index(self.factors, name="factor"),
+                            columns=pd.RangeIndex(self.n_bins, name="bin"))
+
+    def to_frame(self) -> pd.DataFrame:
+        index = pd.MultiIndex.from_product([self.factors, self.targets, range(self.n_bins)],
+                                           names=["factor", "target", "bin"])
+        return pd.DataFrame(self.stats.reshape(-1, len(STATS)), index=index, columns=list(STATS))
+
+    def spread(self) -> pd.DataFrame:
+        # 최상위 - 최하위 분위 평균 차이와 Welch t
+        top, bottom = self.stats[:, :, -1, :], self.stats[:, :, 0, :]
+        n1, m1, s1 = (top[..., STATS.index(k)] for k in ("count", "mean", "std"))
+        n0, m0, s0 = (bottom[..., STATS.index(k)] for k in ("count", "mean", "std"))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = (m1 - m0) / np.sqrt(s1 ** 2 / n1 + s0 ** 2 / n0)
+        index = pd.MultiIndex.from_product([self.factors, self.targets], names=["factor", "target"])
+        return pd.DataFrame({"spread": (m1 - m0).ravel(), "spread_t": t.ravel()}, index=index)
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {"factors": self.factors, "targets": self.targets, "n_bins": self.n_bins,
+                "window": self.window, "stats": list(STATS)}
+        np.savez_compressed(path, stats=self.stats,
+                            meta=np.frombuffer(json.dumps(meta, ensure_ascii=False).encode("utf-8"),
+                                               dtype=np.uint8))
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "QuantileResult":
+        with np.load(path, allow_pickle=False) as store:
+            meta = json.loads(store["meta"].tobytes().decode("utf-8"))
+            return cls(meta["factors"], meta["targets"], meta["n_bins"], store["stats"], meta["window"])
+
+@memoized
+def quantile_analysis(factors: pd.DataFrame, targets: pd.DataFrame, n_bins: int = DEFAULT_BINS,
+                      window: int | None = None, min_periods: int | None = None,
+                      duplicates: str = "raise") -> QuantileResult:
+    # 모든 팩터 x 모든 타깃 x 분위의 평균 / 적중률(> 0) / t-stat
+    targets = targets.reindex(factors.index)
+    bins = assign_bins(factors, n_bins, window, min_periods, duplicates).to_numpy()
+    stats = _cell_stats(bins, targets.to_numpy(dtype="float64"), n_bins)
+    return QuantileResult([str(c) for c in factors.columns], [str(c) for c in targets.columns],
+                          n_bins, stats, window)
@@ -0,0 +1,296 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from dataclasses import fields, is_dataclass
+from functools import wraps
+from pathlib import Path
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import warnings
+import numpy as np
+import pandas as pd
+import dataguide_cache
+from dataguide_cache import code_fingerprint, to_storable
+
+# ==============================================================================
+# 1. 캐시 설정
+# ==============================================================================
+# 백테스트/분석 결과를 (데이터 지문, 인자(Params 포함), 코드 버전) 키로 .npz 한 파일씩 저장
+# 기본은 비활성: @memoized 함수는 원래 함수를 그대로 호출. enable() / caching() 으로 켬
+# 용량 상한을 넘으면 가장 오래 안 쓴 항목부터 삭제 (LRU, 적중 시 파일 수정시각 갱신)
+# 코드 버전 = 함수가 정의된 모듈과 그 모듈의 프로젝트 import 폐포 전체 소스 해시 (dataguide_cache.code_fingerprint)
+CACHE_VERSION = 1
+MAX_CACHE_MB = 512
+
+_ACTIVE: "ResultCache | None" = None
+_MISS = object()   # 캐시 없음 표시 (None 을 돌려주는 함수의 결과도 캐시하기 위해 None 과 구분)
+
+# ==============================================================================
+# 2. 키 (데이터 지문 / 인자 토큰 / 코드 버전)
+# ==============================================================================
+def frame_fingerprint(obj: pd.DataFrame | pd.Series) -> str:
+    # 값 + 인덱스 + 컬럼 이름/dtype 해시. 호출마다 다시 계산 (같은 객체라도 제자리 수정을 놓치지 않음)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    columns = obj.columns if isinstance(obj, pd.DataFrame) else [obj.name]
+    dtypes = obj.dtypes.astype(str).tolist() if isinstance(obj, pd.DataFrame) else [str(obj.dtype)]
+    digest.update(json.dumps([list(map(str, columns)), dtypes, len(obj)]).encode("utf-8"))
+    return digest.hexdigest()
+
+def _token(value):
+    # 인자 -> JSON 으로 직렬화 가능한 키 조각 (지원하지 않는 타입은 TypeError -> 캐시 우회)
+    if value is None or isinstance(value, (bool, int, str)): return value
+    if isinstance(value, float): return repr(value)
+    if isinstance(value, np.generic): return _token(value.item())
+    if isinstance(value, (pd.DataFrame, pd.Series)): return {"frame": frame_fingerprint(value)}
+    if isinstance(value, np.ndarray):
+        if value.dtype == object: raise TypeError("object arrays are not cacheable")
+        digest = hashlib.blake2b(np.ascontiguousarray(value).tobytes(), digest_size=16).hexdigest()
+        return {"array": digest, "shape": list(value.shape), "dtype": str(value.dtype)}
+    if is_dataclass(value) and not isinstance(value, type):
+        return {"type": f"{type(value).__module__}.{type(value).__qualname__}",
+                "fields": {f.name: _token(getattr(value, f.name)) for f in fields(value)}}
+    if isinstance(value, (list, tuple, range)): return [_token(v) for v in value]
+    if isinstance(value, dict): return [[_token(k), _token(v)] for k, v in value.items()]
+    raise TypeError(f"Cannot build a cache key from {type(value).__name__}")
+
+def call_key(func, args: tuple, kwargs: dict) -> str:
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()   # 기본값을 명시한 호출과 생략한 호출이 같은 키
+    payload = {
+        "version": CACHE_VERSION,
+        "func": f"{func.__module__}.{func.__qualname__}",
+        "code": code_fingerprint(func),
+        "args": {name: _token(value) for name, value in bound.arguments.items()},
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+# ==============================================================================
+# 3. 결과 직렬화 (DataFrame / Series / ndarray / dataclass / tuple / dict / 스칼라)
+# ==============================================================================
+def _pack_array(values: np.ndarray, arrays: dict) -> str:
+    key = f"a{len(arrays):04d}"
+    arrays[key] = values
+    return key
+
+def _pack_column(col: pd.Series, arrays: dict) -> dict:
+    if isinstance(col.dtype, pd.DatetimeTZDtype) or col.dtype.kind == "M":
+        return {"key": _pack_array(col.to_numpy(dtype="datetime64[ns]"), arrays), "kind": "datetime",
+                "tz": str(col.dt.tz) if col.dt.tz is not None else None}
+    if col.dtype.kind not in "biufcm":
+        col = col.astype(object)
+    values, kind = to_storable(col)
+    return {"key": _pack_array(values, arrays), "kind": kind}
+
+def _unpack_column(spec: dict, store) -> np.ndarray | pd.Series:
+    values = store[spec["key"]]
+    if spec["kind"] == "str":
+        return pd.Series(values, dtype=object).replace("", None).to_numpy()
+    if spec["kind"] == "datetime" and spec.get("tz"):
+        return pd.DatetimeIndex(values).tz_localize("UTC").tz_convert(spec["tz"])
+    return values
+
+def _pack_index(index: pd.Index, arrays: dict) -> dict:
+    if isinstance(index, pd.MultiIndex):
+        return {"t": "multi", "names": [_label(n) for n in index.names],
+                "levels": [_pack_index(index.get_level_values(i), arrays) for i in range(index.nlevels)]}
+    if isinstance(index, pd.RangeIndex):
+        return {"t": "range", "name": _label(index.name), "range": [index.start, index.stop, index.step]}
+    return {"t": "index", "name": _label(index.name), **_pack_column(index.to_series(), arrays)}
+
+def _unpack_index(spec: dict, store) -> pd.Index:
+    if spec["t"] == "multi":
+        levels = [_unpack_index(level, store) for level in spec["levels"]]
+        return pd.MultiIndex.from_arrays(levels, names=[_unlabel(n) for n in spec["names"]])
+    if spec["t"] == "range":
+        return pd.RangeIndex(*spec["range"], name=_unlabel(spec["name"]))
+    return pd.Index(_unpack_column(spec, store), name=_unlabel(spec["name"]))
+
+def _label(value):
+    # 컬럼/인덱스 이름, dict 키 -> JSON 값 (튜플은 리스트로 저장 후 복원)
+    if isinstance(value, np.generic): return value.item()
+    if isinstance(value, tuple): return [_label(v) for v in value]
+    if value is None or isinstance(value, (bool, int, float, str)): return value
+    return str(value)
+
+def _unlabel(value):
+    return tuple(_unlabel(v) for v in value) if isinstance(value, list) else value
+
+def _pack(obj, arrays: dict) -> dict:
+    if isinstance(obj, pd.DataFrame):
+        return {"t": "frame", "index": _pack_index(obj.index, arrays),
+                "names": [_label(c) for c in obj.columns],
+                "columns": [_pack_column(obj.iloc[:, i], arrays) for i in range(obj.shape[1])]}
+    if isinstance(obj, pd.Series):
+        return {"t": "series", "index": _pack_index(obj.index, arrays), "name": _label(obj.name),
+                **_pack_column(obj, arrays)}
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == object: raise TypeError("object arrays are not cacheable")
+        return {"t": "array", "key": _pack_array(obj, arrays)}
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {"t": "dataclass", "cls": [type(obj).__module__, type(obj).__qualname__],
+                "fields": {f.name: _pack(getattr(obj, f.name), arrays) for f in fields(obj)}}
+    if isinstance(obj, (tuple, list)):
+        return {"t": type(obj).__name__, "items": [_pack(v, arrays) for v in obj]}
+    if isinstance(obj, dict):
+        return {"t": "dict", "items": [[_label(k), _pack(v, arrays)] for k, v in obj.items()]}
+    if isinstance(obj, np.generic): obj = obj.item()
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return {"t": "value", "v": obj}
+    raise TypeError(f"Cannot cache a result of type {type(obj).__name__}")
+
+def _unpack(spec: dict, store):
+    kind = spec["t"]
+    if kind == "frame":
+        data = {i: _unpack_column(col, store) for i, col in enumerate(spec["columns"])}
+        frame = pd.DataFrame(data, index=_unpack_index(spec["index"], store))
+        frame.columns = [_unlabel(n) for n in spec["names"]]
+        return frame
+    if kind == "series":
+        return pd.Series(_unpack_column(spec, store), index=_unpack_index(spec["index"], store),
+                         name=_unlabel(spec["name"]))
+    if kind == "array":
+        return store[spec["key"]]
+    if kind == "dataclass":
+        cls = importlib.import_module(spec["cls"][0])
+        for part in spec["cls"][1].split("."):
+            cls = getattr(cls, part)
+        return cls(**{name: _unpack(value, store) for name, value in spec["fields"].items()})
+    if kind in ("tuple", "list"):
+        items = [_unpack(v, store) for v in spec["items"]]
+        return tuple(items) if kind == "tuple" else items
+    if kind == "dict":
+        return {_unlabel(k): _unpack(v, store) for k, v in spec["items"]}
+    return spec["v"]
+
+# ==============================================================================
+# 4. 디스크 캐시 (LRU)
+# ==============================================================================
+class ResultCache:
+    def __init__(self, cache_dir: str | Path | None = None, max_mb: float = MAX_CACHE_MB):
+        # cache_dir 기본값: dataguide_cache.CACHE_DIR / "results" (호출 시점 기준)
+        self.cache_dir = Path(cache_dir) if cache_dir else dataguide_cache.CACHE_DIR / "results"
+        self.max_bytes = int(max_mb * 2 ** 20)
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def get(self, key: str, default=None):
+        # 없거나 읽을 수 없으면 default (저장된 결과가 None 일 수 있으므로 memoized 는 _MISS 를 넘김)
+        path = self.path(key)
+        try:
+            with np.load(path, allow_pickle=False) as store:
+                meta = json.loads(store["__meta__"].tobytes().decode("utf-8"))
+                if meta.get("version") != CACHE_VERSION: return default
+                result = _unpack(meta["result"], store)
+        except (OSError, ValueError, KeyError):
+            return default
+        os.utime(path)   # LRU: 최근 사용 시각 갱신
+        return result
+
+    def put(self, key: str, result, label: str = "") -> Path:
+        arrays: dict[str, np.ndarray] = {}
+        meta = {"version": CACHE_VERSION, "func": label, "result": _pack(result, arrays)}
+        arrays["__meta__"] = np.frombuffer(json.dumps(meta, ensure_ascii=False).encode("utf-8"),
+                                           dtype=np.uint8)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(key)
+        tmp = path.with_name(f"{key}.{os.getpid()}.tmp.npz")
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, path)
+        self.evict(keep=path)
+        return path
+
+    def entries(self) -> list[tuple[Path, os.stat_result]]:
+        if not self.cache_dir.exists(): return []
+        stats = []
+        for path in self.cache_dir.glob("*.npz"):
+            if path.name.endswith(".tmp.npz"): continue
+            try:
+                stats.append((path, path.stat()))
+            except FileNotFoundError:
+                continue
+        return sorted(stats, key=lambda item: item[1].st_mtime_ns)   # 오래 안 쓴 순
+
+    def evict(self, keep: Path | None = None) -> int:
+        # 용량 상한까지 가장 오래 안 쓴 항목부터 삭제 (방금 쓴 항목은 유지)
+        entries = self.entries()
+        total = sum(stat.st_size for _, stat in entries)
+        removed = 0
+        for path, stat in entries:
+            if total <= self.max_bytes: break
+            if path == keep: continue
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+            removed += 1
+        return removed
+
+    def info(self) -> pd.DataFrame:
+        rows = [{"key": path.stem, "size_kb": stat.st_size / 1024,
+                 "last_used": pd.Timestamp(stat.st_mtime_ns, unit="ns")} for path, stat in self.entries()]
+        return pd.DataFrame(rows, columns=["key", "size_kb", "last_used"])
+
+    def clear(self) -> None:
+        for path, _ in self.entries():
+            path.unlink(missing_ok=True)
+
+# ==============================================================================
+# 5. 훅
+# ==============================================================================
+def active() -> ResultCache | None:
+    return _ACTIVE
+
+def enable(cache_dir: str | Path | None = None, max_mb: float = MAX_CACHE_MB) -> ResultCache:
+    global _ACTIVE
+    _ACTIVE = ResultCache(cache_dir, max_mb)
+    return _ACTIVE
+
+def disable() -> ResultCache | None:
+    global _ACTIVE
+    cache, _ACTIVE = _ACTIVE, None
+    return cache
+
+@contextmanager
+def caching(cache_dir: str | Path | None = None, max_mb: float = MAX_CACHE_MB):
+    global _ACTIVE
+    previous = _ACTIVE
+    cache = enable(cache_dir, max_mb)
+    try:
+        yield cache
+    finally:
+        _ACTIVE = previous
+
+def memoized(func):
+    # 활성 캐시가 있으면 (데이터 지문, 인자, 코드 버전) 키로 결과를 재사용
+    label = f"{func.__module__}.{func.__qualname__}"
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = _ACTIVE
+        if cache is None:
+            return func(*args, **kwargs)
+        try:
+            key = call_key(func, args, kwargs)
+        except TypeError as exc:
+            warnings.warn(f"{label}: result cache bypassed ({exc})", RuntimeWarning, stacklevel=2)
+            return func(*args, **kwargs)
+
+        result = cache.get(key, _MISS)
+        if result is not _MISS:
+            cache.hits += 1
+            return result
+        cache.misses += 1
+        result = func(*args, **kwargs)
+        try:
+            cache.put(key, result, label)
+        except TypeError as exc:
+            warnings.warn(f"{label}: result not cached ({exc})", RuntimeWarning, stacklevel=2)
+            return result
+        # 적중 시와 같은 dtype 을 돌려주기 위해 저장본을 다시 읽음 (dataguide_cache 와 동일)
+        stored = cache.get(key, _MISS)
+        return result if stored is _MISS else stored
+    return wrapper
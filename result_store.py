@@ -0,0 +1,93 @@
+from __future__ import annotations
+from datetime import datetime
+from pathlib import Path
+import json
+import numpy as np
+import pandas as pd
+from instrumentation import instrumented
+
+# ==============================================================================
+# 결과 저장소 (압축 컬럼 저장 + 스키마/메타데이터, 필요한 컬럼만 로드)
+# ==============================================================================
+# database/results.npz 하나에 features 프레임 전체를 저장합니다.
+# (백테스트 컬럼은 features 의 부분집합이라 따로 저장하지 않음)
+# npz 는 멤버 단위로 지연 로드되므로 요청한 컬럼만 압축 해제됩니다.
+DATA_DIR = Path(__file__).resolve().parent / "database"
+RESULT_PATH = DATA_DIR / "results.npz"
+LEGACY_CSV = DATA_DIR / "features_output.csv"
+STORE_VERSION = 1
+
+BACKTEST_COLUMNS = ("gap", "priv_fund_ratio", "factor_rank", "position",
+                    "strategy_ret", "strategy_net", "equity")
+
+@instrumented()
+def write_results(frame: pd.DataFrame, path: str | Path = RESULT_PATH,
+                  metadata: dict | None = None) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    arrays, schema = {}, []
+    for i, name in enumerate(frame.columns):
+        col = frame.iloc[:, i]
+        if col.dtype == object:
+            col = pd.to_numeric(col, errors="coerce")
+        arrays[f"c{i:04d}"] = col.to_numpy()
+        schema.append({"name": str(name), "dtype": str(arrays[f"c{i:04d}"].dtype)})
+    arrays["__index__"] = frame.index.to_numpy(dtype="datetime64[ns]")
+
+    meta = {
+        "version": STORE_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "rows": len(frame),
+        "index_name": frame.index.name,
+        "schema": schema,
+        "backtest_columns": [c for c in BACKTEST_COLUMNS if c in frame.columns],
+        **(metadata or {}),
+    }
+    arrays["__meta__"] = np.frombuffer(json.dumps(meta, ensure_ascii=False, default=str).encode("utf-8"),
+                                       dtype=np.uint8)
+
+    tmp = path.with_name(path.stem + ".tmp.npz")
+    np.savez_compressed(tmp, **arrays)
+    tmp.replace(path)
+    return path
+
+def read_metadata(path: str | Path = RESULT_PATH) -> dict:
+    with np.load(path, allow_pickle=False) as store:
+        return json.loads(store["__meta__"].tobytes().decode("utf-8"))
+
+@instrumented()
+def load_results(columns: list[str] | None = None, path: str | Path = RESULT_PATH) -> pd.DataFrame:
+    path = Path(path)
+    if not path.exists():
+        return _load_legacy_csv(columns)
+
+    with np.load(path, allow_pickle=False) as store:
+        meta = json.loads(store["__meta__"].tobytes().decode("utf-8"))
+        names = [spec["name"] for spec in meta["schema"]]
+        index = pd.DatetimeIndex(store["__index__"], name=meta["index_name"])
+        if columns is None:
+            # 전체 로드: 저장된 순서 그대로 (같은 이름의 컬럼도 위치별로 모두)
+            selected = list(enumerate(names))
+        else:
+            columns = list(columns)
+            missing = [c for c in columns if c not in names]
+            if missing: raise KeyError(f"Columns not in {path.name}: {missing}")
+            ambiguous = [c for c in dict.fromkeys(columns) if names.count(c) > 1]
+            if ambiguous: raise ValueError(f"Duplicate columns in {path.name}: {ambiguous}")
+            selected = [(names.index(c), c) for c in columns]
+
+        data = pd.DataFrame({k: store[f"c{i:04d}"] for k, (i, _) in enumerate(selected)}, index=index)
+    data.columns = [name for _, name in selected]
+    return data
+
+def _load_legacy_csv(columns: list[str] | None) -> pd.DataFrame:
+    # results.npz 가 아직 없으면 예전 CSV 결과에서 필요한 컬럼만 읽음
+    if not LEGACY_CSV.exists():
+        raise FileNotFoundError(f"{RESULT_PATH.name} / {LEGACY_CSV.name} 결과 파일이 없습니다. "
+                                "run_analysis.py를 먼저 실행하세요.")
+    usecols = None if columns is None else lambda c: c == "date" or c in columns
+    df = pd.read_csv(LEGACY_CSV, usecols=usecols, index_col=0, parse_dates=True)
+    missing = [c for c in (columns or []) if c not in df.columns]
+    if missing: raise KeyError(f"Columns not in {LEGACY_CSV.name}: {missing}")
+    return df if columns is None else df[list(columns)]
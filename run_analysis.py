@@ -1,13 +1,55 @@
+import argparse
+from contextlib import nullcontext
+from dataclasses import asdict
 from pathlib import Path
+from features import feature_store
+from instrumentation import profiling, stage
+from result_cache import caching
 from overnight_alpha import Params, load_dataguide_excel, run_alpha_factor_testing
+from result_store import write_results
 
 # 파일 경로 (사용자분 경로 그대로 유지)
 DATA_PATH = Path(r"C:\Users\10845\OneDrive - 이지스자산운용\문서\mkf2000_raw.xlsx")
 OUTPUT_DIR = Path(__file__).resolve().parent / "database"
+REPORT_PATH = OUTPUT_DIR / "run_report.json"
+# analysis/ 스크립트가 결과 파일에서 읽는 파생 피처 (고가/저가가 없는 데이터면 건너뜀)
+ANALYSIS_FEATURES = ("ret_1d", "open_to_high", "open_to_low", "dir_ratio_long", "dir_ratio_short")
 
-def main() -> None:
+def add_analysis_features(df_features, names=ANALYSIS_FEATURES):
+    # 얕은 복사에 붙임 (메모이즈된 백테스트 결과 프레임은 건드리지 않음)
+    df_features = df_features.copy(deep=False)
+    store = feature_store(df_features)
+    for name in names:
+        if name in df_features.columns: continue
+        try:
+            df_features[name] = store.get(name)
+        except KeyError:
+            continue
+    return df_features
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the overnight private-fund flow backtest.")
+    parser.add_argument("--profile", nargs="?", const=str(REPORT_PATH), default=None, metavar="REPORT",
+                        help=f"Record per-stage timing/memory to a JSON report (default: {REPORT_PATH}).")
+    parser.add_argument("--compact", action="store_true",
+                        help="Load only the mapped fields as float32 (raw I3100 columns are not saved).")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reuse backtest results stored under database/.cache/results (same data + Params + code).")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    # --profile 이 없으면 계측 훅은 원래 함수를 그대로 호출 (오버헤드 없음)
+    with profiling(args.profile, name="run_analysis") if args.profile else nullcontext() as profiler, \
+            caching() if args.cache else nullcontext():
+        run(args.compact, profiler)
+    if args.profile:
+        print(f"\n[계측]\n{profiler.summary()}")
+        print(f"[완료] 실행 리포트가 '{args.profile}'에 저장되었습니다.")
+
+def run(compact: bool = False, profiler=None) -> None:
     print("1. 데이터를 불러오는 중입니다...")
-    df = load_dataguide_excel(DATA_PATH)
+    df = load_dataguide_excel(DATA_PATH, compact=compact)
 
     print("2. 전략 파라미터를 설정합니다...")
     # [수정] 오직 필요한 변수 4개만 넣었습니다. (오류 원인 원천 차단)
@@ -17,18 +59,22 @@ def main() -> None:
         sell_threshold=0.90, # 상위 10% -> 매도
         cost=0.0015          # 수수료
     )
+    if profiler is not None:
+        profiler.meta.update({"source": str(DATA_PATH), "params": asdict(params)})
 
     print("3. 백테스트를 실행합니다...")
     df_features, _, backtest = run_alpha_factor_testing(df, params)
-    
+
     print("\n[최근 20일 거래 내역 및 수익률]")
     print(backtest[["position", "strategy_net", "equity"]].tail(20))
-    
-    OUTPUT_DIR.mkdir(exist_ok=True)
-    df_features.to_csv(OUTPUT_DIR / "features_output.csv")
-    backtest.to_csv(OUTPUT_DIR / "backtest_output.csv")
-    output_file = OUTPUT_DIR / "final_strategy_result.csv"
-    backtest.to_csv(output_file)
+
+    # features 에 백테스트 컬럼이 모두 들어 있으므로 한 번만 저장
+    with stage("output"):
+        output_file = write_results(
+            add_analysis_features(df_features),
+            OUTPUT_DIR / "results.npz",
+            metadata={"params": asdict(params), "source": str(DATA_PATH)},
+        )
     print(f"\n[완료] 결과가 '{output_file}'에 저장되었습니다.")
 
 if __name__ == "__main__":
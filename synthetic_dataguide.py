@@ -0,0 +1,131 @@
+from __future__ import annotations
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from overnight_alpha import ITEM_CODE_MAP, map_item_codes
+from overnight_panel import PANEL_FIELDS
+
+# ==============================================================================
+# 1. 합성 DataGuide 데이터 설정
+# ==============================================================================
+# 실제 DataGuide 내보내기와 같은 I3100... 코드 (가격 / 거래대금 / 투자자별 순매수)
+PRICE_CODES = ["I31000010F", "I31000020F", "I31000030F", "I31000040F"]   # 시/고/저/종가
+TURNOVER_CODE = "I310000600"
+VOLUME_CODE = "I31000050F"
+FLOW_CODES = [
+    "I310020932",  # 사모펀드
+    "I310023132",  # 외국인계
+    "I310020032",  # 기관계
+    "I310020732",  # 개인
+    "I310020632",  # 연기금
+    "I310020132",  # 금융투자
+    "I310020332",  # 보험
+    "I310020432",  # 투신
+    "I310020532",  # 은행
+    "I310021132",  # 등록외국인
+    "I310024132",  # 국가/지자체
+]
+ALL_CODES = PRICE_CODES + [TURNOVER_CODE, VOLUME_CODE] + FLOW_CODES
+
+START_DATE = "1980-01-01"
+# datetime64[ns] 로 표현 가능한 일별 달력 길이 (~10.3만 행, 2262-04-11 까지).
+# 로더/캐시(load_dataguide_excel, dataguide_cache, result_store)는 ns 인덱스를 쓰므로
+# 엑셀을 거치는 단계는 이 길이까지만 가능
+MAX_NS_DAILY_ROWS = (pd.Timestamp.max - pd.Timestamp(START_DATE)).days + 1
+
+# ==============================================================================
+# 2. 시계열 생성 (날짜 x 종목, 주말 행은 DataGuide 처럼 빈 값)
+# ==============================================================================
+def _calendar(n_rows: int) -> pd.DatetimeIndex:
+    # 항상 일별 달력 (CAGR 등 달력일 기준 KPI 가 의미 있도록).
+    # ns 범위를 넘는 길이(벤치마크 1M 행)는 같은 일별 날짜를 초 단위 인덱스로 표현
+    unit = "ns" if n_rows <= MAX_NS_DAILY_ROWS else "s"
+    return pd.date_range(START_DATE, periods=n_rows, freq="D", name="date", unit=unit)
+
+def _simulate(n_rows: int, n_instruments: int, seed: int) -> tuple[pd.DatetimeIndex, dict[str, np.ndarray]]:
+    rng = np.random.default_rng(seed)
+    dates = _calendar(n_rows)
+    shape = (n_rows, n_instruments)
+
+    # 종가: 로그 랜덤워크 / 시가: 전일 종가 + 갭 / 고저: 시가·종가 바깥
+    close = 2000 * np.exp(np.cumsum(rng.normal(0, 0.01, shape), axis=0))
+    prev_close = np.vstack([close[:1], close[:-1]])
+    open_ = prev_close * np.exp(rng.normal(0, 0.004, shape))
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, 0.004, shape)))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, 0.004, shape)))
+
+    turnover = np.exp(rng.normal(29.5, 0.3, shape))          # 약 5~10조원
+    volume = turnover / close
+    data = dict(zip(PRICE_CODES, (open_, high, low, close)))
+    data[TURNOVER_CODE] = turnover
+    data[VOLUME_CODE] = volume
+    # 순매수: 거래대금 대비 수 % 수준, 투자자 간 일부 상관
+    common = rng.normal(0, 1, shape)
+    for code in FLOW_CODES:
+        data[code] = turnover * 0.01 * (0.5 * common + rng.normal(0, 1, shape))
+
+    weekend = dates.dayofweek >= 5
+    for values in data.values():
+        values[weekend] = np.nan
+    return dates, data
+
+def synthetic_codes(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    # 시트 그대로의 모양: 주말 포함 달력 x I3100 코드 컬럼
+    dates, data = _simulate(n_rows, 1, seed)
+    return pd.DataFrame({code: values[:, 0] for code, values in data.items()}, index=dates)
+
+def synthetic_frame(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    # load_dataguide_excel 결과와 같은 모양 (평일만, ITEM_CODE_MAP 이름)
+    codes = synthetic_codes(n_rows, seed)
+    return map_item_codes(codes[codes.index.dayofweek < 5])
+
+def instrument_symbols(n_instruments: int) -> list[str]:
+    return [f"A{i:06d}" for i in range(n_instruments)]
+
+def synthetic_panel(n_rows: int, n_instruments: int, seed: int = 0,
+                    fields=PANEL_FIELDS) -> dict[str, pd.DataFrame]:
+    # load_dataguide_panel 결과와 같은 모양: {필드: 평일 x 종목}
+    dates, data = _simulate(n_rows, n_instruments, seed)
+    weekday = dates.dayofweek < 5
+    columns = pd.Index(instrument_symbols(n_instruments), name="instrument")
+    panel = {}
+    for code, name in ITEM_CODE_MAP.items():
+        if name in fields:
+            panel[name] = pd.DataFrame(data[code][weekday], index=dates[weekday], columns=columns)
+    return panel
+
+# ==============================================================================
+# 3. DataGuide 레이아웃 엑셀 쓰기
+# ==============================================================================
+def write_dataguide_workbook(path: str | Path, n_rows: int, n_instruments: int = 1,
+                             seed: int = 0, codes=ALL_CODES) -> Path:
+    # 메타데이터 행 -> Symbol / Symbol Name / Kind -> Item -> Item Name -> Frequency -> 데이터
+    # 종목이 여러 개면 종목별로 같은 코드 묶음을 옆으로 반복 (멀티 종목 시트)
+    from openpyxl import Workbook
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    dates, data = _simulate(n_rows, n_instruments, seed)
+    symbols = instrument_symbols(n_instruments)
+    codes = list(codes)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    ws.append(["Refresh", "Last Updated: " + pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")])
+    ws.append(["Calendar", "Frequency: DAILY", "Non-Trading Day: Include"])
+    ws.append([])
+    ws.append(["Symbol"] + [s for s in symbols for _ in codes])
+    ws.append(["Symbol Name"] + [f"SYN{s[1:]}" for s in symbols for _ in codes])
+    ws.append(["Kind"] + ["INDEX"] * (len(symbols) * len(codes)))
+    ws.append(["Item"] + codes * len(symbols))
+    ws.append(["Item Name "] + [f"Item {code[-5:]}" for code in codes] * len(symbols))
+    ws.append(["Frequency"] + ["DAILY"] * (len(symbols) * len(codes)))
+
+    # (날짜, 종목 x 코드) 블록을 행 단위로 기록 (빈 값 = 주말)
+    block = np.stack([data[code] for code in codes], axis=2).reshape(n_rows, -1)
+    block = block.astype(object)
+    block[pd.isna(block)] = None
+    for stamp, row in zip(dates.to_pydatetime(), block):
+        ws.append([stamp, *row])
+    wb.save(path)
+    return path
@@ -0,0 +1,19 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from synthetic_dataguide import synthetic_frame, write_dataguide_workbook
+
+
+@pytest.fixture
+def frame():
+    # load_dataguide_excel 결과와 같은 모양의 합성 데이터 (평일 ~430일)
+    return synthetic_frame(600, seed=3)
+
+
+@pytest.fixture(scope="session")
+def workbook(tmp_path_factory):
+    return write_dataguide_workbook(tmp_path_factory.mktemp("dataguide") / "one.xlsx", 120, seed=5)
@@ -0,0 +1,40 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import pandas as pd
+
+from backtest_overnight import analyze_file, iter_figures, render_chart_packs, render_charts
+
+
+def _write_csv(frame, path, foreign=True):
+    out = frame[["open", "high", "low", "close"]].rename_axis("date").reset_index()
+    if foreign:
+        out["foreign_net"] = frame["net_foreign"].to_numpy()
+    out.to_csv(path, index=False)
+    return path
+
+
+def test_render_charts_headless(frame, tmp_path):
+    df = analyze_file(_write_csv(frame, tmp_path / "one.csv"))
+    names = [name for name, _ in iter_figures(df)]
+    paths = render_charts(df, tmp_path / "charts")
+    assert [p.stem for p in paths] == names
+    assert all(p.exists() and p.stat().st_size > 0 for p in paths)
+
+
+def test_chart_packs_render_in_worker_processes(frame, tmp_path):
+    # 파일마다 하위 폴더 하나 (수급 컬럼이 없는 파일은 차트 수가 적음)
+    paths = [_write_csv(frame, tmp_path / "with_flow.csv"),
+             _write_csv(frame.iloc[:300], tmp_path / "no_flow.csv", foreign=False)]
+    out = tmp_path / "packs"
+    report = render_chart_packs(paths, out, workers=2)
+
+    assert (out / "alpha_stats.csv").exists()
+    for path, row in zip(paths, report.itertuples()):
+        expected = [name for name, _ in iter_figures(analyze_file(path))]
+        files = sorted(p.stem for p in (out / path.stem).glob("*.png"))
+        assert files == sorted(expected) and row.charts == len(expected)
+        assert (out / path.stem / "summary.csv").exists()
+    assert report["charts"].tolist() == [7, 6]
+    pd.testing.assert_series_equal(report["file"], pd.Series([str(p) for p in paths], name="file"))
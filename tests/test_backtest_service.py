@@ -0,0 +1,27 @@
+import pandas as pd
+
+from backtest_service import BacktestService
+from overnight_alpha import map_item_codes
+from synthetic_dataguide import synthetic_codes
+
+
+def test_ic_accepts_raw_item_codes():
+    # 매핑 전 Item 코드 컬럼 + 문자열로 읽힌 수급 컬럼도 매핑/숫자 데이터셋과 같은 IC
+    raw = synthetic_codes(400, seed=2).dropna(how="all")
+    loose = raw.copy()
+    loose["I310020032"] = loose["I310020032"].map(repr).astype(object)
+
+    service = BacktestService()
+    service.datasets = {"mapped": map_item_codes(raw), "raw": loose}
+    expected = pd.DataFrame(**service.handle("ic", {"dataset": "mapped", "target": "Next_Gap"})["table"])
+    result = pd.DataFrame(**service.handle("ic", {"dataset": "raw", "target": "Next_Gap"})["table"])
+    pd.testing.assert_frame_equal(result, expected)
+    assert "Ratio_net_inst" in set(result["factor"])
+
+
+def test_backtest_round_trip(frame):
+    service = BacktestService()
+    service.datasets = {"one": frame}
+    out = service.handle("kpi", {"params": {"rolling_window": 20}})
+    assert out["params"]["rolling_window"] == 20
+    assert out["kpis"]["days"] > 0
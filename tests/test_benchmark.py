@@ -0,0 +1,37 @@
+import json
+
+import pandas as pd
+
+import benchmark
+from synthetic_dataguide import MAX_NS_DAILY_ROWS, synthetic_frame
+
+
+def _baseline(path, best_s, peak_mb):
+    row = {"stage": "run_alpha_factor_testing", "rows": 300, "instruments": 1, "best_s": best_s, "peak_mb": peak_mb}
+    path.write_text(json.dumps({"environment": {}, "results": [row]}), encoding="utf-8")
+    return path
+
+
+def test_compare_flags_regressions():
+    keys = {"stage": ["a", "b", "c"], "rows": [10] * 3, "instruments": [1] * 3}
+    base = pd.DataFrame({**keys, "best_s": [1.0, 1.0, 1.0], "peak_mb": [10.0, 10.0, 10.0]})
+    new = pd.DataFrame({**keys, "best_s": [1.05, 1.5, 1.0], "peak_mb": [10.0, 10.0, 12.0]})
+    table = benchmark.compare_results(base, new, tolerance=0.1)
+    assert table["regression"].tolist() == [False, True, True]
+
+
+def test_cli_compare_exit_code(tmp_path):
+    args = ["--rows", "300", "--instruments", "1", "--stages", "run_alpha_factor_testing",
+            "--repeat", "1", "--output", str(tmp_path / "new.json")]
+    # 기준이 터무니없이 빠르면 회귀(1), 터무니없이 느리면 통과(0)
+    assert benchmark.main(args + ["--compare", str(_baseline(tmp_path / "fast.json", 1e-9, 1e-9))]) == 1
+    assert benchmark.main(args + ["--compare", str(_baseline(tmp_path / "slow.json", 1e3, 1e6))]) == 0
+    assert benchmark.load_report(tmp_path / "new.json")["stage"].tolist() == ["run_alpha_factor_testing"]
+
+
+def test_long_synthetic_calendar_stays_daily():
+    # ns 범위를 넘는 길이도 시간 단위가 아니라 일별 날짜 (초 단위 인덱스)
+    df = synthetic_frame(MAX_NS_DAILY_ROWS + 10)
+    step = pd.Series(df.index).diff().dropna()
+    assert step.min() == pd.Timedelta(days=1) and step.max() == pd.Timedelta(days=3)
+    assert (df.index[-1] - df.index[0]).days > MAX_NS_DAILY_ROWS
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from chunked_backtest import OUTPUT_COLUMNS, run_chunked_backtest, write_store
+from dataguide_cache import read_frame, write_frame
+from overnight_alpha import Params, run_alpha_factor_testing
+
+PARAMS = Params(rolling_window=60)
+
+
+@pytest.fixture
+def gappy(frame):
+    # 결측 / 0 거래대금(-> inf 비율) 이 청크 경계에 걸치도록
+    frame = frame.copy()
+    frame.iloc[59:64, frame.columns.get_loc("net_priv_fund")] = np.nan
+    frame.iloc[118:125, frame.columns.get_loc("turnover")] = 0.0
+    return frame
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 7, 59, 61, 333, 429])
+def test_bit_for_bit_with_uneven_chunks(gappy, tmp_path, chunk_rows):
+    # 청크 크기가 랭크 윈도우/전체 길이를 나누지 않아도 메모리 경로와 비트 단위로 같음
+    _, _, expected = run_alpha_factor_testing(gappy, PARAMS)
+    store = write_store(gappy, tmp_path / "store")
+    state = run_chunked_backtest(store, tmp_path / "out", PARAMS, chunk_rows=chunk_rows)
+
+    result = read_frame(tmp_path / "out")
+    assert state.rows == len(gappy)
+    for name in OUTPUT_COLUMNS:
+        np.testing.assert_array_equal(result[name].to_numpy(), expected[name].to_numpy(), err_msg=name)
+    assert state.equity == expected["equity"].iloc[-1]
+
+
+def test_rejects_string_columns(frame, tmp_path):
+    bad = frame[["open", "close", "turnover", "net_priv_fund"]].astype(object)
+    bad.iloc[3, 3] = "n/a"
+    write_frame(bad, tmp_path / "store")
+    with pytest.raises(ValueError, match="'str'"):
+        run_chunked_backtest(tmp_path / "store", tmp_path / "out", PARAMS)
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from collinearity import rolling_vif, vif_table
+
+
+def _factors(n=800, seed=0):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(n, 3))
+    df = pd.DataFrame({
+        "a": base[:, 0] + 5.0,
+        "b": base[:, 1],
+        "c": 0.8 * base[:, 0] + 0.6 * base[:, 2] - 2.0,
+        "d": base[:, 0] - base[:, 1] + 0.05 * rng.normal(size=n),
+    }, index=pd.date_range("2010-01-01", periods=n, freq="B"))
+    df.iloc[[3, 40], 1] = np.nan
+    return df
+
+
+def test_vif_matches_statsmodels_with_constant():
+    sm = pytest.importorskip("statsmodels.api")
+    from statsmodels.stats.outliers_influence import variance_inflation_factor
+
+    df = _factors()
+    x = sm.add_constant(df.dropna()).to_numpy()
+    expected = [variance_inflation_factor(x, i + 1) for i in range(df.shape[1])]
+    result = vif_table(df).set_index("Feature")["VIF"]
+    np.testing.assert_allclose(result[df.columns], expected, rtol=1e-8)
+
+
+def test_vif_matches_direct_regression():
+    # statsmodels 없이: VIF_j = 1 / (1 - R_j^2), R_j^2 = 절편 포함 최소제곱
+    df = _factors().dropna()
+    result = vif_table(df).set_index("Feature")["VIF"]
+    for name in df.columns:
+        y = df[name].to_numpy()
+        x = np.column_stack([np.ones(len(df)), df.drop(columns=name).to_numpy()])
+        resid = y - x @ np.linalg.lstsq(x, y, rcond=None)[0]
+        r2 = 1 - resid @ resid / ((y - y.mean()) @ (y - y.mean()))
+        assert result[name] == pytest.approx(1 / (1 - r2), rel=1e-8)
+
+
+def test_zero_variance_and_rolling():
+    df = _factors().dropna()
+    df["flat"] = 1.0
+    table = vif_table(df).set_index("Feature")["VIF"]
+    assert np.isnan(table["flat"])
+
+    rolled = rolling_vif(df, window=250, step=100)
+    for end, row in rolled.iterrows():
+        window = df.loc[:end].iloc[-250:]
+        expected = vif_table(window).set_index("Feature")["VIF"][df.columns]
+        np.testing.assert_allclose(row, expected, rtol=1e-8)
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from condition_index import TARGET_BITS, ConditionIndex, quantile_bins
+
+
+def test_quantile_bins_match_qcut(frame):
+    values = frame["net_priv_fund"].to_numpy(dtype="float64")
+    for q in (3, 5, 10):
+        expected = pd.qcut(values, q, labels=False)
+        np.testing.assert_array_equal(quantile_bins(values, q), np.nan_to_num(expected, nan=-1))
+
+
+def test_duplicate_edges_follow_qcut():
+    values = np.r_[np.zeros(80), np.arange(20.0)]
+    with pytest.raises(ValueError, match="Bin edges must be unique"):
+        pd.qcut(values, 5)
+    with pytest.raises(ValueError, match="Bin edges must be unique"):
+        quantile_bins(values, 5)
+    expected = pd.qcut(values, 5, labels=False, duplicates="drop")
+    np.testing.assert_array_equal(quantile_bins(values, 5, duplicates="drop"), expected)
+
+
+def test_target_mean_within_quantisation_bound(frame):
+    df = frame.assign(next_gap=(frame["open"].shift(-1) - frame["close"]) / frame["close"])
+    index = ConditionIndex(df, features=["net_priv_fund"], targets=("next_gap",))
+    target = df["next_gap"]
+    bound = (target.max() - target.min()) / (2 * (2 ** TARGET_BITS - 1))
+    groups = pd.qcut(df["net_priv_fund"], 5, labels=False)
+    for q in range(5):
+        expected = target[groups == q].mean()
+        assert abs(index.mean("next_gap", f"net_priv_fund:q{q + 1}") - expected) <= bound * 1.01 + 1e-15
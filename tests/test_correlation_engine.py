@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from correlation_engine import REFRESH_EVERY, correlation_matrix, rolling_corr
+
+
+def _frame(n=1200, seed=0):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(n, 2))
+    df = pd.DataFrame({
+        "a": base[:, 0],
+        "b": 0.6 * base[:, 0] + 0.8 * base[:, 1],
+        "c": 1e5 + np.round(rng.normal(size=n), 1),       # 큰 평균 + 동점
+        "d": np.cumsum(rng.normal(size=n)) * 0.1 + base[:, 1],
+    }, index=pd.date_range("2015-01-01", periods=n, freq="B"))
+    # 컬럼마다 다른 결측 패턴 (워밍업 구간 + 임의 결측)
+    df.iloc[:60, 1] = np.nan
+    df.iloc[:250, 3] = np.nan
+    df.iloc[rng.random(n) < 0.03, 2] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("method, scipy_func", [("pearson", stats.pearsonr), ("spearman", stats.spearmanr)])
+def test_matches_scipy_pairwise(method, scipy_func):
+    df = _frame()
+    result = correlation_matrix(df, method=method)
+    table = result.pairs().set_index(["var1", "var2"])
+    pd.testing.assert_frame_equal(result.matrix("r"), df.corr(method=method), rtol=1e-10, check_names=False)
+    for (a, b), row in table.iterrows():
+        pair = df[[a, b]].dropna()
+        r, p = scipy_func(pair[a], pair[b])
+        assert row["n"] == len(pair)
+        assert row["r"] == pytest.approx(r, rel=1e-10, abs=1e-12)
+        assert row["p"] == pytest.approx(p, rel=1e-6, abs=1e-300)
+
+
+def test_rolling_matches_pandas_across_refresh():
+    df = _frame()
+    assert len(df) > 2 * REFRESH_EVERY
+    result = rolling_corr(df, window=60)
+    for a, b in result.columns:
+        expected = df[a].rolling(60).corr(df[b])
+        np.testing.assert_allclose(result[(a, b)], expected, rtol=1e-8, atol=1e-10)
+
+
+def test_newey_west_matches_statsmodels_hac():
+    sm = pytest.importorskip("statsmodels.api")
+    df = _frame().dropna()
+    result = correlation_matrix(df, newey_west=True, lags=5)
+    z = (df - df.mean()) / df.std(ddof=1)
+    u = (z["a"] * z["d"]).to_numpy()
+    fit = sm.OLS(u, np.ones(len(u))).fit(cov_type="HAC", cov_kwds={"maxlags": 5, "use_correction": False})
+    assert result.matrix("nw_t").loc["a", "d"] == pytest.approx(fit.tvalues[0], rel=1e-8)
@@ -0,0 +1,41 @@
+import pandas as pd
+
+import dataguide_cache
+from dataguide_cache import cached_frame, code_fingerprint
+
+
+def _builder(path):
+    return pd.DataFrame({"x": [1.0, 2.0]}, index=pd.DatetimeIndex(["2024-01-02", "2024-01-03"], name="date"))
+
+
+def test_cache_hit_skips_builder(tmp_path):
+    source = tmp_path / "data.xlsx"
+    source.write_bytes(b"workbook")
+    calls = []
+    build = lambda p: calls.append(p) or _builder(p)
+
+    first = cached_frame(source, build, cache_dir=tmp_path / "cache")
+    second = cached_frame(source, build, cache_dir=tmp_path / "cache")
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_code_change_invalidates_entry(tmp_path, monkeypatch):
+    source = tmp_path / "data.xlsx"
+    source.write_bytes(b"workbook")
+    calls = []
+    build = lambda p: calls.append(p) or _builder(p)
+
+    cached_frame(source, build, cache_dir=tmp_path / "cache")
+    monkeypatch.setattr(dataguide_cache, "code_fingerprint", lambda *objects: "changed-parser")
+    cached_frame(source, build, cache_dir=tmp_path / "cache")
+    assert len(calls) == 2
+
+
+def test_code_fingerprint_covers_import_closure():
+    import overnight_alpha
+
+    code_fingerprint(overnight_alpha.load_dataguide_excel)
+    # overnight_alpha -> features -> rolling_rank (간접 의존 모듈까지 포함)
+    names = {path.name for path in dataguide_cache._SOURCE_HASHES}
+    assert {"overnight_alpha.py", "features.py", "rolling_rank.py", "dataguide_cache.py"} <= names
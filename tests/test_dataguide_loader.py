@@ -0,0 +1,110 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+import dataguide_cache
+import run_analysis
+from dataguide_sheet import EXCEL_EPOCH, is_date_cell
+from kpi import summarize
+from overnight_alpha import (ITEM_CODE_MAP, Params, _map_item_codes, compact_frame, load_dataguide_excel,
+                             map_item_codes, stream_dataguide_excel)
+from result_store import BACKTEST_COLUMNS, load_results
+
+
+def _reference_load(path):
+    # 예전 load_dataguide_excel: read_excel 로 시트 전체를 읽어 파싱
+    raw = pd.read_excel(path, header=None)
+    item_row = next(i for i in range(50) if raw.iloc[i].astype(str).str.contains("I3100").any())
+    data = raw.iloc[item_row + 1:]
+    data = data[data.iloc[:, 0].map(lambda v: isinstance(v, datetime))]
+    frame = data.iloc[:, 1:].apply(pd.to_numeric, errors="coerce").astype("float64")
+    frame.columns = raw.iloc[item_row, 1:].tolist()
+    frame.index = pd.DatetimeIndex(data.iloc[:, 0], name="date").as_unit("ns")
+    return frame[frame.index.dayofweek < 5].rename(columns=ITEM_CODE_MAP)
+
+
+def test_full_load_matches_read_excel(workbook):
+    loaded = load_dataguide_excel(workbook, use_cache=False)
+    expected = _reference_load(workbook)
+    pd.testing.assert_frame_equal(loaded, expected, check_names=False)
+
+
+def test_compact_load_keeps_mapped_fields(workbook):
+    compact = load_dataguide_excel(workbook, use_cache=False, compact=True)
+    full = load_dataguide_excel(workbook, use_cache=False)
+    assert list(compact.columns) == list(ITEM_CODE_MAP.values())
+    np.testing.assert_allclose(compact.to_numpy("float64"), full[compact.columns].to_numpy(), rtol=1e-6)
+
+
+def test_excel_serial_dates(workbook, tmp_path):
+    # 날짜 서식이 빠진 내보내기: 첫 칸이 엑셀 일련번호
+    wb = load_workbook(workbook)
+    ws = wb.worksheets[0]
+    for (cell,) in ws.iter_rows(min_col=1, max_col=1):
+        if isinstance(cell.value, datetime):
+            cell.value = (cell.value - EXCEL_EPOCH.to_pydatetime()).days
+            cell.number_format = "General"
+    serial = tmp_path / "serial.xlsx"
+    wb.save(serial)
+
+    assert is_date_cell(45000) and not is_date_cell(True) and not is_date_cell("Frequency")
+    pd.testing.assert_frame_equal(stream_dataguide_excel(serial, use_cache=False),
+                                  stream_dataguide_excel(workbook, use_cache=False))
+
+
+def test_full_load_keeps_non_code_columns(workbook, tmp_path):
+    # Item 코드가 없는 컬럼은 예전 로더처럼 "unknown" 이름으로 원본 값(object) 유지
+    wb = load_workbook(workbook)
+    ws = wb.worksheets[0]
+    col = ws.max_column + 1
+    for (cell,) in ws.iter_rows(min_col=1, max_col=1):
+        if isinstance(cell.value, datetime):
+            ws.cell(row=cell.row, column=col, value="memo")
+    extra = tmp_path / "extra.xlsx"
+    wb.save(extra)
+
+    loaded = load_dataguide_excel(extra, use_cache=False)
+    assert loaded.columns[-1] == "unknown" and loaded["unknown"].dtype == object
+    assert (loaded["unknown"] == "memo").all()
+    pd.testing.assert_frame_equal(loaded.iloc[:, :-1], load_dataguide_excel(workbook, use_cache=False))
+    assert _map_item_codes is map_item_codes
+
+
+def test_compact_dtypes(workbook, tmp_path, monkeypatch):
+    # 왕복 오차가 COMPACT_RTOL 이내인 필드만 float32, 나머지는 float64 (캐시 적중 후에도 같은 dtype)
+    monkeypatch.setattr(dataguide_cache, "CACHE_DIR", tmp_path / "cache")
+    for _ in range(2):
+        compact = load_dataguide_excel(workbook, compact=True)
+        assert set(compact.dtypes) == {np.dtype("float32")}
+    assert compact.index.dtype == "datetime64[ns]"
+
+    # float32 로 범위를 넘거나(1e39) 비정규 수가 되어 유효숫자를 잃는(1e-42) 필드는 float64 유지
+    frame = pd.DataFrame({"open": [1.5, 2.25], "close": [1e-42, 2.0], "net_foreign": [1e39, 0.0]})
+    compact = compact_frame(frame.assign(extra=["a", "b"]))
+    assert list(compact.columns) == ["open", "close", "net_foreign"]
+    assert compact.dtypes.tolist() == [np.float32, np.float64, np.float64]
+
+
+def test_compact_run_kpis_match_float64(workbook, tmp_path, monkeypatch):
+    # run_analysis --compact 결과의 KPI 가 float64 실행과 float32 반올림 오차 안에서 같음
+    # 가격의 상대오차 2^-24 가 갭에서는 절대오차 ~1e-7 로 남음 (시가 - 전일 종가 상쇄)
+    monkeypatch.setattr(dataguide_cache, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(run_analysis, "DATA_PATH", workbook)
+    monkeypatch.setattr(run_analysis, "Params", lambda **kw: Params(**{**kw, "rolling_window": 20}))
+    runs = {}
+    for flag in ([], ["--compact"]):
+        monkeypatch.setattr(run_analysis, "OUTPUT_DIR", tmp_path / ("compact" if flag else "full"))
+        run_analysis.main(flag)
+        runs[bool(flag)] = load_results(list(BACKTEST_COLUMNS), path=tmp_path / ("compact" if flag else "full")
+                                        / "results.npz")
+
+    full, compact = runs[False], runs[True]
+    np.testing.assert_array_equal(compact["position"], full["position"])
+    np.testing.assert_allclose(compact["gap"], full["gap"], rtol=0, atol=1e-7)
+    got = summarize(compact["strategy_net"], compact["position"])
+    expected = summarize(full["strategy_net"], full["position"])
+    for name in ("equity", "sharpe", "mdd"):
+        np.testing.assert_allclose(got[name], expected[name], rtol=1e-4, atol=1e-6)
+    np.testing.assert_array_equal(got["trades"], expected["trades"])
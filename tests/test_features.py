@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from features import feature_store
+from overnight_alpha import Params, run_alpha_factor_testing
+
+
+def test_hit_reuses_cached_series(frame):
+    store = feature_store(frame)
+    assert store.get("factor_rank_20") is store.get("factor_rank_20")
+    assert feature_store(frame) is store
+
+
+def test_recomputes_after_column_assignment(frame):
+    params = Params(rolling_window=20)
+    _, _, before = run_alpha_factor_testing(frame, params)
+
+    frame["open"] = frame["open"] * 1.01
+    _, _, after = run_alpha_factor_testing(frame, params)
+    expected = (frame["open"] - frame["close"].shift(1)) / frame["close"].shift(1)
+    np.testing.assert_allclose(after["gap"], expected)
+    assert not np.allclose(after["gap"].dropna(), before["gap"].dropna())
+
+
+def test_recomputes_after_in_place_edit(frame):
+    store = feature_store(frame)
+    ratio = store.get("priv_fund_ratio").copy()
+    rank = store.get("factor_rank_20")
+
+    # 같은 배열을 제자리에서 수정 (컬럼 객체는 그대로)
+    frame.iloc[100, frame.columns.get_loc("net_priv_fund")] += 1e9
+    assert store.get("priv_fund_ratio").iloc[100] != ratio.iloc[100]
+    assert store.get("factor_rank_20") is not rank
+    # 입력이 바뀌지 않은 피처는 그대로 재사용
+    gap = store.get("gap")
+    assert store.get("gap") is gap
+
+
+def test_stale_derived_columns_are_recomputed(frame):
+    # 이전 실행에서 남은 파생 컬럼은 무시하고 레지스트리 정의로 다시 계산 (원본 거래대금은 그대로 사용)
+    params = Params(rolling_window=20)
+    _, _, expected = run_alpha_factor_testing(frame, params)
+    stale = frame.assign(gap=0.5, priv_fund_ratio=-1.0)
+    _, _, got = run_alpha_factor_testing(stale, params)
+    np.testing.assert_array_equal(got.to_numpy(), expected.to_numpy())
+    pd.testing.assert_series_equal(feature_store(stale).get("turnover"), stale["turnover"])
+
+
+def test_stored_column_used_when_inputs_missing(frame):
+    # results.npz 에서 gap 만 읽은 프레임: 계산할 원본이 없으므로 저장된 컬럼 사용
+    loaded = frame[["close"]].assign(gap=0.01)
+    pd.testing.assert_series_equal(feature_store(loaded).get("gap"), loaded["gap"])
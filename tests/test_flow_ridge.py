@@ -0,0 +1,55 @@
+import numpy as np
+
+from features import feature_store
+from flow_ridge import FLOW_CODE_MAP, flow_factors, rolling_ridge
+from overnight_alpha import map_item_codes
+from synthetic_dataguide import synthetic_codes
+
+
+def _data(n=700, k=3, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=(n, k)) * 0.05
+    y = 0.002 + x @ rng.normal(size=k) * 0.1 + rng.normal(0, 0.01, n)
+    x[rng.random(x.shape) < 0.02] = np.nan
+    y[rng.random(n) < 0.02] = np.nan
+    return x, y
+
+
+def _direct(x, y, t, window, ridge):
+    # T일 계수 = 학습 쌍 s in [t-window, t-1] 로 직접 푼 릿지 (절편 벌점 없음)
+    lo = 0 if window is None else max(0, t - window)
+    z = np.column_stack([np.ones(len(x)), x])[lo:t]
+    target = y[lo:t]
+    ok = np.isfinite(z).all(axis=1) & np.isfinite(target)
+    z, target = z[ok], target[ok]
+    penalty = ridge * np.diag([0.0] + [1.0] * x.shape[1])
+    return np.linalg.solve(z.T @ z + penalty, z.T @ target)
+
+
+def test_matches_direct_solve():
+    x, y = _data()
+    for window in (120, None):
+        forecast, coefs = rolling_ridge(x, y, window=window, ridge=1e-3, refresh=50)
+        for t in (200, 333, 699):
+            np.testing.assert_allclose(coefs[t], _direct(x, y, t, window, 1e-3), rtol=1e-7, atol=1e-12)
+
+
+def test_intercept_is_not_penalised():
+    # y 를 평행이동하면 절편만 같은 만큼 움직이고 기울기는 그대로
+    x, y = _data()
+    _, base = rolling_ridge(x, y, window=120, ridge=1.0)
+    _, shifted = rolling_ridge(x, y + 0.5, window=120, ridge=1.0)
+    done = ~np.isnan(base[:, 0])
+    np.testing.assert_allclose(shifted[done, 0] - base[done, 0], 0.5, atol=1e-9)
+    np.testing.assert_allclose(shifted[done, 1:], base[done, 1:], atol=1e-9)
+
+
+def test_factor_names_with_raw_codes():
+    # load_dataguide_excel 결과처럼 ITEM_CODE_MAP 밖의 수급 컬럼은 원본 Item 코드 이름 그대로여도
+    # 팩터 이름은 Ratio_<FLOW_CODE_MAP 이름>
+    df = map_item_codes(synthetic_codes(200, seed=1))
+    assert "I310020032" in df.columns and "net_inst" not in df.columns
+    factors = flow_factors(df)
+    assert list(factors.columns) == [f"Ratio_{name}" for name in FLOW_CODE_MAP.values()]
+    np.testing.assert_allclose(factors["Ratio_net_inst"],
+                               df["I310020032"] / feature_store(df).get("turnover_ma_nonzero"))
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from ic_engine import ic_table, rolling_ic
+
+
+def _data(n=1500, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2000-01-03", periods=n, freq="B")
+    target = pd.Series(rng.normal(0, 0.01, n), index=index, name="y")
+    factors = pd.DataFrame({
+        "a": target * 3 + rng.normal(0, 0.02, n),
+        # 평균이 표준편차보다 훨씬 큰 팩터 (누적합 상쇄 오차가 드러나는 경우)
+        "b": 1e6 + rng.normal(0, 1, n),
+        "c": rng.normal(0, 1, n),
+    }, index=index)
+    factors.iloc[100:400, 2] = np.nan
+    target.iloc[[5, 700, 701]] = np.nan
+    return factors, target
+
+
+def test_rolling_ic_matches_pandas():
+    factors, target = _data()
+    result = rolling_ic(factors, target, window=60)
+    for name in factors.columns:
+        # 윈도우가 다 찬 날부터, 그 안에서 유효 쌍이 3개 이상이면 값
+        expected = factors[name].rolling(60, min_periods=3).corr(target)
+        expected.iloc[:59] = np.nan
+        np.testing.assert_allclose(result[name], expected, rtol=1e-9, atol=1e-9)
+
+
+def test_ic_table_is_pairwise_complete():
+    factors, target = _data()
+    table = ic_table(factors, target.to_frame()).set_index("factor")
+    for name in factors.columns:
+        pair = pd.concat([factors[name], target], axis=1).dropna()
+        assert table.loc[name, "n"] == len(pair)
+        assert table.loc[name, "ic"] == pytest.approx(stats.pearsonr(pair.iloc[:, 0], pair.iloc[:, 1])[0])
+        assert table.loc[name, "rank_ic"] == pytest.approx(stats.spearmanr(pair.iloc[:, 0], pair.iloc[:, 1])[0])
+    # c 의 결측 때문에 a 의 표본이 줄지 않음
+    assert table.loc["a", "n"] == target.notna().sum()
+
+
+def test_ic_table_all_pairs_match_scipy():
+    # 타깃마다 결측 패턴이 다름 (호라이즌별 끝부분) -> 쌍마다 공통 행으로 랭크
+    factors, target = _data()
+    targets = pd.DataFrame({"y1": target, "y2": target.shift(-3) + factors["c"].fillna(0) * 0.001})
+    table = ic_table(factors, targets)
+    assert list(zip(table["target"], table["factor"])) == [(t, f) for t in targets for f in factors]
+    for row in table.itertuples():
+        pair = pd.concat([factors[row.factor], targets[row.target]], axis=1).dropna()
+        assert row.n == len(pair)
+        assert row.ic == pytest.approx(stats.pearsonr(pair.iloc[:, 0], pair.iloc[:, 1])[0], abs=1e-12)
+        assert row.rank_ic == pytest.approx(stats.spearmanr(pair.iloc[:, 0], pair.iloc[:, 1])[0], abs=1e-12)
@@ -0,0 +1,87 @@
+import ctypes
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import instrumentation
+from instrumentation import instrumented, profiling, stage
+
+
+@pytest.fixture(autouse=True)
+def _disabled():
+    instrumentation.disable()
+    yield
+    instrumentation.disable()
+
+
+def _double(df, scale=2):
+    return df * scale
+
+
+def test_disabled_stage_is_shared_null_context():
+    assert instrumentation.active() is None
+    with stage("load") as s:
+        s.record(pd.DataFrame({"x": [1.0]}))
+    assert stage("load") is stage("other") is instrumentation._NULL_STAGE
+    assert s is instrumentation._NULL_STAGE
+
+
+def test_disabled_instrumented_is_passthrough():
+    wrapped = instrumented()(_double)
+    assert wrapped.__wrapped__ is _double and wrapped.__name__ == "_double"
+
+    calls = []
+    sentinel = object()
+
+    @instrumented("echo")
+    def echo(value):
+        calls.append(value)
+        return value
+
+    assert echo(sentinel) is sentinel and calls == [sentinel]
+    with pytest.raises(ZeroDivisionError):
+        instrumented()(lambda: 1 / 0)()
+    assert instrumentation.active() is None
+
+
+def test_enabled_records_stages_and_rss(tmp_path):
+    path = tmp_path / "report.json"
+    wrapped = instrumented("double")(_double)
+    with profiling(path, name="test") as profiler:
+        with stage("outer") as outer:
+            buffer = np.ones(2_000_000)
+            result = wrapped(pd.DataFrame({"a": buffer[:10], "b": buffer[:10]}))
+            outer.record(result)
+    assert instrumentation.active() is None
+
+    report = json.loads(path.read_text(encoding="utf-8"))
+    assert report["name"] == "test" and report["peak_rss_mb"] > 0
+    stages = {s["name"]: s for s in report["stages"]}
+    assert list(stages) == ["outer", "double"]
+    assert stages["double"]["parent"] == "outer" and stages["double"]["depth"] == 1
+    assert (stages["double"]["rows"], stages["double"]["columns"]) == (10, 2)
+    for rec in stages.values():
+        assert rec["wall_s"] >= 0 and rec["cpu_s"] >= 0
+        assert rec["peak_rss_mb"] > 0 and rec["rss_growth_mb"] >= 0
+    assert profiler.stages[0].wall_s >= profiler.stages[1].wall_s
+
+
+def test_failed_stage_keeps_error():
+    with profiling() as profiler:
+        with pytest.raises(ValueError):
+            with stage("boom"):
+                raise ValueError("bad input")
+    assert profiler.stages[0].error == "ValueError: bad input"
+
+
+def test_windows_rss_path_is_selected_by_platform(monkeypatch):
+    # Windows 가 아니면 windll 이 없으므로 예외 없이 None, Windows 에서는 실제 최대 working set
+    on_windows = hasattr(ctypes, "windll")
+    monkeypatch.setattr(instrumentation.sys, "platform", "win32")
+    peak = instrumentation._peak_rss_mb()
+    if on_windows:
+        assert peak > 0
+    else:
+        assert peak is None
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from intraday_exits import run_exit_grid, simulate_exits
+from kpi import summarize
+from overnight_alpha import Params, run_alpha_factor_testing
+
+KPIS = ["equity", "sharpe", "mdd", "trades"]
+
+
+@pytest.fixture
+def position(frame):
+    _, _, backtest = run_alpha_factor_testing(frame, Params(rolling_window=20))
+    return backtest["position"]
+
+
+def _expected(frame, position, stop, target):
+    sim = simulate_exits(frame, position, stop, target)
+    return summarize(sim["strategy_net"].to_numpy(), sim["position"].to_numpy())
+
+
+def test_grid_matches_simulate_exits(frame, position):
+    # 첫 날은 무포지션 (워밍업) -> 시작 자산 1 이 MDD 고점 후보인 경우
+    assert position.iloc[0] == 0
+    stops, targets = [0.005, 0.01, np.inf], [0.01, np.inf]
+    grid = run_exit_grid(frame, position, stops, targets).set_index(["stop", "target"])
+    for stop in stops:
+        for target in targets:
+            expected = _expected(frame, position, stop, target)
+            for name in KPIS:
+                assert grid.loc[(stop, target), name] == pytest.approx(float(expected[name][0]), rel=1e-9, abs=1e-12)
+
+
+def test_grid_matches_simulate_exits_without_leading_flat_day(frame, position):
+    # 첫 날부터 포지션이 있으면 시작 자산 1 은 고점 후보가 아님 (kpi.summarize 정의)
+    position = position.copy()
+    position.iloc[0] = -1.0
+    grid = run_exit_grid(frame.iloc[1:], position.iloc[1:], [0.01], [0.02])
+    expected = _expected(frame.iloc[1:], position.iloc[1:], 0.01, 0.02)
+    row = grid[grid["exit"] == "close"].iloc[0]
+    for name in KPIS:
+        assert row[name] == pytest.approx(float(expected[name][0]), rel=1e-9, abs=1e-12)
+
+
+def test_open_row_matches_kpi_summarize(frame, position):
+    grid = run_exit_grid(frame, position, [0.01], [0.02])
+    row = grid[grid["exit"] == "open"].iloc[0]
+    _, _, backtest = run_alpha_factor_testing(frame, Params(rolling_window=20))
+    expected = summarize(backtest["strategy_net"].to_numpy(), backtest["position"].to_numpy())
+    for name in KPIS:
+        assert row[name] == pytest.approx(float(expected[name][0]), rel=1e-12)
+
+
+def test_stop_is_applied_before_target():
+    # 하루 안에 손절(-2%)과 익절(+3%) 가격을 모두 지난 날 -> 손절 청산으로 처리
+    index = pd.date_range("2020-01-01", periods=3, freq="D", name="date")
+    frame = pd.DataFrame({"open": [100.0, 100.0, 100.0], "high": [100.0, 105.0, 100.0],
+                          "low": [100.0, 95.0, 100.0], "close": [100.0, 101.0, 100.0]}, index=index)
+    position = np.array([0.0, 1.0, 0.0])
+
+    sim = simulate_exits(frame, position, stop=0.02, target=0.03, cost=0.0)
+    assert sim["exit_reason"].tolist() == ["flat", "stop", "flat"]
+    assert sim["strategy_net"].iloc[1] == pytest.approx(-0.02)
+
+    grid = run_exit_grid(frame, position, [0.02], [0.03], cost=0.0, include_open_exit=False)
+    row = grid.iloc[0]
+    assert (row["stop_hits"], row["target_hits"], row["ambiguous"]) == (1, 0, 1)
+    assert row["equity"] == pytest.approx(0.98)
+    assert row["mdd"] == pytest.approx(-0.02)
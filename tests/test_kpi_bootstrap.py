@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from kpi_bootstrap import _bootstrap_paths, bootstrap_kpis, infer_cost
+from overnight_alpha import Params, run_alpha_factor_testing
+
+PARAMS = Params(rolling_window=20, cost=0.004)
+
+
+def _backtest(frame):
+    _, _, backtest = run_alpha_factor_testing(frame, PARAMS)
+    return backtest.dropna(subset=["factor_rank"])
+
+
+def test_infer_cost_recovers_params(frame):
+    assert infer_cost(_backtest(frame)) == pytest.approx(PARAMS.cost)
+
+
+def test_null_uses_given_cost(frame):
+    backtest = _backtest(frame)
+    cheap = bootstrap_kpis(backtest, 0.0, n_paths=500, seed=0)
+    actual = bootstrap_kpis(backtest, PARAMS.cost, n_paths=500, seed=0)
+    # 관측값/부트스트랩은 비용과 무관, 귀무분포만 비용만큼 낮아짐
+    np.testing.assert_array_equal(cheap["observed"], actual["observed"])
+    assert actual.loc["total_return", "null_mean"] < cheap.loc["total_return", "null_mean"]
+
+
+def test_null_matches_direct_permutation(frame):
+    # 같은 난수열로 포지션을 섞어 pandas 로 직접 계산한 누적 수익과 같아야 함
+    backtest = _backtest(frame)
+    result = bootstrap_kpis(backtest, PARAMS.cost, n_paths=200, method="block", seed=1)
+
+    rng = np.random.default_rng(1)
+    position = backtest["position"].to_numpy()
+    gap = backtest["gap"].fillna(0).to_numpy()
+    # bootstrap_kpis 와 같은 순서로 난수를 소비
+    _bootstrap_paths(np.nan_to_num(backtest["strategy_net"].to_numpy()), position, 200, 10, "block",
+                     (backtest.index[-1] - backtest.index[0]).days, rng)
+    shuffled = rng.permuted(np.broadcast_to(position, (200, len(position))).copy(), axis=1)
+    net = shuffled * gap - np.abs(shuffled) * PARAMS.cost * ~backtest["gap"].isna().to_numpy()
+    expected = np.prod(1 + net, axis=1) - 1
+    assert result.loc["total_return", "null_mean"] == pytest.approx(expected.mean(), rel=1e-9)
+
+
+def test_rejects_total_loss(frame):
+    backtest = _backtest(frame).copy()
+    day = backtest.index[backtest["position"] != 0][0]
+    backtest.loc[day, "strategy_net"] = -1.0
+    with pytest.raises(ValueError, match="100%"):
+        bootstrap_kpis(backtest, PARAMS.cost, n_paths=10, seed=0)
+
+    backtest = _backtest(frame).copy()
+    backtest.iloc[5, backtest.columns.get_loc("gap")] = 1.5
+    with pytest.raises(ValueError, match="100%"):
+        bootstrap_kpis(backtest, PARAMS.cost, n_paths=10, seed=0)
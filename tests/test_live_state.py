@@ -0,0 +1,56 @@
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+from live_state import OvernightState
+from overnight_alpha import Params, run_alpha_factor_testing
+
+PARAMS = Params(rolling_window=20)
+COLUMNS = ["gap", "priv_fund_ratio", "factor_rank", "position", "strategy_ret", "strategy_net", "equity"]
+
+
+def _strict(path):
+    # NaN / Infinity 토큰이 있으면 실패
+    def reject(token):
+        raise ValueError(token)
+    return json.loads(path.read_text(encoding="utf-8"), parse_constant=reject)
+
+
+def test_incremental_matches_backtest_day_by_day(frame):
+    # 결측 / 0 거래대금(-> inf 비율) 도 포함
+    frame = frame.copy()
+    frame.iloc[50:53, frame.columns.get_loc("net_priv_fund")] = np.nan
+    frame.iloc[80:85, frame.columns.get_loc("turnover")] = 0.0
+    _, _, backtest = run_alpha_factor_testing(frame, PARAMS)
+
+    state = OvernightState(PARAMS)
+    for i, (date, row) in enumerate(frame.iterrows()):
+        out = state.update(row)
+        expected = backtest.iloc[i]
+        for name in COLUMNS:
+            np.testing.assert_array_equal(out[name], expected[name], err_msg=f"{date.date()} {name}")
+        if i + 1 < len(frame):
+            assert out["next_position"] == backtest["position"].iloc[i + 1]
+
+
+def test_checkpoint_is_strict_json_and_resumes(frame, tmp_path):
+    path = tmp_path / "state.json"
+    full = OvernightState(PARAMS).catch_up(frame)
+
+    state = OvernightState(PARAMS)
+    state.catch_up(frame.iloc[:10])     # 버퍼가 아직 차지 않아 NaN 포함
+    state.save(path)
+    payload = _strict(path)
+    assert None in payload["ratio_buf"]
+
+    state = OvernightState.load(path)
+    assert math.isnan(state.ratio_buf[0])
+    head = state.catch_up(frame.iloc[:300])
+    state.save(path)
+    _strict(path)
+    tail = OvernightState.load(path).catch_up(frame)
+
+    resumed = pd.concat([full.iloc[:10], head, tail])
+    pd.testing.assert_frame_equal(resumed, full)
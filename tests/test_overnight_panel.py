@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from overnight_alpha import Params, run_alpha_factor_testing
+from overnight_panel import load_dataguide_panel, run_panel_backtest
+from synthetic_dataguide import synthetic_panel, write_dataguide_workbook
+
+PARAMS = Params(rolling_window=20)
+
+
+def test_each_instrument_matches_single_backtest():
+    panel = synthetic_panel(400, 4, seed=1)
+    result = run_panel_backtest(panel, PARAMS)
+    for name in panel["close"].columns:
+        frame = pd.DataFrame({field: block[name] for field, block in panel.items()})
+        _, _, backtest = run_alpha_factor_testing(frame, PARAMS)
+        np.testing.assert_array_equal(result.position[name], backtest["position"])
+        np.testing.assert_allclose(result.strategy_net[name], backtest["strategy_net"], rtol=1e-12)
+
+
+def test_portfolio_ignores_inactive_instruments():
+    panel = synthetic_panel(400, 2, seed=2)
+    late = panel["close"].index[200]
+    # 두 번째 종목은 200일째에 상장
+    for block in panel.values():
+        block.loc[block.index < late, block.columns[1]] = np.nan
+    result = run_panel_backtest(panel, PARAMS)
+
+    first = result.strategy_net.iloc[:, 0]
+    early = result.portfolio_net.index < late
+    # 두 번째 종목이 없는 구간은 첫 종목 수익률 그대로 (0 으로 희석되지 않음), 예열 구간은 0
+    expected = first.where(result.factor_rank.iloc[:, 0].shift(1).notna(), 0.0).fillna(0.0)
+    np.testing.assert_allclose(result.portfolio_net[early], expected[early])
+    assert (result.portfolio_net.iloc[:PARAMS.rolling_window] == 0).all()
+
+
+def test_load_panel_matches_generator(tmp_path):
+    path = write_dataguide_workbook(tmp_path / "multi.xlsx", 150, n_instruments=3, seed=4)
+    loaded = load_dataguide_panel(path, use_cache=False)
+    expected = synthetic_panel(150, 3, seed=4)
+    for field, block in expected.items():
+        pd.testing.assert_frame_equal(loaded[field], block, check_names=False, check_freq=False)
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import param_sweep
+from kpi import equity_curves, max_drawdown, sharpe_ratio
+from overnight_alpha import Params, run_alpha_factor_testing
+from param_sweep import best_params, run_param_sweep
+
+GRID = {"rolling_windows": (20, 60), "buy_thresholds": (0.1, 0.2, 0.3),
+        "sell_thresholds": (0.8, 0.9), "costs": (0.0, 0.0015)}
+
+
+def test_sweep_matches_single_backtests(frame):
+    results = run_param_sweep(frame, **GRID)
+    assert len(results) == 2 * 3 * 2 * 2
+    for row in results.itertuples():
+        params = Params(row.rolling_window, row.buy_threshold, row.sell_threshold, row.cost)
+        _, _, backtest = run_alpha_factor_testing(frame, params)
+        net = backtest["strategy_net"].to_numpy()
+        assert row.sharpe == pytest.approx(sharpe_ratio(net)[0], nan_ok=True)
+        assert row.mdd == pytest.approx(max_drawdown(equity_curves(net))[0])
+
+
+def test_chunked_blocks_match(frame, monkeypatch):
+    full = run_param_sweep(frame, **GRID)
+    monkeypatch.setattr(param_sweep, "MAX_BLOCK_CELLS", 1)   # 매수 임계값 하나씩
+    pd.testing.assert_frame_equal(run_param_sweep(frame, **GRID), full)
+
+
+def test_best_params_all_nan():
+    results = pd.DataFrame({"rolling_window": [20], "buy_threshold": [0.1], "sell_threshold": [0.9],
+                            "cost": [0.0], "sharpe": [np.nan]})
+    with pytest.raises(ValueError, match="No valid 'sharpe'"):
+        best_params(results)
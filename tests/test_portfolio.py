@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from overnight_alpha import Params, run_alpha_factor_testing
+from portfolio import proportional_weights, run_portfolio, threshold_weights, vol_target_weights
+
+
+def test_threshold_sizing_matches_alpha_backtest(frame):
+    params = Params(rolling_window=20)
+    _, _, backtest = run_alpha_factor_testing(frame, params)
+    weights = threshold_weights(backtest["factor_rank"])
+
+    legacy = run_portfolio(weights, backtest["gap"], params.cost, cost_basis="position")
+    np.testing.assert_array_equal(legacy.position[0], backtest["position"])
+    np.testing.assert_allclose(legacy.net[0], backtest["strategy_net"], rtol=0, atol=0)
+
+    # 회전율 비용: 포지션이 바뀐 날에만 |Δposition| x cost (±1 -> -1 은 2배)
+    result = run_portfolio(weights, backtest["gap"], params.cost)
+    change = backtest["position"].diff().fillna(backtest["position"]).abs()
+    np.testing.assert_array_equal(result.turnover[0], change)
+    np.testing.assert_allclose(result.net[0], backtest["strategy_ret"] - change * params.cost, rtol=0, atol=0)
+    assert (change == 2).any()
+
+
+def test_proportional_weights_hit_leverage_cap():
+    signal = np.array([-5.0, -0.5, 0.0, np.nan, 0.25, 3.0])
+    weights = proportional_weights(signal, scale=0.5, max_leverage=1.5)
+    np.testing.assert_array_equal(weights[:, 0], [-1.5, -1.0, 0.0, 0.0, 0.5, 1.5])
+
+
+def test_vol_target_weights_hit_leverage_cap():
+    rng = np.random.default_rng(0)
+    calm = rng.normal(0, 1e-4, 60)          # 연 변동성 ~0.16% -> target/vol 이 상한을 넘음
+    wild = rng.normal(0, 0.05, 60)          # 연 변동성 ~80% -> 상한 아래
+    returns = np.r_[calm, wild]
+    signal = np.full(len(returns), 3.0)     # 시그널은 ±1 로 자름
+    weights = vol_target_weights(signal, returns, target_vol=0.10, window=20, max_leverage=2.0)[:, 0]
+
+    assert (weights[:19] == 0).all()        # 윈도우가 차기 전 = 비중 0
+    np.testing.assert_array_equal(weights[19:60], 2.0)
+    vol = pd.Series(returns).rolling(20).std().to_numpy() * np.sqrt(252)
+    np.testing.assert_allclose(weights[80:], 0.10 / vol[80:], rtol=1e-12)
+    assert (weights[80:] < 2.0).all()
+
+
+def test_vol_estimate_has_no_lookahead():
+    # T일 비중은 T일까지의 수익률만 사용: 미래 수익률을 바꿔도 그 전 비중은 그대로
+    rng = np.random.default_rng(1)
+    returns = rng.normal(0, 0.01, 200)
+    signal = rng.normal(size=200)
+    before = vol_target_weights(signal, returns)
+    shocked = returns.copy()
+    shocked[120:] *= 10
+    after = vol_target_weights(signal, shocked)
+    np.testing.assert_array_equal(after[:120], before[:120])
+    assert not np.allclose(after[120:], before[120:])
+
+    # run_portfolio 는 T일 비중을 T+1일에 보유 -> 첫 날 포지션 0
+    result = run_portfolio(before, returns)
+    np.testing.assert_array_equal(result.position[0].to_numpy()[1:], before[:-1, 0])
+    assert result.position[0].iloc[0] == 0
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantile_engine import full_sample_bins, quantile_probs, sample_edges
+
+
+def _factors(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.column_stack([
+        rng.normal(size=n),
+        np.round(rng.normal(size=n), 1),        # 동점이 많아 경계값과 같은 관측치가 생김
+        rng.lognormal(size=n),
+    ])
+    x[rng.random(x.shape) < 0.05] = np.nan
+    return x
+
+
+def _reference_bins(values, n_bins):
+    # 결측 제외 np.quantile 경계로 자른 (e_i, e_i+1] 구간 (첫 구간은 최솟값 포함)
+    edges = np.nanquantile(values, quantile_probs(n_bins))
+    return np.nan_to_num(pd.cut(values, edges, labels=False, include_lowest=True), nan=-1)
+
+
+def test_quantile_probs_are_exact_decimals():
+    np.testing.assert_array_equal(quantile_probs(10), np.arange(11) / 10)
+    np.testing.assert_array_equal(quantile_probs(4), [0, 0.25, 0.5, 0.75, 1])
+
+
+def test_bins_match_reference():
+    # 동점이 경계값과 같은 컬럼(1)도 포함해 비트 단위로 같은 구간
+    x = _factors()
+    for n_bins in (3, 5, 7, 10):
+        bins = full_sample_bins(x, n_bins)
+        for j in range(x.shape[1]):
+            np.testing.assert_array_equal(bins[:, j], _reference_bins(x[:, j], n_bins))
+
+
+def test_bins_match_qcut_off_the_edges():
+    # 경계값과 (거의) 같은 관측치는 확률 처리에 따라 구간이 바뀔 수 있음
+    # (pandas 3 은 linspace 값을 nextafter 로 올리고, 여기서는 1/3 등을 12자리로 반올림)
+    # -> 그 외 관측치는 pd.qcut 과 같음
+    x = _factors()
+    for n_bins in (3, 5, 7, 10):
+        bins = full_sample_bins(x, n_bins)
+        edges = sample_edges(x, n_bins)
+        for j in range(x.shape[1]):
+            expected = np.nan_to_num(pd.qcut(x[:, j], n_bins, labels=False), nan=-1)
+            off_edge = ~np.isclose(x[:, j, None], edges[None, :, j], rtol=1e-9, atol=0).any(axis=1)
+            np.testing.assert_array_equal(bins[off_edge, j], expected[off_edge])
+
+
+def test_edges_match_numpy_quantile():
+    x = _factors()
+    for n_bins in (5, 10):
+        edges = sample_edges(x, n_bins)
+        for j in range(x.shape[1]):
+            np.testing.assert_array_equal(edges[:, j], np.nanquantile(x[:, j], quantile_probs(n_bins)))
+            # pd.qcut(retbins=True) 경계 (첫 경계는 include_lowest 로 pandas 가 범위의 0.1% 만큼 낮춰 둠)
+            _, expected = pd.qcut(x[:, j], n_bins, retbins=True)
+            np.testing.assert_allclose(edges[1:, j], expected[1:], rtol=1e-12, atol=0)
+
+
+def test_duplicate_edges_follow_qcut():
+    rng = np.random.default_rng(1)
+    x = np.column_stack([rng.normal(size=100), np.r_[np.zeros(80), np.arange(20.0)]])
+    with pytest.raises(ValueError, match="Bin edges must be unique"):
+        pd.qcut(x[:, 1], 5)
+    with pytest.raises(ValueError, match="Bin edges must be unique"):
+        full_sample_bins(x, 5)
+    with pytest.raises(ValueError, match="duplicates"):
+        full_sample_bins(x, 5, duplicates="ignore")
+    # drop: 겹친 컬럼만 구간 수를 줄이고 다른 컬럼은 그대로
+    bins = full_sample_bins(x, 5, duplicates="drop")
+    np.testing.assert_array_equal(bins[:, 1], pd.qcut(x[:, 1], 5, labels=False, duplicates="drop"))
+    np.testing.assert_array_equal(bins[:, 0], full_sample_bins(x[:, :1], 5)[:, 0])
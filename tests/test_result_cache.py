@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import dataguide_cache
+from overnight_alpha import Params, run_alpha_factor_testing
+from result_cache import call_key, caching, memoized
+
+PARAMS = Params(rolling_window=20)
+
+
+def test_hit_and_in_place_edit(frame, tmp_path):
+    with caching(tmp_path) as cache:
+        _, _, first = run_alpha_factor_testing(frame, PARAMS)
+        _, _, again = run_alpha_factor_testing(frame, PARAMS)
+        assert (cache.hits, cache.misses) == (1, 1)
+        pd.testing.assert_frame_equal(again, first)
+
+        # 같은 객체를 제자리에서 수정하면 지문이 달라져 다시 계산
+        frame.iloc[300, frame.columns.get_loc("open")] *= 1.05
+        _, _, edited = run_alpha_factor_testing(frame, PARAMS)
+        assert cache.misses == 2
+        assert edited["gap"].iloc[300] != first["gap"].iloc[300]
+
+
+def test_key_covers_import_closure(frame, monkeypatch):
+    # 함수 모듈이 간접적으로 import 하는 rolling_rank.py 만 바뀌어도 키가 달라짐
+    before = call_key(run_alpha_factor_testing, (frame, PARAMS), {})
+    path = (dataguide_cache.PROJECT_DIR / "rolling_rank.py").resolve()
+    dataguide_cache.code_fingerprint(run_alpha_factor_testing)
+    mtime, _, imports = dataguide_cache._SOURCE_HASHES[path]
+    monkeypatch.setitem(dataguide_cache._SOURCE_HASHES, path, (mtime, "edited", imports))
+    assert call_key(run_alpha_factor_testing, (frame, PARAMS), {}) != before
+
+
+def test_bypass_warns_without_printing(tmp_path, capsys):
+    @memoized
+    def total(values):
+        return float(sum(values))
+
+    with caching(tmp_path):
+        with pytest.warns(RuntimeWarning, match="bypassed"):
+            assert total({1.0, 2.0}) == 3.0
+    assert capsys.readouterr().err == ""
+
+
+def test_none_result_is_cached(tmp_path):
+    calls = []
+
+    @memoized
+    def nothing(n):
+        calls.append(n)
+        return None
+
+    with caching(tmp_path) as cache:
+        assert nothing(1) is None
+        assert nothing(1) is None
+        assert calls == [1]
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.get("missing") is None
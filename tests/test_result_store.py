@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import dataguide_cache
+import run_analysis
+from overnight_alpha import load_dataguide_excel
+from result_store import load_results, write_results
+
+
+def test_analysis_columns_round_trip(workbook, tmp_path, monkeypatch):
+    # run_analysis 가 쓴 결과 파일을 analysis/ 스크립트가 요청하는 컬럼으로 다시 읽을 수 있어야 함
+    monkeypatch.setattr(dataguide_cache, "CACHE_DIR", tmp_path / ".cache")
+    monkeypatch.setattr(run_analysis, "DATA_PATH", workbook)
+    monkeypatch.setattr(run_analysis, "OUTPUT_DIR", tmp_path)
+    run_analysis.run()
+
+    df = load_results(["gap", "ret_1d", "open_to_high", "dir_ratio_long"], path=tmp_path / "results.npz")
+    raw = load_dataguide_excel(workbook, use_cache=False)
+    assert df.notna().sum().min() > 0
+    np.testing.assert_allclose(df["open_to_high"], (raw["high"] - raw["open"]) / raw["open"])
+    np.testing.assert_allclose(df["ret_1d"], raw["close"].pct_change())
+
+
+def test_duplicate_columns(tmp_path):
+    index = pd.date_range("2024-01-01", periods=3, name="date").as_unit("ns")
+    frame = pd.DataFrame([[1.0, 2.0, 3.0]] * 3, index=index, columns=["a", "x", "x"])
+    path = write_results(frame, tmp_path / "dup.npz")
+
+    # 전체 로드는 위치별로 모두 유지, 이름으로 고르면 어느 쪽인지 모호하므로 오류
+    pd.testing.assert_frame_equal(load_results(path=path), frame, check_freq=False)
+    pd.testing.assert_frame_equal(load_results(["a"], path=path), frame[["a"]], check_freq=False)
+    with pytest.raises(ValueError, match="Duplicate"):
+        load_results(["x"], path=path)
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rolling_rank import (RANK_METHODS, WIDE_MIN_COLUMNS, _rank_pandas, _rank_wide, rolling_rank,
+                          rolling_rank_array)
+
+
+def _values(shape, seed=0):
+    # 동점(반올림), NaN, inf 가 섞인 입력
+    rng = np.random.default_rng(seed)
+    values = np.round(rng.standard_normal(shape), 1)
+    values[rng.random(shape) < 0.05] = np.nan
+    values[rng.random(shape) < 0.01] = np.inf
+    return values
+
+
+@pytest.mark.parametrize("method", RANK_METHODS)
+@pytest.mark.parametrize("ascending", [True, False])
+@pytest.mark.parametrize("pct", [True, False])
+def test_wide_block_matches_pandas(method, ascending, pct):
+    values = _values((300, WIDE_MIN_COLUMNS + 4))
+    expected = pd.DataFrame(values).rolling(20, min_periods=5).rank(method=method, ascending=ascending, pct=pct)
+    got = rolling_rank_array(values, 20, min_periods=5, method=method, ascending=ascending, pct=pct)
+    np.testing.assert_allclose(got, expected.to_numpy(), rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("window", [1, 7, 60, 250])
+def test_series_and_narrow_frame_match_pandas(window):
+    series = pd.Series(_values(500, seed=1), name="x")
+    pd.testing.assert_series_equal(rolling_rank(series, window, pct=True),
+                                   series.rolling(window).rank(pct=True))
+    frame = pd.DataFrame(_values((500, 3), seed=2))
+    pd.testing.assert_frame_equal(rolling_rank(frame, window, min_periods=1),
+                                  frame.rolling(window, min_periods=1).rank())
+
+
+def test_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        rolling_rank_array(np.arange(5.0), 3, method="dense")
+
+
+@pytest.mark.parametrize("method", RANK_METHODS)
+@pytest.mark.parametrize("window,min_periods", [(1, 1), (5, 1), (20, 20), (64, 10)])
+def test_block_and_pandas_paths_agree(method, window, min_periods):
+    # 두 경로를 직접 호출: 동점, NaN, +inf / -inf 가 섞인 좁은/넓은 입력 모두
+    values = _values((400, 5), seed=4)
+    values[np.random.default_rng(5).random(values.shape) < 0.01] = -np.inf
+    for ascending in (True, False):
+        for pct in (True, False):
+            args = (window, min_periods, method, ascending, pct)
+            np.testing.assert_allclose(_rank_wide(values, *args), _rank_pandas(values, *args),
+                                       rtol=0, atol=1e-12)
+            np.testing.assert_allclose(_rank_wide(values[:, :1], *args)[:, 0],
+                                       _rank_pandas(values[:, 0], *args), rtol=0, atol=1e-12)
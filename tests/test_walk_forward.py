@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+import walk_forward
+from walk_forward import open_matrix, run_walk_forward, write_matrix
+
+GRID = {"rolling_windows": (20, 40), "buy_thresholds": (0.1, 0.2),
+        "sell_thresholds": (0.8, 0.9), "costs": (0.0015,)}
+
+
+def _memmap_base(values):
+    while values is not None and not isinstance(values, np.memmap):
+        values = values.base
+    return values
+
+
+def test_open_matrix_wraps_mmap_without_copy(frame, tmp_path):
+    fields = ["open", "close", "turnover", "net_priv_fund"]
+    write_matrix(frame[fields], tmp_path / "data")
+    shared = open_matrix(tmp_path / "data", fields, frame.index.name)
+
+    pd.testing.assert_frame_equal(shared, frame[fields].astype("float64"), check_freq=False)
+    for name in fields:
+        assert _memmap_base(shared[name].to_numpy()) is not None
+        assert _memmap_base(shared.iloc[:100][name].to_numpy()) is not None
+
+
+def test_parallel_matches_sequential_and_releases_data(frame):
+    sequential = run_walk_forward(frame, train_size=200, test_size=60, grid=GRID, max_workers=1)
+    assert walk_forward._DATA is None
+    parallel = run_walk_forward(frame, train_size=200, test_size=60, grid=GRID, max_workers=2)
+    pd.testing.assert_frame_equal(sequential[0], parallel[0])
+    pd.testing.assert_frame_equal(sequential[1], parallel[1])
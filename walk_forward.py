@@ -0,0 +1,154 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+import tempfile
+import numpy as np
+import pandas as pd
+from overnight_alpha import Params, load_dataguide_excel, run_alpha_factor_testing
+from param_sweep import best_params, run_param_sweep
+
+# ==============================================================================
+# 1. 설정
+# ==============================================================================
+DEFAULT_GRID = {
+    "rolling_windows": (20, 40, 60, 120),
+    "buy_thresholds": (0.05, 0.10, 0.15, 0.20),
+    "sell_thresholds": (0.80, 0.85, 0.90, 0.95),
+    "costs": (Params.cost,),
+}
+DATA_FIELDS = ("open", "close", "turnover", "net_priv_fund")
+
+@dataclass(frozen=True)
+class Fold:
+    train_start: int   # 학습 구간 시작 (행 위치)
+    train_end: int     # 학습 구간 끝 = 검증 구간 시작
+    test_end: int      # 검증 구간 끝 (미포함)
+
+def make_folds(n_rows: int, train_size: int, test_size: int, step: int | None = None) -> list[Fold]:
+    # 롤링 학습/검증 구간. step 기본값 = test_size (검증 구간이 겹치지 않게)
+    step = step or test_size
+    folds = []
+    start = 0
+    while start + train_size < n_rows:
+        train_end = start + train_size
+        folds.append(Fold(start, train_end, min(train_end + test_size, n_rows)))
+        start += step
+    return folds
+
+# ==============================================================================
+# 2. 워커 (데이터는 .npy mmap 으로 공유, 작업마다 pickle 하지 않음)
+# ==============================================================================
+# (T, 필드) 2-D 배열 하나를 열 우선(Fortran) 순서로 저장 -> DataFrame(copy=False) 가 블록 하나로
+# mmap 을 그대로 감싸므로 (컬럼별 배열 dict 는 합치면서 복사됨) 모든 워커가 같은 페이지 캐시를 공유
+_DATA: pd.DataFrame | None = None
+
+def write_matrix(df: pd.DataFrame, directory: str | Path) -> Path:
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    np.save(directory / "values.npy", np.asfortranarray(df.to_numpy(dtype="float64")), allow_pickle=False)
+    np.save(directory / "index.npy", df.index.to_numpy(dtype="datetime64[ns]"), allow_pickle=False)
+    return directory
+
+def open_matrix(directory: str | Path, columns, index_name=None) -> pd.DataFrame:
+    directory = Path(directory)
+    values = np.load(directory / "values.npy", mmap_mode="r")
+    index = pd.DatetimeIndex(np.load(directory / "index.npy"), name=index_name)
+    return pd.DataFrame(values, index=index, columns=list(columns), copy=False)
+
+def _init_worker(data_dir: str, columns, index_name=None) -> None:
+    global _DATA
+    _DATA = open_matrix(data_dir, columns, index_name)
+
+def _release_worker() -> None:
+    global _DATA
+    _DATA = None   # mmap 참조를 놓아야 임시 폴더를 지울 수 있음
+
+def _run_fold(fold: Fold, grid: dict, by: str) -> dict:
+    df = _DATA.iloc[:fold.test_end]
+
+    # 학습: start 이전 구간은 랭크 예열에만 사용
+    train = df.iloc[:fold.train_end]
+    results = run_param_sweep(train, start=train.index[fold.train_start], **grid)
+    params = best_params(results, by=by)
+
+    # 검증: 선택된 Params 로 검증 구간만 잘라냄
+    _, _, backtest = run_alpha_factor_testing(df, params)
+    test = backtest.iloc[fold.train_end:fold.test_end]
+    return {
+        "fold": fold,
+        "params": params,
+        "train_score": float(results[by].max()),
+        "index": test.index.to_numpy(),
+        "position": test["position"].to_numpy(),
+        "strategy_net": test["strategy_net"].to_numpy(),
+    }
+
+# ==============================================================================
+# 3. 워크포워드 실행
+# ==============================================================================
+def run_walk_forward(df: pd.DataFrame, train_size: int = 500, test_size: int = 60,
+                     step: int | None = None, grid: dict | None = None, by: str = "sharpe",
+                     max_workers: int | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    grid = {**DEFAULT_GRID, **(grid or {})}
+    folds = make_folds(len(df), train_size, test_size, step)
+    if not folds: raise ValueError("History is shorter than train_size.")
+
+    fields = [c for c in DATA_FIELDS if c in df.columns]
+    with tempfile.TemporaryDirectory(prefix="walk_forward_") as tmp:
+        data_dir = str(Path(tmp) / "data")
+        write_matrix(df[fields], data_dir)
+        worker_args = (data_dir, fields, df.index.name)
+
+        if max_workers == 1:
+            _init_worker(*worker_args)
+            try:
+                outputs = [_run_fold(fold, grid, by) for fold in folds]
+            finally:
+                _release_worker()
+        else:
+            with ProcessPoolExecutor(max_workers, initializer=_init_worker,
+                                     initargs=worker_args) as pool:
+                outputs = list(pool.map(_run_fold, folds, [grid] * len(folds), [by] * len(folds)))
+
+    # 검증 구간 strategy_net 을 이어 붙여 하나의 OOS 자산 곡선으로
+    pieces, summary = [], []
+    for i, out in enumerate(outputs):
+        piece = pd.DataFrame({"position": out["position"], "strategy_net": out["strategy_net"]},
+                             index=pd.DatetimeIndex(out["index"], name=df.index.name))
+        piece["fold"] = i
+        pieces.append(piece)
+
+        fold = out["fold"]
+        summary.append({
+            "fold": i,
+            "train_start": df.index[fold.train_start],
+            "test_start": df.index[fold.train_end],
+            "test_end": df.index[fold.test_end - 1],
+            **asdict(out["params"]),
+            f"train_{by}": out["train_score"],
+            "test_return": float(np.prod(1 + np.nan_to_num(out["strategy_net"])) - 1),
+        })
+
+    oos = pd.concat(pieces)
+    oos = oos[~oos.index.duplicated(keep="last")]
+    oos["equity"] = (1 + oos["strategy_net"].fillna(0)).cumprod()
+    return oos, pd.DataFrame(summary)
+
+def main() -> None:
+    from run_analysis import DATA_PATH, OUTPUT_DIR
+
+    print("1. 데이터를 불러오는 중입니다...")
+    df = load_dataguide_excel(DATA_PATH)
+
+    print("2. 워크포워드 최적화를 실행합니다...")
+    oos, folds = run_walk_forward(df)
+    print(folds.to_string(index=False))
+    print(f"\n[OOS 누적 수익] {oos['equity'].iloc[-1]:.4f}")
+
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    oos.to_csv(OUTPUT_DIR / "walk_forward_oos.csv")
+    folds.to_csv(OUTPUT_DIR / "walk_forward_folds.csv", index=False)
+
+if __name__ == "__main__":
+    main()